@@ -0,0 +1,143 @@
+"""
+Benchmark the asset store backends against each other.
+
+Runs the same workload (single saves, batched saves, gets, batched gets, existence
+checks, listing, deletes) against the local, SQLite and Redis backends and prints
+operations per second. Redis is skipped if no server is reachable.
+
+Every backend emits reference URLs, so the timings measure the stores rather than
+URL building, and the run happens in a temporary directory that is removed afterwards.
+
+Usage:
+    python scripts/benchmark_stores.py [--count 2000] [--size 16384] [--redis-url redis://localhost:6379]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.asset_factory import BackendType, create_asset_manager  # noqa: E402
+from src.core.asset_manager import AssetManager, AssetType  # noqa: E402
+
+BATCH_SIZE = 100
+# Reference URLs cost the same for every backend and never touch the filesystem
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+def _timed(label: str, operations: int, fn: Callable[[], None], results: Dict[str, float]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    results[label] = operations / elapsed if elapsed > 0 else float("inf")
+
+
+def run_workload(manager: AssetManager, count: int, size: int) -> Dict[str, float]:
+    """
+    Run the benchmark workload against one manager.
+
+    Args:
+        manager (AssetManager): Manager under test, expected to be empty
+        count (int): Number of assets per phase
+        size (int): Size of each asset in bytes
+
+    Returns:
+        Dict[str, float]: Operations per second for each phase
+    """
+    content = os.urandom(size)
+    names = [f"bench_{i}.json" for i in range(count)]
+    batches: List[List[str]] = [names[i:i + BATCH_SIZE] for i in range(0, count, BATCH_SIZE)]
+    results: Dict[str, float] = {}
+
+    def save_single():
+        for name in names:
+            manager.save(name, content, AssetType.JSON)
+
+    def save_batched():
+        for batch in batches:
+            manager.save_many([(name, content, AssetType.JSON) for name in batch])
+
+    def get_single():
+        for name in names:
+            manager.get(name, AssetType.JSON)
+
+    def get_batched():
+        for batch in batches:
+            manager.get_many(batch, AssetType.JSON)
+
+    def exists_single():
+        for name in names:
+            manager.exists(name, AssetType.JSON)
+
+    def list_all():
+        for _ in range(10):
+            manager.list(AssetType.JSON)
+
+    def delete_single():
+        for name in names:
+            manager.delete(name, AssetType.JSON)
+
+    _timed("save", count, save_single, results)
+    _timed("save_many", count, save_batched, results)
+    _timed("get", count, get_single, results)
+    _timed("get_many", count, get_batched, results)
+    _timed("exists", count, exists_single, results)
+    _timed("list", 10, list_all, results)
+    _timed("delete", count, delete_single, results)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark asset store backends")
+    parser.add_argument("--count", type=int, default=2000, help="Assets per phase")
+    parser.add_argument("--size", type=int, default=16 * 1024, help="Asset size in bytes")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379"))
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="asset_bench_"))
+    backends = {
+        "local": lambda: create_asset_manager(
+            BackendType.LOCAL, base_path=workdir / "local", url_template=URL_TEMPLATE
+        ),
+        "sqlite": lambda: create_asset_manager(
+            BackendType.SQLITE, db_path=workdir / "assets.sqlite3", url_template=URL_TEMPLATE
+        ),
+        "redis": lambda: create_asset_manager(
+            BackendType.REDIS, redis_url=args.redis_url, url_template=URL_TEMPLATE
+        ),
+    }
+
+    all_results: Dict[str, Dict[str, float]] = {}
+    # Anything a backend writes relative to the working directory is cleaned up too
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for backend_name, factory in backends.items():
+            try:
+                manager = factory()
+            except Exception as e:
+                print(f"Skipping {backend_name}: {e}")
+                continue
+            print(f"Running {backend_name} ({args.count} assets of {args.size} bytes)...")
+            all_results[backend_name] = run_workload(manager, args.count, args.size)
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if not all_results:
+        return
+    phases = list(next(iter(all_results.values())))
+    print()
+    print(f"{'ops/s':<12}" + "".join(f"{name:>12}" for name in all_results))
+    for phase in phases:
+        row = "".join(f"{results[phase]:>12.0f}" for results in all_results.values())
+        print(f"{phase:<12}" + row)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,203 @@
 from pathlib import Path
 from enum import Enum
-from src.core.asset_manager import AssetManager
-from src.store.redis_store import RedisAssetManager
-from src.store.local_store import LocalAssetManager
+from typing import Any, Dict
+import os
+from src.core.asset_manager import AssetManager, AsyncAssetManager
+from src.core.async_asset_manager import ThreadedAsyncAssetManager
+from src.store.redis_store import ASSET_TTL_SECONDS, RedisAssetManager
+from src.store.local_store import get_local_manager
+from src.store.sqlite_store import SQLiteAssetManager
+from src.core.cached_asset_manager import CachedAssetManager, shared_asset_cache
+from src.core.circuit_breaker import CircuitBreaker
+from src.core.evicting_asset_manager import (
+    DEFAULT_BUDGETS,
+    DEFAULT_MIN_IDLE,
+    EvictingAssetManager,
+    shared_eviction_state,
+)
+from src.core.instrumented_asset_manager import InstrumentedAssetManager, shared_asset_metrics
+from src.core.tiered_asset_manager import TieredAssetManager, shared_replay_journal
+
+# Shared by all sessions: once Redis is unreachable, new sessions go straight to
+# local storage instead of each waiting for a connection timeout
+redis_circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
 
 class BackendType(Enum):
     REDIS = "redis"
     LOCAL = "local"
+    SQLITE = "sqlite"
+    TIERED = "tiered"
 
 def create_asset_manager(backend: BackendType, **kwargs) -> AssetManager:
     """
     Create an asset manager instance based on the specified backend type.
     
     Args:
-        backend (BackendType): Type of backend to use (LOCAL or REDIS)
+        backend (BackendType): Type of backend to use (LOCAL, REDIS, SQLITE or TIERED)
         **kwargs: Additional arguments for asset manager configuration
-            - base_path: Path for local storage (for LOCAL backend)
-            - redis_url: URL for Redis connection (for REDIS backend)
+            - base_path: Path for local storage (for LOCAL and TIERED backends)
+            - write_behind: Return from saves before files are on disk, committing them in
+              fsync'd groups; files behind file URLs are still written synchronously (for
+              LOCAL and TIERED backends, default False)
+            - redis_url: URL for Redis connection (for REDIS and TIERED backends)
+            - promote_after: Remote reads before an asset is copied to the local tier
+              (for TIERED backend)
+            - db_path: Path of the database file (for SQLITE backend)
+            - pool_config: RedisPoolConfig for the shared connection pool (for REDIS backend)
+            - dedup: Store identical contents once, content-addressed and reference counted
+              (for LOCAL, REDIS and TIERED backends, default False). Local dedup saves are
+              synchronous, so it can't be combined with write_behind
+            - compression: Optional CompressionPolicy applied to stored assets
+            - url_template: Emit reference URLs such as "/assets/{type}/{name}" instead of
+              inline data URLs (default None, i.e. inline)
+            - cache: Wrap the manager in a process-wide in-memory LRU cache (default False)
+            - cache_ttls: Per-asset-type cache TTLs in seconds, overriding the defaults
+            - asset_ttl: Seconds a Redis asset lives after its last save or access, and a
+              local hot copy after its last save (for REDIS and TIERED backends, default 3600)
+            - budgets: Per-asset-type byte budgets; wraps the manager in an eviction layer
+              (default None, i.e. no eviction)
+            - eviction_policy: "lru" or "lfu" (default "lru")
+            - eviction_min_idle: Seconds after its last save or read during which an
+              asset is in use and never evicted (default DEFAULT_MIN_IDLE)
+            - instrument: Record call counts, latencies and bytes per operation and type in
+              `shared_asset_metrics` (default False)
             
     Returns:
         AssetManager: An instance of the appropriate asset manager
         
     Raises:
-        ValueError: If an unknown backend type is provided
+        ValueError: If an unknown backend type is provided, or dedup and write_behind
+            are both enabled
     """
+    if kwargs.get("dedup", False) and kwargs.get("write_behind", False):
+        raise ValueError(
+            "dedup and write_behind can't be combined: deduplicated saves are synchronous"
+        )
+
     if backend == BackendType.LOCAL:
-        return LocalAssetManager(kwargs.get("base_path", Path("assets")))
+        # Shared per directory, so every session sees the writes still pending
+        manager = get_local_manager(
+            kwargs.get("base_path", Path("assets")),
+            compression=kwargs.get("compression"),
+            url_template=kwargs.get("url_template"),
+            write_behind=kwargs.get("write_behind", False),
+            dedup=kwargs.get("dedup", False),
+        )
+    elif backend == BackendType.SQLITE:
+        manager = SQLiteAssetManager(
+            kwargs.get("db_path", Path("assets.sqlite3")),
+            compression=kwargs.get("compression"),
+            url_template=kwargs.get("url_template"),
+        )
     elif backend == BackendType.REDIS:
-        return RedisAssetManager(kwargs.get("redis_url", "redis://localhost:6379"))
+        manager = RedisAssetManager(
+            kwargs.get("redis_url", "redis://localhost:6379"),
+            compression=kwargs.get("compression"),
+            pool_config=kwargs.get("pool_config"),
+            url_template=kwargs.get("url_template"),
+            dedup=kwargs.get("dedup", False),
+            ttl=kwargs.get("asset_ttl", ASSET_TTL_SECONDS),
+        )
+    elif backend == BackendType.TIERED:
+        # Layers wrap the tiered manager as a whole, not each tier
+        layer_kwargs = (
+            "cache", "cache_ttls", "budgets", "eviction_policy", "eviction_min_idle", "instrument"
+        )
+        remote_kwargs = {k: v for k, v in kwargs.items() if k not in layer_kwargs}
+        manager = TieredAssetManager(
+            create_asset_manager(BackendType.LOCAL, **remote_kwargs),
+            lambda: create_asset_manager(BackendType.REDIS, **remote_kwargs),
+            breaker=redis_circuit_breaker,
+            promote_after=kwargs.get("promote_after", 2),
+            journal=shared_replay_journal(kwargs.get("base_path", Path("assets"))),
+            hot_ttl=kwargs.get("asset_ttl", ASSET_TTL_SECONDS),
+        )
+    else:
+        raise ValueError(f"Unknown backend type: {backend}")
+
+    if kwargs.get("cache", False):
+        manager = CachedAssetManager(
+            manager, shared_asset_cache, kwargs.get("cache_ttls"), namespace=backend.value
+        )
+    # Outside the cache, so cache hits still count as accesses and refresh TTLs
+    if kwargs.get("budgets") is not None:
+        manager = EvictingAssetManager(
+            manager,
+            kwargs["budgets"],
+            policy=kwargs.get("eviction_policy", "lru"),
+            state=shared_eviction_state(backend.value),
+            min_idle=kwargs.get("eviction_min_idle", DEFAULT_MIN_IDLE),
+        )
+    # Outermost, so the recorded latencies are the ones callers see
+    if kwargs.get("instrument", False):
+        manager = InstrumentedAssetManager(manager, shared_asset_metrics)
+    return manager
+
+def create_async_asset_manager(backend: BackendType, **kwargs) -> AsyncAssetManager:
+    """
+    Create an async asset manager instance based on the specified backend type.
 
-    raise ValueError(f"Unknown backend type: {backend}")
+    Redis uses a native redis.asyncio client; other backends run their synchronous
+    manager in a thread pool.
+
+    Args:
+        backend (BackendType): Type of backend to use (LOCAL or REDIS)
+        **kwargs: Same configuration arguments as `create_asset_manager`
+
+    Returns:
+        AsyncAssetManager: An instance of the appropriate async asset manager
+    """
+    if backend == BackendType.REDIS:
+        from src.store.async_redis_store import AsyncRedisAssetManager
+        return AsyncRedisAssetManager(
+            kwargs.get("redis_url", "redis://localhost:6379"),
+            compression=kwargs.get("compression"),
+            pool_config=kwargs.get("pool_config"),
+            url_template=kwargs.get("url_template"),
+            dedup=kwargs.get("dedup", False),
+            ttl=kwargs.get("asset_ttl", ASSET_TTL_SECONDS),
+        )
+
+    return ThreadedAsyncAssetManager(create_asset_manager(backend, **kwargs))
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+def asset_options_from_env() -> Dict[str, Any]:
+    """
+    Read the optional asset store layers to enable from environment variables.
+
+    Every layer is off unless its variable is set to 1/true/yes/on:
+    ASSET_CACHE (in-memory cache), ASSET_WRITE_BEHIND (asynchronous local writes),
+    ASSET_DEDUP (content-addressed storage), ASSET_EVICTION (per-type byte budgets)
+    and ASSET_METRICS (call metrics). ASSET_WRITE_BEHIND and ASSET_DEDUP are mutually
+    exclusive. ASSET_EVICTION_MIN_IDLE sets the seconds recently used assets are kept
+    from eviction.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for `create_asset_manager`
+    """
+    options: Dict[str, Any] = {
+        "cache": _env_flag("ASSET_CACHE"),
+        "write_behind": _env_flag("ASSET_WRITE_BEHIND"),
+        "dedup": _env_flag("ASSET_DEDUP"),
+        "instrument": _env_flag("ASSET_METRICS"),
+    }
+    if _env_flag("ASSET_EVICTION"):
+        options["budgets"] = DEFAULT_BUDGETS
+        options["eviction_min_idle"] = float(
+            os.getenv("ASSET_EVICTION_MIN_IDLE", DEFAULT_MIN_IDLE)
+        )
+    return options
 
 def get_default_asset_manager(**kwargs) -> AssetManager:
     """
-    Get a default asset manager, trying Redis first and falling back to local storage.
+    Get a default asset manager: a local-disk tier over Redis.
+
+    Calls go to Redis whenever it is reachable and fall back to local storage while
+    it is not. Redis failures open a process-wide circuit breaker, so while Redis is
+    down calls fall back immediately instead of waiting for a timeout, and writes
+    made in the meantime are replayed once it is back.
     
     Args:
         **kwargs: Additional arguments for asset manager configuration
@@ -41,8 +205,4 @@ def get_default_asset_manager(**kwargs) -> AssetManager:
     Returns:
         AssetManager: An instance of the appropriate asset manager
     """
-    try:
-        return create_asset_manager(BackendType.REDIS)
-    except Exception:
-        print("Failed to connect to Redis, falling back to local storage")
-        return create_asset_manager(BackendType.LOCAL)
+    return create_asset_manager(BackendType.TIERED, **kwargs)
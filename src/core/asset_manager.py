@@ -1,4 +1,7 @@
-from typing import Protocol, runtime_checkable
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Protocol, Tuple, runtime_checkable
 from enum import Enum
 
 class AssetType(Enum):
@@ -12,6 +15,74 @@ class AssetType(Enum):
     PDF = "pdf"
 
 
+MIME_TYPES = {
+    AssetType.SVG: "image/svg+xml",
+    AssetType.JSON: "application/json",
+    AssetType.CSV: "text/csv",
+    AssetType.IMG: "image/png",
+    AssetType.PNG: "image/png",
+    AssetType.JPG: "image/jpeg",
+    AssetType.JPEG: "image/jpeg",
+    AssetType.PDF: "application/pdf",
+}
+
+# Piece size used by the default streaming implementations
+STREAM_CHUNK_SIZE = 512 * 1024
+
+
+@dataclass(frozen=True)
+class AssetStat:
+    """
+    Metadata of a stored asset, available without fetching its content.
+    """
+    name: str
+    asset_type: AssetType
+    size: int
+    content_hash: str
+    mtime: Optional[float]
+    mime_type: str
+
+    @classmethod
+    def from_content(
+            cls,
+            name: str,
+            asset_type: AssetType,
+            content: bytes,
+            mtime: Optional[float] = None,
+    ) -> "AssetStat":
+        digest = hashlib.sha256(content).hexdigest()
+        return cls(name, asset_type, len(content), digest, mtime, MIME_TYPES[asset_type])
+
+
+class BufferedAssetWriter(io.RawIOBase):
+    """
+    Writable file-like object collecting an asset in memory and saving it on close.
+
+    Default `open_write` implementation for backends without native streaming writes.
+    """
+
+    def __init__(self, manager: "AssetManager", name: str, asset_type: AssetType) -> None:
+        super().__init__()
+        self.manager = manager
+        self.name = name
+        self.asset_type = asset_type
+        self.url: Optional[str] = None
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.url = self.manager.save(self.name, bytes(self._buffer), self.asset_type)
+            self._buffer = bytearray()
+        super().close()
+
+
 @runtime_checkable
 class AssetManager(Protocol):
 
@@ -25,6 +96,7 @@ class AssetManager(Protocol):
         raise NotImplementedError
     
     def list(self, asset_type: AssetType) -> list[str]:
+        """List the assets of a type (every type if None) as "type:name" entries."""
         raise NotImplementedError
     
     def delete(self, name: str, asset_type: AssetType) -> None:
@@ -34,4 +106,148 @@ class AssetManager(Protocol):
         raise NotImplementedError
     
     def health_check(self) -> bool:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    # Optional methods. The defaults below are built on the required ones, so every
+    # backend supports them; backends override them with batched or streaming versions.
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        """
+        Save several assets.
+
+        Args:
+            items (List[Tuple[str, bytes, AssetType]]): (name, content, asset_type) tuples
+
+        Returns:
+            List[str]: Public URLs of the saved assets, in input order
+        """
+        return [self.save(name, content, asset_type) for name, content, asset_type in items]
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        """
+        Get several assets of one type.
+
+        Args:
+            names (List[str]): Names of the assets
+            asset_type (AssetType): Type of the assets
+
+        Returns:
+            Dict[str, bytes]: Content by name, missing assets are left out
+        """
+        contents = {}
+        for name in names:
+            try:
+                contents[name] = self.get(name, asset_type)
+            except FileNotFoundError:
+                continue
+        return contents
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        """
+        Delete several assets of one type.
+
+        Args:
+            names (List[str]): Names of the assets
+            asset_type (AssetType): Type of the assets
+        """
+        for name in names:
+            self.delete(name, asset_type)
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        """
+        Stream an asset's content in pieces.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Iterator[bytes]: Consecutive pieces of the asset content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        view = memoryview(self.get(name, asset_type))
+        return (
+            view[offset:offset + STREAM_CHUNK_SIZE].tobytes()
+            for offset in range(0, len(view), STREAM_CHUNK_SIZE)
+        )
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        """
+        Read the byte range [start, end) of an asset's content.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            start (int): Offset of the first byte to read
+            end (int): Offset one past the last byte to read
+
+        Returns:
+            bytes: The requested slice of the content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        return self.get(name, asset_type)[start:end]
+
+    def open_write(self, name: str, asset_type: AssetType) -> io.RawIOBase:
+        """
+        Open a writable file-like object for an asset; the asset is saved when it is
+        closed, and its public URL is then available as the writer's `url` attribute.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            io.RawIOBase: Writer to use as a context manager
+        """
+        return BufferedAssetWriter(self, name, asset_type)
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        """
+        Get an asset's size, content hash, modification time and MIME type.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            AssetStat: Metadata of the asset
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        return AssetStat.from_content(name, asset_type, self.get(name, asset_type))
+
+
+@runtime_checkable
+class AsyncAssetManager(Protocol):
+
+    async def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        raise NotImplementedError
+
+    async def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        raise NotImplementedError
+
+    async def get(self, name: str, asset_type: AssetType) -> bytes:
+        raise NotImplementedError
+
+    async def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        raise NotImplementedError
+
+    async def exists(self, name: str, asset_type: AssetType) -> bool:
+        raise NotImplementedError
+
+    async def list(self, asset_type: AssetType) -> list[str]:
+        raise NotImplementedError
+
+    async def delete(self, name: str, asset_type: AssetType) -> None:
+        raise NotImplementedError
+
+    async def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        raise NotImplementedError
+
+    async def health_check(self) -> bool:
+        raise NotImplementedError
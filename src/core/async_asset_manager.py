@@ -0,0 +1,97 @@
+import asyncio
+from threading import Lock, Thread
+from typing import Any, Coroutine, Dict, List, Optional, Tuple
+
+from src.core.asset_manager import AssetManager, AssetType, AsyncAssetManager
+
+
+class ThreadedAsyncAssetManager(AsyncAssetManager):
+    """
+    Async facade over a synchronous AssetManager.
+
+    Every call runs in the default thread pool, so blocking file or network I/O
+    (e.g. LocalAssetManager) does not stall the event loop and independent calls
+    can overlap.
+    """
+
+    def __init__(self, manager: AssetManager) -> None:
+        self.manager = manager
+
+    async def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return await asyncio.to_thread(self.manager.save, name, content, asset_type)
+
+    async def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        # One batched call keeps the wrapped manager's pipelining
+        return await asyncio.to_thread(self.manager.save_many, items)
+
+    async def get(self, name: str, asset_type: AssetType) -> bytes:
+        return await asyncio.to_thread(self.manager.get, name, asset_type)
+
+    async def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        return await asyncio.to_thread(self.manager.get_many, names, asset_type)
+
+    async def exists(self, name: str, asset_type: AssetType) -> bool:
+        return await asyncio.to_thread(self.manager.exists, name, asset_type)
+
+    async def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return await asyncio.to_thread(self.manager.list, asset_type)
+
+    async def delete(self, name: str, asset_type: AssetType) -> None:
+        await asyncio.to_thread(self.manager.delete, name, asset_type)
+
+    async def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        return await asyncio.to_thread(self.manager.get_public_url, name, asset_type)
+
+    async def health_check(self) -> bool:
+        return await asyncio.to_thread(self.manager.health_check)
+
+
+class SyncAssetManagerAdapter(AssetManager):
+    """
+    Synchronous AssetManager backed by an AsyncAssetManager.
+
+    Coroutines run on a private event loop in a daemon thread, so the adapter can be
+    used from synchronous code such as Streamlit callbacks, including code that is
+    itself running inside another event loop.
+    """
+
+    def __init__(self, manager: AsyncAssetManager) -> None:
+        self.manager = manager
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = Lock()
+
+    def _run(self, coroutine: Coroutine) -> Any:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                Thread(
+                    target=self._loop.run_forever, name="asset-manager-loop", daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return self._run(self.manager.save(name, content, asset_type))
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        return self._run(self.manager.save_many(items))
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        return self._run(self.manager.get(name, asset_type))
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        return self._run(self.manager.get_many(names, asset_type))
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        return self._run(self.manager.exists(name, asset_type))
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return self._run(self.manager.list(asset_type))
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        self._run(self.manager.delete(name, asset_type))
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        return self._run(self.manager.get_public_url(name, asset_type))
+
+    def health_check(self) -> bool:
+        return self._run(self.manager.health_check())
@@ -0,0 +1,161 @@
+import io
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+from src.core.byte_lru_cache import ByteLRUCache
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Documents can be edited from other sessions, so they are revalidated more often
+DEFAULT_TTLS: Dict[AssetType, float] = {
+    AssetType.JSON: 30,
+    AssetType.CSV: 300,
+}
+DEFAULT_TTL = 3600
+
+# Process-wide, so every session on this server shares hot assets
+shared_asset_cache = ByteLRUCache(DEFAULT_CACHE_MAX_BYTES)
+
+
+class CachedAssetManager(AssetManager):
+    """
+    Read-through cache in front of any AssetManager.
+
+    Asset content is kept in a byte-bounded LRU with per-type TTLs. Saves write
+    through to the wrapped manager and refresh the cache, deletes invalidate it.
+    Methods not defined here are delegated to the wrapped manager. If the wrapped
+    manager publishes change events from other processes (`add_change_listener`),
+    the cache subscribes to them and drops stale entries.
+    """
+
+    def __init__(
+            self,
+            manager: AssetManager,
+            cache: Optional[ByteLRUCache] = None,
+            ttls: Optional[Dict[AssetType, float]] = None,
+            namespace: str = "",
+    ) -> None:
+        self.manager = manager
+        self.cache = cache if cache is not None else ByteLRUCache(DEFAULT_CACHE_MAX_BYTES)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.namespace = namespace
+
+        if hasattr(manager, "add_change_listener"):
+            manager.add_change_listener(self._on_asset_change)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.manager, name)
+
+    def _make_key(self, name: str, asset_type: AssetType) -> Tuple[str, str, str]:
+        return self.namespace, asset_type.value, name
+
+    def _cache_get(self, name: str, asset_type: AssetType) -> Optional[bytes]:
+        key = self._make_key(name, asset_type)
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        content, expires_at = entry
+        if expires_at < time.monotonic():
+            self.cache.delete(key)
+            return None
+        return content
+
+    def _cache_put(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        expires_at = time.monotonic() + self.ttls.get(asset_type, DEFAULT_TTL)
+        self.cache.put(self._make_key(name, asset_type), (content, expires_at), len(content))
+
+    def invalidate(self, name: str, asset_type: AssetType) -> None:
+        """
+        Drop an asset from the cache.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+        """
+        self.cache.delete(self._make_key(name, asset_type))
+
+    def _on_asset_change(self, op: str, name: Optional[str], asset_type: AssetType) -> None:
+        if name is None:
+            self.cache.delete_matching(lambda key: key[:2] == (self.namespace, asset_type.value))
+        else:
+            self.invalidate(name, asset_type)
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        url = self.manager.save(name, content, asset_type)
+        self._cache_put(name, content, asset_type)
+        return url
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        urls = self.manager.save_many(items)
+        for name, content, asset_type in items:
+            self._cache_put(name, content, asset_type)
+        return urls
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        content = self._cache_get(name, asset_type)
+        if content is None:
+            content = self.manager.get(name, asset_type)
+            self._cache_put(name, content, asset_type)
+        return content
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        contents = {}
+        missing = []
+        for name in names:
+            content = self._cache_get(name, asset_type)
+            if content is None:
+                missing.append(name)
+            else:
+                contents[name] = content
+
+        if missing:
+            fetched = self.manager.get_many(missing, asset_type)
+            for name, content in fetched.items():
+                self._cache_put(name, content, asset_type)
+            contents.update(fetched)
+        return contents
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        if self._cache_get(name, asset_type) is not None:
+            return True
+        return self.manager.exists(name, asset_type)
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return self.manager.list(asset_type)
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        self.manager.delete(name, asset_type)
+        self.invalidate(name, asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        self.manager.delete_many(names, asset_type)
+        for name in names:
+            self.invalidate(name, asset_type)
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        content = self._cache_get(name, asset_type)
+        if content is not None:
+            return iter([content])
+        # Streamed reads are meant for large assets, so they bypass the cache
+        return self.manager.open_read(name, asset_type)
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        content = self._cache_get(name, asset_type)
+        if content is not None:
+            return content[start:end]
+        # Like streamed reads, range reads bypass the cache
+        return self.manager.read_range(name, asset_type, start, end)
+
+    def open_write(self, name: str, asset_type: AssetType) -> io.RawIOBase:
+        self.invalidate(name, asset_type)
+        return self.manager.open_write(name, asset_type)
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        return self.manager.stat(name, asset_type)
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        return self.manager.get_public_url(name, asset_type)
+
+    def health_check(self) -> bool:
+        return self.manager.health_check()
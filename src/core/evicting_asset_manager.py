@@ -0,0 +1,469 @@
+import hashlib
+import io
+import json
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from threading import Lock, RLock, Thread
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+from src.core.garbage_collector import (
+    DOCUMENT_PREFIX,
+    PINNED_ASSETS,
+    AssetGarbageCollector,
+    ReferenceSet,
+    list_asset_names,
+)
+from src.core.tiered_asset_manager import RemoteUnavailable, remote_required
+
+LRU = "lru"
+LFU = "lfu"
+
+# Bounds for the asset types the app accumulates; documents (JSON) and tables (CSV)
+# are never evicted. Each process enforces them on its own view of the store's usage
+# (see EvictingAssetManager)
+DEFAULT_BUDGETS: Dict[AssetType, int] = {
+    AssetType.SVG: 256 * 1024 * 1024,
+    AssetType.IMG: 512 * 1024 * 1024,
+    AssetType.PNG: 512 * 1024 * 1024,
+    AssetType.JPG: 256 * 1024 * 1024,
+    AssetType.JPEG: 256 * 1024 * 1024,
+    AssetType.PDF: 1024 * 1024 * 1024,
+}
+# Assets saved or read more recently than this are in use and never evicted: assets of
+# pages still being edited aren't referenced by any saved document yet, so they aren't
+# pinned. An hour is assumed to cover editing a page before its document is saved; the
+# collector's one-day grace period would keep the budgets from biting on a store that
+# fills up within a day. Raise it (ASSET_EVICTION_MIN_IDLE) for longer editing sessions
+DEFAULT_MIN_IDLE = 3600.0
+# Minimum seconds between two TTL refreshes of one asset
+DEFAULT_TOUCH_INTERVAL = 60.0
+# Seconds between two markings of the assets referenced by saved documents
+DEFAULT_PIN_REFRESH = 600.0
+# Remembered TTL refreshes of assets of types without a budget
+MAX_TOUCHED_ENTRIES = 10000
+
+
+@dataclass
+class AssetUsage:
+    """
+    Access statistics of a tracked asset.
+    """
+    size: int
+    content_hash: Optional[str]
+    last_access: float
+    hits: int = 0
+    last_touch: float = 0.0
+
+
+class EvictionState:
+    """
+    Usage tracking and pins of one store, shared by every EvictingAssetManager of
+    the process in front of it, so budgets hold across sessions.
+    """
+
+    def __init__(self) -> None:
+        self.lock = RLock()
+        # Per type, in least recently used first order
+        self.usage: Dict[AssetType, OrderedDict[str, AssetUsage]] = {}
+        self.totals: Dict[AssetType, int] = {}
+        # Per type, tracked assets per content hash, on stores keeping identical
+        # contents once: their bytes are counted for the first one only
+        self.content_refs: Dict[AssetType, Counter] = {}
+        # Types whose stored assets are still being loaded -> names forgotten meanwhile
+        self.loading: Dict[AssetType, Set[str]] = {}
+        self.touched: OrderedDict[Tuple[AssetType, str], float] = OrderedDict()
+        self.pins: Optional[ReferenceSet] = None
+        self.pins_marked_at = 0.0
+        self.pin_lock = Lock()
+
+
+_states: Dict[str, EvictionState] = {}
+_states_lock = Lock()
+
+
+def shared_eviction_state(namespace: str) -> EvictionState:
+    """
+    Get the process-wide eviction state of a store, creating it on first use.
+
+    Args:
+        namespace (str): Identifies the store, e.g. the backend type
+
+    Returns:
+        EvictionState: The shared state
+    """
+    with _states_lock:
+        if namespace not in _states:
+            _states[namespace] = EvictionState()
+        return _states[namespace]
+
+
+class EvictingAssetManager(AssetManager):
+    """
+    Byte-budgeted eviction layer in front of any AssetManager.
+
+    Each asset type with a budget keeps its stored bytes below it: when a save goes
+    over, the least recently (LRU) or least frequently (LFU) used assets are deleted.
+    Assets referenced by saved documents are pinned, and assets saved or read within
+    the last `min_idle` seconds count as in use, so neither is evicted. Reading an
+    asset also refreshes its expiry on stores with a TTL (`touch`), and pinned assets
+    are refreshed whenever the pins are re-marked. Pins are marked on a background
+    thread; until the first marking completes nothing is evicted.
+
+    Usage is tracked per process from the accesses going through the layer; existing
+    assets are loaded in the background, oldest first, the first time their type is
+    used. Budgets are therefore per process too: with several app servers in front of
+    one store, each only counts the assets stored when it loaded the type plus those
+    it saved or read since, so the store can hold more than a budget until the other
+    processes' assets are accessed or the servers restart. Methods not defined here are
+    delegated to the wrapped manager.
+
+    Over a tiered manager nothing is evicted while the remote tier is unreachable, and
+    pins are only re-marked from a complete listing of the documents; failed markings
+    keep the previous pins.
+    """
+
+    def __init__(
+            self,
+            manager: AssetManager,
+            budgets: Optional[Dict[AssetType, int]] = None,
+            policy: str = LRU,
+            state: Optional[EvictionState] = None,
+            min_idle: float = DEFAULT_MIN_IDLE,
+            touch_interval: float = DEFAULT_TOUCH_INTERVAL,
+            pin_refresh: float = DEFAULT_PIN_REFRESH,
+    ) -> None:
+        if policy not in (LRU, LFU):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.manager = manager
+        self.budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self.policy = policy
+        self.state = state if state is not None else EvictionState()
+        self.min_idle = min_idle
+        self.touch_interval = touch_interval
+        self.pin_refresh = pin_refresh
+        self._touch = getattr(manager, "touch", None)
+        # Deduplicating stores hold the content of same-content assets once
+        self._shared_content = bool(getattr(manager, "dedup", False))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.manager, name)
+
+    def _usage(self, asset_type: AssetType) -> OrderedDict:
+        """Get the usage of a budgeted type, loading the stored assets on first use."""
+        state = self.state
+        with state.lock:
+            if asset_type not in state.usage:
+                state.usage[asset_type] = OrderedDict()
+                state.totals[asset_type] = 0
+                state.content_refs[asset_type] = Counter()
+                state.loading[asset_type] = set()
+                Thread(
+                    target=self._load_usage, args=(asset_type,), name="asset-usage", daemon=True
+                ).start()
+            return state.usage[asset_type]
+
+    def _load_usage(self, asset_type: AssetType) -> None:
+        """Add the assets stored before the type was first used, oldest first."""
+        state = self.state
+        stats = []
+        try:
+            for name in list_asset_names(self.manager, asset_type):
+                try:
+                    stats.append(self.manager.stat(name, asset_type))
+                except FileNotFoundError:
+                    continue
+        except Exception as e:
+            print(f"Loading {asset_type.value} asset usage failed: {e}")
+        stats.sort(key=lambda stat: stat.mtime or 0.0, reverse=True)
+
+        with state.lock:
+            usage = state.usage[asset_type]
+            forgotten = state.loading.pop(asset_type, set())
+            for stat in stats:
+                # Entries recorded while loading are newer
+                if stat.name in usage or stat.name in forgotten:
+                    continue
+                entry = AssetUsage(stat.size, stat.content_hash, stat.mtime or 0.0)
+                usage[stat.name] = entry
+                usage.move_to_end(stat.name, last=False)
+                self._count(asset_type, entry)
+        self._enforce(asset_type)
+
+    def _record_save(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        if asset_type == AssetType.JSON and name.startswith(DOCUMENT_PREFIX):
+            self._pin_document(content)
+        if asset_type not in self.budgets:
+            return
+        usage = self._usage(asset_type)
+        now = time.time()
+        with self.state.lock:
+            previous = usage.pop(name, None)
+            content_hash = hashlib.sha256(content).hexdigest()
+            entry = AssetUsage(len(content), content_hash, now, last_touch=now)
+            if previous is not None:
+                entry.hits = previous.hits
+                self._uncount(asset_type, previous)
+            usage[name] = entry
+            self._count(asset_type, entry)
+
+    def _record_access(self, name: str, asset_type: AssetType) -> None:
+        now = time.time()
+        if asset_type not in self.budgets:
+            self._touch_untracked(name, asset_type, now)
+            return
+
+        usage = self._usage(asset_type)
+        with self.state.lock:
+            entry = usage.get(name)
+            if entry is not None:
+                usage.move_to_end(name)
+                entry.hits += 1
+                entry.last_access = now
+                due = now - entry.last_touch >= self.touch_interval
+                if due:
+                    entry.last_touch = now
+        if entry is None:
+            # Written by another process or through open_write
+            try:
+                stat = self.manager.stat(name, asset_type)
+            except FileNotFoundError:
+                return
+            with self.state.lock:
+                if name not in usage:
+                    usage[name] = AssetUsage(stat.size, stat.content_hash, now, 1, now)
+                    self._count(asset_type, usage[name])
+            self._enforce(asset_type)
+            due = True
+        if due and self._touch is not None:
+            self._touch(name, asset_type)
+
+    def _touch_untracked(self, name: str, asset_type: AssetType, now: float) -> None:
+        if self._touch is None:
+            return
+        key = (asset_type, name)
+        with self.state.lock:
+            if now - self.state.touched.get(key, 0.0) < self.touch_interval:
+                return
+            self.state.touched[key] = now
+            self.state.touched.move_to_end(key)
+            while len(self.state.touched) > MAX_TOUCHED_ENTRIES:
+                self.state.touched.popitem(last=False)
+        self._touch(name, asset_type)
+
+    def _forget(self, names: List[str], asset_type: AssetType) -> None:
+        with self.state.lock:
+            usage = self.state.usage.get(asset_type)
+            if asset_type in self.state.loading:
+                self.state.loading[asset_type].update(names)
+            for name in names:
+                self.state.touched.pop((asset_type, name), None)
+                entry = usage.pop(name, None) if usage is not None else None
+                if entry is not None:
+                    self._uncount(asset_type, entry)
+
+    def _shares_content(self, entry: AssetUsage) -> bool:
+        return self._shared_content and entry.content_hash is not None
+
+    def _count(self, asset_type: AssetType, entry: AssetUsage) -> None:
+        """Add a tracked asset's bytes to its type's total; runs holding the state lock."""
+        if self._shares_content(entry):
+            refs = self.state.content_refs[asset_type]
+            refs[entry.content_hash] += 1
+            if refs[entry.content_hash] > 1:
+                return
+        self.state.totals[asset_type] += entry.size
+
+    def _uncount(self, asset_type: AssetType, entry: AssetUsage) -> None:
+        """Remove a tracked asset's bytes from its type's total; runs holding the state lock."""
+        if self._shares_content(entry):
+            refs = self.state.content_refs[asset_type]
+            refs[entry.content_hash] -= 1
+            if refs[entry.content_hash] > 0:
+                return
+            del refs[entry.content_hash]
+        self.state.totals[asset_type] -= entry.size
+
+    def _pins(self) -> Optional[ReferenceSet]:
+        """
+        Get the assets referenced by saved documents, re-marking them in the
+        background when stale.
+        """
+        state = self.state
+        stale = time.monotonic() - state.pins_marked_at >= self.pin_refresh
+        if (state.pins is None or stale) and state.pin_lock.acquire(blocking=False):
+            Thread(target=self._mark_pins, name="asset-pins", daemon=True).start()
+        return state.pins
+
+    def _mark_pins(self) -> None:
+        """Mark the assets saved documents refer to; runs holding the pin lock."""
+        state = self.state
+        try:
+            collector = AssetGarbageCollector(self.manager)
+            # Documents missing from a local-only listing would unpin their assets
+            with remote_required():
+                pins = collector.mark()
+            state.pins, state.pins_marked_at = pins, time.monotonic()
+            self._touch_pinned(pins, collector.marked_documents)
+        except Exception as e:
+            print(f"Marking document assets failed, keeping previous pins: {e}")
+        finally:
+            state.pin_lock.release()
+
+    def _touch_pinned(self, pins: ReferenceSet, documents: List[str]) -> None:
+        """Refresh the expiry of saved documents and their assets, so they outlive the TTL."""
+        if self._touch is None:
+            return
+        pinned = {(AssetType.JSON, name) for name in documents}
+        with self.state.lock:
+            pinned.update(pins.typed_names)
+            for asset_type, usage in self.state.usage.items():
+                pinned.update(
+                    (asset_type, name) for name, entry in usage.items()
+                    if pins.is_referenced(name, asset_type, entry.content_hash)
+                )
+        for asset_type, name in pinned:
+            self._touch(name, asset_type)
+
+    def _pin_document(self, content: bytes) -> None:
+        pins = self.state.pins
+        if pins is None:
+            return
+        try:
+            document = json.loads(content)
+        except (ValueError, UnicodeDecodeError):
+            return
+        with self.state.lock:
+            pins.add_document(document)
+
+    def _enforce(self, asset_type: AssetType) -> None:
+        """Evict assets of a type until it fits its budget."""
+        budget = self.budgets.get(asset_type)
+        if budget is None or self.state.totals.get(asset_type, 0) <= budget:
+            return
+        pins = self._pins()
+        if pins is None or not getattr(self.manager, "remote_available", True):
+            # Without knowing what documents use, nothing is safe to evict
+            return
+
+        idle_before = time.time() - self.min_idle
+        victims = []
+        # Same-content victims per content hash; only the last one frees their bytes
+        released: Counter = Counter()
+        with self.state.lock:
+            usage = self.state.usage[asset_type]
+            refs = self.state.content_refs[asset_type]
+            total = self.state.totals[asset_type]
+            if self.policy == LRU:
+                candidates = list(usage.items())
+            else:
+                candidates = sorted(
+                    usage.items(), key=lambda item: (item[1].hits, item[1].last_access)
+                )
+            for name, entry in candidates:
+                if total <= budget:
+                    break
+                if entry.last_access > idle_before or (asset_type, name) in PINNED_ASSETS:
+                    continue
+                if pins.is_referenced(name, asset_type, entry.content_hash):
+                    continue
+                victims.append(name)
+                if self._shares_content(entry):
+                    released[entry.content_hash] += 1
+                    if released[entry.content_hash] < refs[entry.content_hash]:
+                        continue
+                total -= entry.size
+
+        if total > budget:
+            print(
+                f"{asset_type.value} assets exceed their {budget} byte budget, "
+                "the rest is pinned or in use"
+            )
+        if not victims:
+            return
+        try:
+            # Evictions are never queued to reach the remote tier after an outage
+            with remote_required():
+                self.manager.delete_many(victims, asset_type)
+        except RemoteUnavailable:
+            return
+        self._forget(victims, asset_type)
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return self.save_many([(name, content, asset_type)])[0]
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        urls = self.manager.save_many(items)
+        # Start re-marking the pins here rather than on reads, which are latency sensitive
+        self._pins()
+        for name, content, asset_type in items:
+            self._record_save(name, content, asset_type)
+        for asset_type in {asset_type for _, _, asset_type in items}:
+            self._enforce(asset_type)
+        return urls
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        content = self.manager.get(name, asset_type)
+        self._record_access(name, asset_type)
+        return content
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        contents = self.manager.get_many(names, asset_type)
+        for name in contents:
+            self._record_access(name, asset_type)
+        return contents
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        pieces = self.manager.open_read(name, asset_type)
+        self._record_access(name, asset_type)
+        return pieces
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        data = self.manager.read_range(name, asset_type, start, end)
+        self._record_access(name, asset_type)
+        return data
+
+    def open_write(self, name: str, asset_type: AssetType) -> io.RawIOBase:
+        # The size is only known once written; it is picked up on the next access
+        self._forget([name], asset_type)
+        return self.manager.open_write(name, asset_type)
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        return self.manager.exists(name, asset_type)
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return self.manager.list(asset_type)
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        self.manager.delete(name, asset_type)
+        self._forget([name], asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        self.manager.delete_many(names, asset_type)
+        self._forget(names, asset_type)
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        return self.manager.stat(name, asset_type)
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        url = self.manager.get_public_url(name, asset_type)
+        self._record_access(name, asset_type)
+        return url
+
+    def usage_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Tracked bytes and asset counts per budgeted type, with their budgets.
+        """
+        with self.state.lock:
+            return {
+                asset_type.value: {
+                    "bytes": self.state.totals.get(asset_type, 0),
+                    "assets": len(usage),
+                    "budget": self.budgets.get(asset_type, 0),
+                }
+                for asset_type, usage in self.state.usage.items()
+            }
+
+    def health_check(self) -> bool:
+        return self.manager.health_check()
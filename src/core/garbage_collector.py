@@ -0,0 +1,443 @@
+"""
+Mark-and-sweep collection of assets no saved document refers to.
+
+Editing a page saves a new uuid-named asset for every uploaded file and wall
+projection, and most of them never make it into a saved Document. The collector
+marks everything reachable from the saved documents, then deletes the other assets
+once they are older than a grace period, in small batches.
+
+Usage:
+    python -m src.core.garbage_collector [--backend tiered] [--grace-period 86400]
+                                         [--batch-size 200] [--dry-run]
+"""
+import argparse
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from src.core.asset_manager import AssetManager, AssetType
+from src.core.tiered_asset_manager import RemoteUnavailable, remote_required
+from src.store.local_store import BLOBS_DIRNAME
+
+# Saved documents are the roots of the reference graph
+DOCUMENT_PREFIX = "documents:"
+# Assets the app saves at start-up and uses without a document referring to them
+# (see StateManager._init_logos)
+PINNED_ASSETS = {
+    (AssetType.IMG, "logo_powered.png"),
+    (AssetType.SVG, "logo_header.svg"),
+}
+DEFAULT_GRACE_PERIOD = 24 * 3600
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_INTERVAL = 6 * 3600
+
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass
+class CollectionReport:
+    """
+    Outcome of one collection run.
+    """
+    documents: int = 0
+    scanned: int = 0
+    referenced: int = 0
+    too_recent: int = 0
+    deleted: int = 0
+    reclaimed_bytes: int = 0
+    batches: int = 0
+    duration: float = 0.0
+    dry_run: bool = False
+    # Stopped because the remote tier became unreachable
+    aborted: bool = False
+    deleted_per_type: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "scanned": self.scanned,
+            "referenced": self.referenced,
+            "too_recent": self.too_recent,
+            "deleted": self.deleted,
+            "reclaimed_bytes": self.reclaimed_bytes,
+            "batches": self.batches,
+            "duration": round(self.duration, 3),
+            "dry_run": self.dry_run,
+            "aborted": self.aborted,
+            "deleted_per_type": dict(self.deleted_per_type),
+        }
+
+
+@dataclass
+class ReferenceSet:
+    """
+    Assets reachable from the saved documents.
+
+    Documents refer to assets by name (AssetReference entries, reference URLs and
+    file paths) or embed them as data URLs, which are matched by content hash, as
+    are the file URLs of deduplicated local assets, which point at their blob.
+    """
+    names: Set[str] = field(default_factory=set)
+    typed_names: Set[Tuple[AssetType, str]] = field(default_factory=set)
+    content_hashes: Set[str] = field(default_factory=set)
+
+    def add_document(self, document: Any) -> None:
+        """Mark everything a parsed document JSON refers to."""
+        for value in _walk(document):
+            if isinstance(value, dict):
+                name, type_value = value.get("name"), value.get("asset_type")
+                if isinstance(name, str) and isinstance(type_value, str):
+                    try:
+                        self.typed_names.add((AssetType(type_value), name))
+                    except ValueError:
+                        pass
+            elif isinstance(value, str):
+                self._add_string(value)
+
+    def _add_string(self, value: str) -> None:
+        if value.startswith("data:"):
+            header, _, payload = value.partition(",")
+            if header.endswith(";base64"):
+                try:
+                    content = base64.b64decode(payload, validate=True)
+                except (binascii.Error, ValueError):
+                    return
+                self.content_hashes.add(hashlib.sha256(content).hexdigest())
+        elif "/" in value or "\\" in value:
+            path = unquote(value.replace("\\", "/"))
+            basename = path.rsplit("/", 1)[-1]
+            # Blob files (".../blobs/ab/cd/<sha256>[.codec]") are named by content hash
+            content_hash = basename.split(".", 1)[0]
+            if f"/{BLOBS_DIRNAME}/" in path and _SHA256.fullmatch(content_hash):
+                self.content_hashes.add(content_hash)
+                return
+            # Reference URLs ("/assets/svg/<name>") and temp file paths end with the name
+            self.names.add(basename)
+
+    def is_referenced(
+            self,
+            name: str,
+            asset_type: AssetType,
+            content_hash: Optional[str] = None,
+    ) -> bool:
+        return (
+            (asset_type, name) in self.typed_names
+            or name in self.names
+            or (content_hash is not None and content_hash in self.content_hashes)
+        )
+
+
+def _walk(value: Any) -> Iterator[Any]:
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        yield current
+        if isinstance(current, dict):
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def list_asset_names(manager: AssetManager, asset_type: AssetType) -> List[str]:
+    """
+    List the names of every asset of a type, without the "type:" prefix of the entries
+    returned by `AssetManager.list`. Bare names, as listed by third-party managers, are
+    kept as they are.
+    """
+    prefix = f"{asset_type.value}:"
+    return [
+        entry[len(prefix):] if entry.startswith(prefix) else entry
+        for entry in manager.list(asset_type)
+    ]
+
+
+class AssetGarbageCollector:
+    """
+    Mark-and-sweep collector deleting assets that no saved document refers to.
+
+    Only assets older than `grace_period` seconds are deleted, so assets of pages
+    still being edited survive until their document is saved. Saved documents and
+    pinned assets are never collected. The sweep runs in batches of `batch_size`
+    assets with an optional pause in between; before each batch the documents saved
+    since marking are marked too.
+
+    Over a tiered manager, a run stops without deleting anything further as soon as
+    the remote tier is unreachable: the local tier alone lists neither every document
+    nor every asset, and deletes queued for replay would reach Redis later.
+    """
+
+    def __init__(
+            self,
+            manager: AssetManager,
+            grace_period: float = DEFAULT_GRACE_PERIOD,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            pause: float = 0.0,
+            pinned: Optional[Set[Tuple[AssetType, str]]] = None,
+    ) -> None:
+        self.manager = manager
+        self.grace_period = grace_period
+        self.batch_size = batch_size
+        self.pause = pause
+        self.pinned = PINNED_ASSETS if pinned is None else pinned
+        self._lock = threading.Lock()
+        # Document name -> mtime when it was last marked
+        self._marked_documents: Dict[str, Optional[float]] = {}
+
+    @property
+    def marked_documents(self) -> List[str]:
+        """Names of the documents read by the last marking."""
+        return list(self._marked_documents)
+
+    def mark(self) -> ReferenceSet:
+        """
+        Collect the references of every saved document.
+
+        Returns:
+            ReferenceSet: Assets reachable from the documents
+        """
+        references = ReferenceSet()
+        self._marked_documents = {}
+        self._mark_documents(references, self._document_names())
+        return references
+
+    def _document_names(self) -> List[str]:
+        names = list_asset_names(self.manager, AssetType.JSON)
+        return [name for name in names if name.startswith(DOCUMENT_PREFIX)]
+
+    def _mark_documents(self, references: ReferenceSet, names: List[str]) -> None:
+        for start in range(0, len(names), self.batch_size):
+            batch = names[start:start + self.batch_size]
+            # Read the mtimes first, so an update racing the fetch is marked again later
+            mtimes = {name: self._mtime(name, AssetType.JSON) for name in batch}
+            for name, content in self.manager.get_many(batch, AssetType.JSON).items():
+                try:
+                    references.add_document(json.loads(content))
+                except (ValueError, UnicodeDecodeError) as e:
+                    print(f"Skipping unreadable document {name}: {e}")
+                self._marked_documents[name] = mtimes[name]
+
+    def _mark_changed_documents(self, references: ReferenceSet) -> None:
+        """Mark documents saved or updated since the last marking."""
+        changed = [
+            name for name in self._document_names()
+            if name not in self._marked_documents
+            or self._mtime(name, AssetType.JSON) != self._marked_documents[name]
+        ]
+        if changed:
+            self._mark_documents(references, changed)
+
+    def _mtime(self, name: str, asset_type: AssetType) -> Optional[float]:
+        try:
+            return self.manager.stat(name, asset_type).mtime
+        except FileNotFoundError:
+            return None
+
+    def collect(
+            self,
+            dry_run: bool = False,
+            asset_types: Optional[List[AssetType]] = None,
+    ) -> CollectionReport:
+        """
+        Run one mark-and-sweep pass.
+
+        Args:
+            dry_run (bool): Only report what would be deleted
+            asset_types (Optional[List[AssetType]]): Types to sweep, default all but JSON
+
+        Returns:
+            CollectionReport: Counts and reclaimed bytes of the run
+        """
+        if not self._lock.acquire(blocking=False):
+            print("Asset garbage collection already running, skipping")
+            return CollectionReport(dry_run=dry_run)
+        try:
+            return self._collect(dry_run, asset_types)
+        finally:
+            self._lock.release()
+
+    def _collect(self, dry_run: bool, asset_types: Optional[List[AssetType]]) -> CollectionReport:
+        started = time.monotonic()
+        report = CollectionReport(dry_run=dry_run)
+        try:
+            with remote_required():
+                self._mark_and_sweep(asset_types, report)
+        except RemoteUnavailable:
+            report.aborted = True
+
+        report.duration = time.monotonic() - started
+        if report.aborted:
+            print(
+                "Remote asset store unavailable, stopped asset garbage collection "
+                f"after deleting {report.deleted} assets"
+            )
+            return report
+        print(
+            f"Asset garbage collection {'(dry run) ' if dry_run else ''}"
+            f"deleted {report.deleted} of {report.scanned} assets, "
+            f"reclaiming {report.reclaimed_bytes} bytes in {report.duration:.1f}s"
+        )
+        return report
+
+    def _mark_and_sweep(
+            self,
+            asset_types: Optional[List[AssetType]],
+            report: CollectionReport,
+    ) -> None:
+        references = self.mark()
+        report.documents = len(self._marked_documents)
+        cutoff = time.time() - self.grace_period
+
+        for asset_type in asset_types or [at for at in AssetType if at != AssetType.JSON]:
+            self._check_remote()
+            names = [
+                name for name in list_asset_names(self.manager, asset_type)
+                if (asset_type, name) not in self.pinned
+            ]
+            for start in range(0, len(names), self.batch_size):
+                if report.batches and self.pause:
+                    time.sleep(self.pause)
+                self._mark_changed_documents(references)
+                self._check_remote()
+                batch = names[start:start + self.batch_size]
+                self._sweep_batch(batch, asset_type, references, cutoff, report)
+                report.batches += 1
+
+    def _check_remote(self) -> None:
+        """
+        Raise RemoteUnavailable if the manager has a remote tier that is down, e.g. a
+        circuit breaker opened by a failure while marking.
+        """
+        if not getattr(self.manager, "remote_available", True):
+            raise RemoteUnavailable()
+
+    def _sweep_batch(
+            self,
+            names: List[str],
+            asset_type: AssetType,
+            references: ReferenceSet,
+            cutoff: float,
+            report: CollectionReport,
+    ) -> None:
+        doomed = []
+        reclaimed = 0
+        for name in names:
+            report.scanned += 1
+            if references.is_referenced(name, asset_type):
+                report.referenced += 1
+                continue
+            try:
+                stat = self.manager.stat(name, asset_type)
+            except FileNotFoundError:
+                continue
+            if references.is_referenced(name, asset_type, stat.content_hash):
+                report.referenced += 1
+            elif stat.mtime is not None and stat.mtime > cutoff:
+                report.too_recent += 1
+            else:
+                doomed.append(name)
+                reclaimed += stat.size
+
+        if not doomed:
+            return
+        if not report.dry_run:
+            self.manager.delete_many(doomed, asset_type)
+        report.deleted += len(doomed)
+        report.reclaimed_bytes += reclaimed
+        per_type = report.deleted_per_type
+        per_type[asset_type.value] = per_type.get(asset_type.value, 0) + len(doomed)
+
+
+class BackgroundCollector(threading.Thread):
+    """
+    Daemon thread running a collector every `interval` seconds.
+    """
+
+    def __init__(
+            self,
+            collector: AssetGarbageCollector,
+            interval: float = DEFAULT_INTERVAL,
+    ) -> None:
+        super().__init__(name="asset-gc", daemon=True)
+        self.collector = collector
+        self.interval = interval
+        self.last_report: Optional[CollectionReport] = None
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.last_report = self.collector.collect()
+            except Exception as e:
+                print(f"Asset garbage collection failed: {e}")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+_background_collector: Optional[BackgroundCollector] = None
+_background_lock = threading.Lock()
+
+
+def start_background_collector(
+        manager: AssetManager,
+        interval: Optional[float] = None,
+        **kwargs,
+) -> Optional[BackgroundCollector]:
+    """
+    Start the process-wide background collector, unless it is already running.
+
+    The interval defaults to the ASSET_GC_INTERVAL environment variable (seconds;
+    unset or 0 disables collection) and the grace period to ASSET_GC_GRACE_PERIOD.
+
+    Args:
+        manager (AssetManager): Manager to collect
+        interval (Optional[float]): Seconds between runs
+        **kwargs: Additional AssetGarbageCollector arguments
+
+    Returns:
+        Optional[BackgroundCollector]: The running collector, or None if disabled
+    """
+    global _background_collector
+    if interval is None:
+        interval = float(os.getenv("ASSET_GC_INTERVAL", 0))
+    if interval <= 0:
+        return None
+    grace_period = float(os.getenv("ASSET_GC_GRACE_PERIOD", DEFAULT_GRACE_PERIOD))
+    kwargs.setdefault("grace_period", grace_period)
+
+    with _background_lock:
+        if _background_collector is None or not _background_collector.is_alive():
+            collector = AssetGarbageCollector(manager, **kwargs)
+            _background_collector = BackgroundCollector(collector, interval)
+            _background_collector.start()
+        return _background_collector
+
+
+def main() -> None:
+    from src.core.asset_factory import BackendType, create_asset_manager
+
+    parser = argparse.ArgumentParser(description="Delete assets no saved document refers to")
+    parser.add_argument("--backend", default="tiered", choices=[b.value for b in BackendType])
+    parser.add_argument("--grace-period", type=float, default=DEFAULT_GRACE_PERIOD,
+                        help="Keep unreferenced assets younger than this many seconds")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to wait between batches")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+    args = parser.parse_args()
+
+    manager = create_asset_manager(BackendType(args.backend))
+    collector = AssetGarbageCollector(manager, args.grace_period, args.batch_size, args.pause)
+    report = collector.collect(dry_run=args.dry_run)
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
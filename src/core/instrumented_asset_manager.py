@@ -0,0 +1,313 @@
+import io
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Type label of operations not bound to one asset type (list, health_check)
+ANY_TYPE = "all"
+
+# UI path the current calls are made for, attached to every metric as the "scope" label
+asset_scope: ContextVar[str] = ContextVar("asset_scope", default="")
+
+
+@contextmanager
+def metrics_scope(label: str) -> Iterator[None]:
+    """
+    Attribute the asset store calls made inside the block (or decorated function)
+    to a UI path.
+
+    Args:
+        label (str): Name of the UI path, e.g. "document_list"
+    """
+    token = asset_scope.set(label)
+    try:
+        yield
+    finally:
+        asset_scope.reset(token)
+
+
+@dataclass
+class OperationStats:
+    """
+    Counters of one (operation, asset type, scope) series.
+    """
+    calls: int = 0
+    errors: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    latency_sum: float = 0.0
+    # Non-cumulative counts per LATENCY_BUCKETS entry, plus one for +Inf
+    latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+class AssetMetrics:
+    """
+    Thread-safe registry of asset store call metrics.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._series: Dict[Tuple[str, str, str], OperationStats] = {}
+
+    def record(
+            self,
+            operation: str,
+            asset_type: Optional[AssetType],
+            elapsed: float,
+            bytes_in: int = 0,
+            bytes_out: int = 0,
+            error: bool = False,
+    ) -> None:
+        """
+        Record one call.
+
+        Args:
+            operation (str): AssetManager method name
+            asset_type (Optional[AssetType]): Type of the assets involved, None for all
+            elapsed (float): Latency in seconds
+            bytes_in (int): Bytes written to the store
+            bytes_out (int): Bytes read from the store
+            error (bool): Whether the call raised
+        """
+        key = (operation, asset_type.value if asset_type else ANY_TYPE, asset_scope.get())
+        with self._lock:
+            stats = self._series.get(key)
+            if stats is None:
+                stats = self._series[key] = OperationStats()
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.latency_sum += elapsed
+            stats.latency_buckets[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def add_bytes(self, operation: str, asset_type: AssetType, scope: str, bytes_out: int) -> None:
+        """Add bytes read after the call returned, e.g. by a streamed read."""
+        with self._lock:
+            stats = self._series.get((operation, asset_type.value, scope))
+            if stats is not None:
+                stats.bytes_out += bytes_out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def as_dict(self) -> Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Get the metrics nested by operation, asset type and scope.
+
+        Returns:
+            Dict: {operation: {type: {scope: {"calls", "errors", "bytes_in", "bytes_out",
+            "latency_sum", "latency_avg", "latency_buckets"}}}}, where latency_buckets
+            maps each upper bound ("+Inf" last) to the cumulative call count
+        """
+        with self._lock:
+            series = {
+                key: (stats, list(stats.latency_buckets)) for key, stats in self._series.items()
+            }
+
+        result: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        for (operation, type_value, scope), (stats, buckets) in sorted(series.items()):
+            result.setdefault(operation, {}).setdefault(type_value, {})[scope] = {
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "bytes_in": stats.bytes_in,
+                "bytes_out": stats.bytes_out,
+                "latency_sum": stats.latency_sum,
+                "latency_avg": stats.latency_sum / stats.calls if stats.calls else 0.0,
+                "latency_buckets": dict(zip(_bucket_labels(), _cumulative(buckets), strict=True)),
+            }
+        return result
+
+    def to_prometheus(self, prefix: str = "asset_store") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text with calls, errors, bytes and latency histogram families
+        """
+        with self._lock:
+            series = [
+                (key, stats, list(stats.latency_buckets))
+                for key, stats in sorted(self._series.items())
+            ]
+
+        counters = [
+            ("calls_total", "Asset store calls", lambda stats: stats.calls),
+            ("errors_total", "Asset store calls that raised", lambda stats: stats.errors),
+            ("bytes_in_total", "Bytes written to the asset store", lambda stats: stats.bytes_in),
+            ("bytes_out_total", "Bytes read from the asset store", lambda stats: stats.bytes_out),
+        ]
+        lines = []
+        for suffix, help_text, value in counters:
+            name = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, stats, _ in series:
+                lines.append(f"{name}{{{_labels(key)}}} {value(stats)}")
+
+        name = f"{prefix}_latency_seconds"
+        lines.append(f"# HELP {name} Asset store call latency")
+        lines.append(f"# TYPE {name} histogram")
+        for key, stats, buckets in series:
+            labels = _labels(key)
+            for bound, count in zip(_bucket_labels(), _cumulative(buckets), strict=True):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {stats.latency_sum}")
+            lines.append(f"{name}_count{{{labels}}} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+
+def _bucket_labels() -> List[str]:
+    return [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+
+
+def _cumulative(buckets: List[int]) -> List[int]:
+    total, cumulative = 0, []
+    for count in buckets:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _labels(key: Tuple[str, str, str]) -> str:
+    operation, type_value, scope = key
+    scope = scope.replace("\\", "\\\\").replace('"', '\\"')
+    return f'operation="{operation}",type="{type_value}",scope="{scope}"'
+
+
+# Process-wide, so the metrics of every session add up
+shared_asset_metrics = AssetMetrics()
+
+
+class InstrumentedAssetManager(AssetManager):
+    """
+    AssetManager wrapper recording per-operation and per-type call counts, latency
+    histograms, bytes in and out and errors.
+
+    Calls are labelled with the scope set by `metrics_scope`, so load on the store
+    can be attributed to UI paths. Methods not defined here are delegated to the
+    wrapped manager without being recorded.
+    """
+
+    def __init__(self, manager: AssetManager, metrics: Optional[AssetMetrics] = None) -> None:
+        self.manager = manager
+        self.metrics = metrics if metrics is not None else AssetMetrics()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.manager, name)
+
+    def _call(
+            self,
+            operation: str,
+            asset_type: Optional[AssetType],
+            fn,
+            *args,
+            bytes_in: int = 0,
+            size=None,
+    ) -> Any:
+        """
+        Call the wrapped manager and record the call.
+
+        Args:
+            operation (str): Name of the operation
+            asset_type (Optional[AssetType]): Type label of the call
+            fn: Bound method of the wrapped manager
+            bytes_in (int): Bytes written by the call
+            size: Callable computing the bytes read from the result
+
+        Returns:
+            Any: The result of the call
+        """
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except FileNotFoundError:
+            # A missing asset is an answer, not a store failure
+            self.metrics.record(operation, asset_type, time.perf_counter() - start, bytes_in)
+            raise
+        except Exception:
+            elapsed = time.perf_counter() - start
+            self.metrics.record(operation, asset_type, elapsed, bytes_in, error=True)
+            raise
+        bytes_out = size(result) if size is not None else 0
+        self.metrics.record(operation, asset_type, time.perf_counter() - start, bytes_in, bytes_out)
+        return result
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return self._call(
+            "save", asset_type, self.manager.save, name, content, asset_type, bytes_in=len(content)
+        )
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        types = {asset_type for _, _, asset_type in items}
+        asset_type = next(iter(types)) if len(types) == 1 else None
+        bytes_in = sum(len(content) for _, content, _ in items)
+        return self._call("save_many", asset_type, self.manager.save_many, items, bytes_in=bytes_in)
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        return self._call("get", asset_type, self.manager.get, name, asset_type, size=len)
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        return self._call(
+            "get_many", asset_type, self.manager.get_many, names, asset_type,
+            size=lambda contents: sum(len(content) for content in contents.values()),
+        )
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        pieces = self._call("open_read", asset_type, self.manager.open_read, name, asset_type)
+        return self._count_pieces(pieces, asset_type, asset_scope.get())
+
+    def _count_pieces(
+            self,
+            pieces: Iterator[bytes],
+            asset_type: AssetType,
+            scope: str,
+    ) -> Iterator[bytes]:
+        # Streamed bytes are only known as they are consumed
+        for piece in pieces:
+            self.metrics.add_bytes("open_read", asset_type, scope, len(piece))
+            yield piece
+
+    def open_write(self, name: str, asset_type: AssetType) -> io.RawIOBase:
+        return self._call("open_write", asset_type, self.manager.open_write, name, asset_type)
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        return self._call(
+            "read_range", asset_type, self.manager.read_range, name, asset_type, start, end,
+            size=len,
+        )
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        return self._call("exists", asset_type, self.manager.exists, name, asset_type)
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return self._call("list", asset_type, self.manager.list, asset_type)
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        return self._call("delete", asset_type, self.manager.delete, name, asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        return self._call("delete_many", asset_type, self.manager.delete_many, names, asset_type)
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        return self._call("stat", asset_type, self.manager.stat, name, asset_type)
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        return self._call(
+            "get_public_url", asset_type, self.manager.get_public_url, name, asset_type, size=len
+        )
+
+    def health_check(self) -> bool:
+        return self._call("health_check", None, self.manager.health_check)
@@ -0,0 +1,489 @@
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+from src.core.circuit_breaker import CircuitBreaker
+from src.store.redis_events import ChangeListener
+
+SAVE = "save"
+DELETE = "delete"
+
+# Journal file kept next to the local tier's assets
+JOURNAL_FILENAME = "replay_journal.sqlite3"
+
+
+class ReplayJournal:
+    """
+    Durable, ordered queue of writes waiting to be replayed to the remote tier.
+
+    One row per asset keyed by (type, name): queuing a newer write to an asset
+    replaces its older one and moves it to the back. Backed by SQLite, so writes
+    queued during an outage survive a restart, and shared by every tiered manager
+    over the same local directory (see `shared_replay_journal`).
+    """
+
+    def __init__(self, db_path: Path | str = ":memory:") -> None:
+        self.db_path = db_path
+        # Held while replaying, so concurrent sessions don't replay the same writes
+        self.replay_lock = Lock()
+        self._lock = Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        if db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queue ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " type TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " op TEXT NOT NULL,"
+            " UNIQUE (type, name)"
+            ")"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queue").fetchone()[0]
+
+    def push(self, op: str, name: str, asset_type: AssetType) -> None:
+        """Queue a write, replacing any write to the same asset queued before."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM queue WHERE type = ? AND name = ?", (asset_type.value, name)
+            )
+            self._conn.execute(
+                "INSERT INTO queue (type, name, op) VALUES (?, ?, ?)", (asset_type.value, name, op)
+            )
+
+    def first(self) -> Optional[Tuple[int, str, str, str]]:
+        """
+        Get the oldest queued write.
+
+        Returns:
+            Optional[Tuple[int, str, str, str]]: (seq, type, name, op), or None if empty
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, type, name, op FROM queue ORDER BY seq LIMIT 1"
+            ).fetchone()
+
+    def remove(self, seq: int) -> None:
+        """Remove a replayed write, unless a newer write to the asset replaced it."""
+        with self._lock:
+            self._conn.execute("DELETE FROM queue WHERE seq = ?", (seq,))
+
+    def contains(self, name: str, asset_type: AssetType) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM queue WHERE type = ? AND name = ?", (asset_type.value, name)
+            ).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_journals: Dict[Path, ReplayJournal] = {}
+_journals_lock = Lock()
+
+
+def shared_replay_journal(base_path: Path) -> ReplayJournal:
+    """
+    Get the process-wide replay journal of a local tier directory, creating it on
+    first use.
+
+    Args:
+        base_path (Path): Root directory of the local tier
+
+    Returns:
+        ReplayJournal: Journal stored in `JOURNAL_FILENAME` under the directory
+    """
+    key = Path(base_path).resolve()
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            key.mkdir(parents=True, exist_ok=True)
+            journal = _journals[key] = ReplayJournal(key / JOURNAL_FILENAME)
+        return journal
+
+
+class RemoteUnavailable(Exception):
+    """
+    Raised internally when the remote tier can't be reached, and to callers inside
+    `remote_required()`.
+    """
+
+
+# Set inside `remote_required()` blocks
+_remote_required: ContextVar[bool] = ContextVar("remote_required", default=False)
+
+
+@contextmanager
+def remote_required() -> Iterator[None]:
+    """
+    Make the tiered managers' reads, listings and deletes inside the block raise
+    RemoteUnavailable instead of answering from the local tier alone, and make their
+    deletes fail instead of being queued for replay.
+
+    For callers that must not act on a partial view of the assets, like the garbage
+    collector: deleting what the local tier alone doesn't see referenced would delete
+    assets still in use, and a queued delete would reach Redis after the outage.
+    """
+    token = _remote_required.set(True)
+    try:
+        yield
+    finally:
+        _remote_required.reset(token)
+
+
+class TieredAssetManager(AssetManager):
+    """
+    Composite AssetManager layering a local-disk hot tier over a remote store (Redis).
+
+    Reads are served by the local tier when it holds the asset, otherwise by the
+    remote one; assets read `promote_after` times from the remote are copied to the
+    local tier. While the remote is unreachable (tracked by a circuit breaker), writes
+    land in the local tier and are queued, then replayed in order once the remote
+    answers again, so a Redis blip never fails a call.
+
+    The remote manager is created lazily through `remote_factory`, so the tier also
+    recovers when Redis was down at start-up.
+    """
+
+    def __init__(
+            self,
+            local: AssetManager,
+            remote_factory: Callable[[], AssetManager],
+            breaker: Optional[CircuitBreaker] = None,
+            promote_after: int = 2,
+            journal: Optional[ReplayJournal] = None,
+            hot_ttl: Optional[float] = None,
+    ) -> None:
+        self.local = local
+        self.remote_factory = remote_factory
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.promote_after = promote_after
+        self.hot_ttl = hot_ttl
+
+        self._remote: Optional[AssetManager] = None
+        self._lock = Lock()
+        # Queued SAVE or DELETE per asset; content of queued saves lives in the local tier
+        self._journal = journal if journal is not None else ReplayJournal()
+        self._listeners: List[ChangeListener] = []
+        self._remote_reads: Counter = Counter()
+
+    @property
+    def remote_available(self) -> bool:
+        """Whether the remote tier is currently considered reachable."""
+        return self._remote is not None and not self.breaker.is_open
+
+    @property
+    def dedup(self) -> bool:
+        """Whether identical contents are stored once; both tiers are configured alike."""
+        return bool(getattr(self.local, "dedup", False))
+
+    @property
+    def queued_writes(self) -> int:
+        """Number of writes waiting to be replayed to the remote tier."""
+        return len(self._journal)
+
+    def _get_remote(self) -> AssetManager:
+        if not self.breaker.allow():
+            raise RemoteUnavailable()
+        if self._remote is None:
+            try:
+                remote = self.remote_factory()
+            except Exception as e:
+                self.breaker.record_failure()
+                raise RemoteUnavailable() from e
+            with self._lock:
+                if self._remote is None:
+                    if hasattr(remote, "add_change_listener"):
+                        # Hot copies are dropped before listeners above reload them
+                        for listener in [self._on_remote_change, *self._listeners]:
+                            remote.add_change_listener(listener)
+                    self._remote = remote
+        return self._remote
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Receive asset change events published by other processes through the remote
+        tier, e.g. to invalidate a cache layered over this manager.
+
+        Listeners added before the remote is reachable are registered when it connects.
+
+        Args:
+            listener (ChangeListener): Callable receiving (op, name, asset_type); name is
+                None when a whole asset type is invalidated
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            remote = self._remote
+        if remote is not None and hasattr(remote, "add_change_listener"):
+            remote.add_change_listener(listener)
+
+    def _call_remote(self, method: str, *args) -> Any:
+        """
+        Call a method of the remote tier, replaying queued writes first.
+
+        Raises:
+            RemoteUnavailable: If the remote can't be reached
+            FileNotFoundError: If the remote doesn't hold the asset
+        """
+        remote = self._get_remote()
+        if len(self._journal):
+            self._replay(remote)
+        try:
+            result = getattr(remote, method)(*args)
+        except FileNotFoundError:
+            self.breaker.record_success()
+            raise
+        except Exception as e:
+            print(f"Remote asset store unavailable, using local tier: {e}")
+            self.breaker.record_failure()
+            raise RemoteUnavailable() from e
+        self.breaker.record_success()
+        return result
+
+    def _on_remote_change(self, op: str, name: Optional[str], asset_type: AssetType) -> None:
+        # Another process changed the asset: drop the stale hot copy
+        if name is None:
+            for entry in self.local.list(asset_type):
+                self._drop_local(entry.split(":", 1)[1], asset_type)
+        else:
+            self._drop_local(name, asset_type)
+
+    def _drop_local(self, name: str, asset_type: AssetType) -> bool:
+        # The local copy of a queued write is the only one until it is replayed
+        if self._journal.contains(name, asset_type):
+            return False
+        self.local.delete(name, asset_type)
+        return True
+
+    def _is_hot(self, name: str, asset_type: AssetType) -> bool:
+        """Whether the local tier holds a copy of the asset that may be served."""
+        if self.hot_ttl is None:
+            return self.local.exists(name, asset_type)
+        try:
+            stat = self.local.stat(name, asset_type)
+        except FileNotFoundError:
+            return False
+        if stat.mtime is None or time.time() - stat.mtime < self.hot_ttl:
+            return True
+        # Expired like the remote copy it mirrors would have been
+        return not self._drop_local(name, asset_type)
+
+    def replay(self) -> int:
+        """
+        Replay writes queued while the remote was unavailable, in order.
+
+        Stops at the first failure and keeps the remaining writes queued.
+
+        Returns:
+            int: Number of replayed writes
+        """
+        try:
+            return self._replay(self._get_remote())
+        except RemoteUnavailable:
+            return 0
+
+    def _replay(self, remote: AssetManager) -> int:
+        if not self._journal.replay_lock.acquire(blocking=False):
+            return 0
+        replayed = 0
+        try:
+            while True:
+                queued = self._journal.first()
+                if queued is None:
+                    break
+                seq, type_value, name, op = queued
+                asset_type = AssetType(type_value)
+                try:
+                    if op == SAVE:
+                        remote.save(name, self.local.get(name, asset_type), asset_type)
+                    else:
+                        remote.delete(name, asset_type)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"Replaying queued asset writes failed: {e}")
+                    self.breaker.record_failure()
+                    break
+                # A newer write to the same asset queued meanwhile has its own seq
+                self._journal.remove(seq)
+                replayed += 1
+        finally:
+            self._journal.replay_lock.release()
+        if replayed:
+            print(f"Replayed {replayed} queued asset writes to the remote store")
+        return replayed
+
+    def _promote(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        key = (asset_type.value, name)
+        with self._lock:
+            self._remote_reads[key] += 1
+            if self._remote_reads[key] < self.promote_after:
+                return
+            del self._remote_reads[key]
+        self.local.save(name, content, asset_type)
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return self.save_many([(name, content, asset_type)])[0]
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        try:
+            urls = self._call_remote("save_many", items)
+        except RemoteUnavailable:
+            urls = self.local.save_many(items)
+            for name, _, asset_type in items:
+                self._journal.push(SAVE, name, asset_type)
+            return urls
+
+        # Keep hot copies in step with the remote
+        hot = [item for item in items if self.local.exists(item[0], item[2])]
+        if hot:
+            self.local.save_many(hot)
+        return urls
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        if self._is_hot(name, asset_type):
+            return self.local.get(name, asset_type)
+        content = self._read_remote("get", name, asset_type)
+        self._promote(name, content, asset_type)
+        return content
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        # Streamed reads are meant for large assets, so they don't promote them
+        if self._is_hot(name, asset_type):
+            return self.local.open_read(name, asset_type)
+        return self._read_remote("open_read", name, asset_type)
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        if self._is_hot(name, asset_type):
+            return self.local.read_range(name, asset_type, start, end)
+        return self._read_remote("read_range", name, asset_type, start, end)
+
+    def _read_remote(self, method: str, name: str, asset_type: AssetType, *args) -> Any:
+        """
+        Read an asset the local tier doesn't hold from the remote tier.
+
+        Raises:
+            FileNotFoundError: If the remote doesn't hold the asset or is unavailable
+            RemoteUnavailable: If the remote is unavailable inside `remote_required()`
+        """
+        try:
+            return self._call_remote(method, name, asset_type, *args)
+        except RemoteUnavailable:
+            if _remote_required.get():
+                raise
+            raise FileNotFoundError(
+                f"Asset '{name}' {asset_type.value} not found (remote store unavailable)"
+            ) from None
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        contents = self.local.get_many(names, asset_type)
+        if self.hot_ttl is not None:
+            contents = {
+                name: content for name, content in contents.items()
+                if self._is_hot(name, asset_type)
+            }
+        missing = [name for name in names if name not in contents]
+        if missing:
+            try:
+                fetched = self._call_remote("get_many", missing, asset_type)
+            except RemoteUnavailable:
+                if _remote_required.get():
+                    raise
+                return contents
+            for name, content in fetched.items():
+                self._promote(name, content, asset_type)
+            contents.update(fetched)
+        return contents
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        if self._is_hot(name, asset_type):
+            return True
+        try:
+            return self._call_remote("exists", name, asset_type)
+        except RemoteUnavailable:
+            return False
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        # Both tiers list "type:name" entries
+        try:
+            entries = self._call_remote("list", asset_type)
+        except RemoteUnavailable:
+            if _remote_required.get():
+                raise
+            entries = []
+        seen = set(entries)
+        for at in [asset_type] if asset_type else list(AssetType):
+            for entry in self.local.list(at):
+                if entry not in seen:
+                    seen.add(entry)
+                    entries.append(entry)
+        return entries
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        self.delete_many([name], asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        required = _remote_required.get()
+        if required:
+            # Delete nothing, and queue nothing, unless the remote copies are deleted
+            self._call_remote("delete_many", names, asset_type)
+        self.local.delete_many(names, asset_type)
+        with self._lock:
+            for name in names:
+                self._remote_reads.pop((asset_type.value, name), None)
+        if required:
+            return
+        try:
+            self._call_remote("delete_many", names, asset_type)
+        except RemoteUnavailable:
+            for name in names:
+                self._journal.push(DELETE, name, asset_type)
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        if self._is_hot(name, asset_type):
+            return self.local.stat(name, asset_type)
+        return self._read_remote("stat", name, asset_type)
+
+    def touch(self, name: str, asset_type: AssetType) -> bool:
+        """
+        Restart the remote copy's expiry; hot copies expire from their last save.
+
+        Returns:
+            bool: False if the remote is unavailable or doesn't hold the asset
+        """
+        try:
+            return bool(self._call_remote("touch", name, asset_type))
+        except (RemoteUnavailable, FileNotFoundError):
+            return False
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        # Prefer the remote URL so it doesn't change when an asset is promoted
+        try:
+            return self._call_remote("get_public_url", name, asset_type)
+        except (RemoteUnavailable, FileNotFoundError):
+            return self.local.get_public_url(name, asset_type)
+
+    def health_check(self) -> bool:
+        """
+        Check the remote tier, reconnecting and replaying queued writes if it is back.
+
+        Returns:
+            bool: True if the remote tier is reachable; the local tier keeps serving
+            requests either way
+        """
+        try:
+            return bool(self._call_remote("health_check"))
+        except RemoteUnavailable:
+            return False
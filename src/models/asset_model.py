@@ -7,7 +7,20 @@ class AssetReference(BaseModel):
     storage_type: Literal["local", "redis"]
     asset_type: AssetType
     component_type: ComponentType
-    cache_url: Optional[str] = None
+    # Runtime cache of the public URL; inline data URLs are large, so it is not persisted
+    cache_url: Optional[str] = Field(default=None, exclude=True)
 
-    def get_url(self, asset_manager: AssetManager) -> str:
-        return asset_manager.get_public_url(self.name, self.asset_type)
\ No newline at end of file
+    def get_url(self, asset_manager: AssetManager, refresh: bool = False) -> str:
+        """
+        Get the public URL of the asset, reusing the cached one when available.
+
+        Args:
+            asset_manager (AssetManager): Manager storing the asset
+            refresh (bool): Ignore the cached URL and ask the manager again
+
+        Returns:
+            str: Public URL of the asset
+        """
+        if self.cache_url is None or refresh:
+            self.cache_url = asset_manager.get_public_url(self.name, self.asset_type)
+        return self.cache_url
\ No newline at end of file
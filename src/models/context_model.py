@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
 from src.models.enums import ViewType
 from uuid import uuid4
+import itertools
 from src.models.page_model import Component
 
 
@@ -75,9 +76,16 @@ class PageContext(BaseModel):
         arbitrary_types_allowed = True
 
 
+# Process-wide, so a revision identifies one state of one shared context
+_shared_revisions = itertools.count()
+
+
 class SharedContext(BaseModel):
     """
     Model for shared context data that's consistent across all pages in a document.
+
+    Every field assignment gives the context a new `revision`. All fields are
+    immutable values, so the revision changes whenever the content does.
     """
     embedded_css: Optional[str] = None
     total_pages: int = 1
@@ -88,6 +96,20 @@ class SharedContext(BaseModel):
     header_logo_url: str
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat())
 
+    _revision: int = PrivateAttr(default_factory=lambda: next(_shared_revisions))
+    # (revision, hash) memo of context_builder.shared_context_hash
+    _content_hash: Optional[Tuple[int, str]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._revision = next(_shared_revisions)
+
+    @property
+    def revision(self) -> int:
+        """Stamp of the current shared context state, unique across contexts and changes."""
+        return self._revision
+
     class Config:
         arbitrary_types_allowed = True
 
@@ -3,6 +3,7 @@ from io import BytesIO
 from pathlib import Path
 from typing import Dict, Any, Optional
 from src.render.template_engine import TemplateEngine
+from src.render.context_builder import build_render_context
 from src.models.context_model import PageContext, SharedContext
 from src.core.asset_manager import AssetManager, AssetType
 import fitz
@@ -18,39 +19,11 @@ class PDFService:
         Generate a PDF for a single page using the template engine and page context.
         """
         # Prepare the context for template rendering
-        # Convert View objects to dict format expected by template
-        views_for_template = []
-        for view in page_context.views:
-            views_for_template.append({
-                "side": view.side.value if hasattr(view.side, 'value') else view.side,
-                "image": view.image,
-                "wall_image": view.wall_image,
-                "pano": view.pano
-            })
-
-        # Convert table data to template format
-        table_data_for_template = None
-        if page_context.table_data:
-            table_data_for_template = {
-                "headers": page_context.table_data.headers,
-                "data": page_context.table_data.data
-            }
-
-        # Create context for template rendering
-        context = {
-            "page_title": page_context.page_title,
-            "embedded_css": shared_context.embedded_css,
-            "generation_date": page_context.generation_date,
-            "page_number": page_context.page_number,
-            "total_pages": 1,  # For single page PDF
-            "document_name": shared_context.document_name,
-            "document_id": shared_context.document_id,
-            "address_line": shared_context.address_line,
-            "powered_by_logo_url": shared_context.powered_by_logo_url,
-            "header_logo_url": shared_context.header_logo_url,
-            "views": views_for_template,
-            "table_data": table_data_for_template,
-        }
+        context = build_render_context(
+            page_context,
+            shared_context,
+            total_pages=1,  # For single page PDF
+        )
         # Render the HTML using the base template
         rendered_html = self.template_engine.render("base.html", context)
 
@@ -97,11 +70,9 @@ class PDFService:
         preview_name = f"{pdf_asset_name}_preview.png"
 
 
-        # Save to asset manager
-        self.asset_manager.save(pdf_asset_name, pdf_bytes, AssetType.PDF)
-        self.asset_manager.save(preview_name, preview, AssetType.PNG)
-
-        # Return the URL for the PDF
-        pdf_url = self.asset_manager.get_public_url(pdf_asset_name, AssetType.PDF)
-        preview_url = self.asset_manager.get_public_url(preview_name, AssetType.PNG)
+        # Save to asset manager in one batch and return the URLs for the PDF and preview
+        pdf_url, preview_url = self.asset_manager.save_many([
+            (pdf_asset_name, pdf_bytes, AssetType.PDF),
+            (preview_name, preview, AssetType.PNG),
+        ])
         return pdf_url, preview_url
\ No newline at end of file
@@ -0,0 +1,198 @@
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.models.context_model import PageContext, SharedContext, View
+
+PAGE_CACHE_SIZE = 64
+
+# PageContext fields that end up in the rendered page; URLs of the generated
+# PDF and preview are excluded so saving a page does not invalidate its context.
+RENDERED_PAGE_FIELDS = {"page_title", "generation_date", "page_number", "views", "table_data"}
+
+# (content hash, identities of the wrapped containers) -> template context
+# Template variables taken unchanged from SharedContext, and covered by the
+# shared context hash the render context carries under SHARED_HASH_VAR
+SHARED_TEMPLATE_FIELDS = frozenset({
+    "document_name", "document_id", "address_line", "powered_by_logo_url", "header_logo_url",
+})
+SHARED_HASH_VAR = "shared_context_hash"
+
+_page_cache: OrderedDict[Tuple[str, Tuple[int, ...]], Mapping[str, Any]] = OrderedDict()
+_page_cache_lock = Lock()
+
+
+def page_content_hash(page: PageContext) -> str:
+    """
+    Compute a content hash over the rendered fields of a page.
+
+    The page is serialized on every call: views, table rows and wall_data can be
+    changed in place, so there is no cheaper signal that the page is unchanged.
+
+    Args:
+        page (PageContext): Page to hash
+
+    Returns:
+        str: Hex digest identifying the page content
+    """
+    payload = page.model_dump_json(include=RENDERED_PAGE_FIELDS)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def shared_context_hash(shared: SharedContext) -> str:
+    """
+    Compute a content hash over the shared context of a document, excluding its CSS.
+
+    The hash is memoized per `SharedContext.revision`, so the context (with its inline
+    logos) is serialized once per change rather than on every rerun.
+
+    Args:
+        shared (SharedContext): Shared context to hash
+
+    Returns:
+        str: Hex digest identifying the shared context content
+    """
+    revision = shared.revision
+    memo = shared._content_hash
+    if memo is not None and memo[0] == revision:
+        return memo[1]
+    payload = shared.model_dump_json(exclude={"embedded_css"})
+    content_hash = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    shared._content_hash = (revision, content_hash)
+    return content_hash
+
+
+@lru_cache(maxsize=16)
+def text_hash(text: str) -> str:
+    """
+    Hash a large, rarely changing string such as the embedded CSS.
+
+    Memoized: the same string object is looked up without being hashed again.
+
+    Args:
+        text (str): Text to hash
+
+    Returns:
+        str: Hex digest of the text
+    """
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _view_to_template(view: View) -> Mapping[str, Any]:
+    return MappingProxyType({
+        "side": view.side.value if hasattr(view.side, 'value') else view.side,
+        "image": view.image,
+        "wall_image": view.wall_image,
+        "pano": view.pano,
+        "wall_data": MappingProxyType(view.wall_data) if view.wall_data is not None else None,
+    })
+
+
+def _wrapped_containers(page: PageContext) -> Tuple[int, ...]:
+    # Identities of the dicts a template context wraps. Cached contexts keep them
+    # alive, so an id can't be reused while its context is cached.
+    ids = [id(view.wall_data) for view in page.views]
+    if page.table_data:
+        ids.extend(id(row) for row in page.table_data.data)
+    return tuple(ids)
+
+
+def _page_to_template(page: PageContext) -> Mapping[str, Any]:
+    table_data = None
+    if page.table_data:
+        table_data = MappingProxyType({
+            "headers": tuple(page.table_data.headers),
+            "data": tuple(MappingProxyType(row) for row in page.table_data.data),
+        })
+
+    return MappingProxyType({
+        "page_title": page.page_title,
+        "generation_date": page.generation_date,
+        "page_number": page.page_number,
+        "views": tuple(_view_to_template(view) for view in page.views),
+        "table_data": table_data,
+    })
+
+
+def get_page_template_context(
+        page: PageContext,
+        page_hash: Optional[str] = None,
+) -> Mapping[str, Any]:
+    """
+    Get the read-only, page-specific part of a template context.
+
+    Rows and wall_data are wrapped in read-only views, not copied. Results are memoized
+    by page content hash together with the identities of the wrapped dicts: a context
+    is only reused for the same content held in the same dicts, so it can't show
+    another page's data or the state of a dict that was since replaced.
+
+    Args:
+        page (PageContext): Page to convert
+        page_hash (Optional[str]): Precomputed `page_content_hash(page)`, if available
+
+    Returns:
+        Mapping[str, Any]: Read-only mapping of page fields in template format
+    """
+    if page_hash is None:
+        page_hash = page_content_hash(page)
+    key = (page_hash, _wrapped_containers(page))
+
+    with _page_cache_lock:
+        cached = _page_cache.get(key)
+        if cached is not None:
+            _page_cache.move_to_end(key)
+            return cached
+
+    page_context = _page_to_template(page)
+
+    with _page_cache_lock:
+        _page_cache[key] = page_context
+        if len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+    return page_context
+
+
+def build_render_context(
+        page: PageContext,
+        shared: SharedContext,
+        embedded_css: Optional[str] = None,
+        total_pages: Optional[int] = None,
+        page_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build the template context used to render a page with `base.html`.
+
+    Args:
+        page (PageContext): Page to render
+        shared (SharedContext): Shared context of the page's document
+        embedded_css (Optional[str]): CSS override, defaults to the shared context CSS
+        total_pages (Optional[int]): Page count override, defaults to the shared context count
+        page_hash (Optional[str]): Precomputed `page_content_hash(page)`, if available
+
+    Returns:
+        Dict[str, Any]: Template context; nested page data is read-only and shared between
+        calls, and SHARED_HASH_VAR holds the hash of the shared fields
+    """
+    context = dict(get_page_template_context(page, page_hash))
+    context.update({
+        "embedded_css": shared.embedded_css if embedded_css is None else embedded_css,
+        "total_pages": shared.total_pages if total_pages is None else total_pages,
+        "document_name": shared.document_name,
+        "document_id": shared.document_id,
+        "address_line": shared.address_line,
+        "powered_by_logo_url": shared.powered_by_logo_url,
+        "header_logo_url": shared.header_logo_url,
+        SHARED_HASH_VAR: shared_context_hash(shared),
+    })
+    return context
+
+
+def clear_page_cache() -> None:
+    """
+    Drop all memoized page contexts.
+    """
+    with _page_cache_lock:
+        _page_cache.clear()
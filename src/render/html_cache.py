@@ -0,0 +1,58 @@
+from typing import Optional
+
+from src.core.byte_lru_cache import ByteLRUCache
+from src.models.context_model import PageContext, SharedContext
+from src.render.context_builder import (
+    build_render_context,
+    page_content_hash,
+    shared_context_hash,
+    text_hash,
+)
+from src.render.template_engine import TemplateEngine
+
+HTML_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Process-wide, so every session previewing the same document shares rendered pages
+page_html_cache = ByteLRUCache(HTML_CACHE_MAX_BYTES)
+
+
+def render_page_html(
+        engine: TemplateEngine,
+        page: PageContext,
+        shared: SharedContext,
+        embedded_css: Optional[str] = None,
+        total_pages: Optional[int] = None,
+) -> str:
+    """
+    Render a page with `base.html`, reusing cached HTML when nothing it depends on changed.
+
+    The cache key combines the page content hash, the shared context hash, the CSS hash
+    and the page count, so reruns that do not touch the page become a cache lookup. The
+    shared context and CSS hashes are memoized, so only the page is hashed per rerun.
+
+    Args:
+        engine (TemplateEngine): Template engine used on cache misses
+        page (PageContext): Page to render
+        shared (SharedContext): Shared context of the page's document
+        embedded_css (Optional[str]): CSS override, defaults to the shared context CSS
+        total_pages (Optional[int]): Page count override, defaults to the shared context count
+
+    Returns:
+        str: Rendered HTML content
+    """
+    css = shared.embedded_css if embedded_css is None else embedded_css
+    page_hash = page_content_hash(page)
+    key = (
+        page_hash,
+        shared_context_hash(shared),
+        text_hash(css or ""),
+        total_pages,
+    )
+
+    html = page_html_cache.get(key)
+    if html is None:
+        context = build_render_context(page, shared, css, total_pages, page_hash)
+        html = engine.render("base.html", context)
+        # Rendered pages are almost entirely ASCII, so length approximates bytes
+        page_html_cache.put(key, html, len(html))
+    return html
@@ -1,9 +1,16 @@
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from typing import Dict, Any
+from collections import OrderedDict
+import hashlib
+from threading import Lock
+from jinja2 import Environment, FileSystemLoader, meta, nodes, pass_context, select_autoescape
+from jinja2.runtime import Context
+from markupsafe import Markup, escape
+from typing import Dict, Any, Optional, Set, Tuple, Iterator, AsyncIterator
 import datetime
+from src.render.context_builder import SHARED_HASH_VAR, SHARED_TEMPLATE_FIELDS
 
 TEMPLATES_PATH = Path(__file__).parent.parent / "templates"
+FRAGMENT_CACHE_SIZE = 256
 
 class TemplateEngine:
     def __init__(self, templates_dir: Path):
@@ -16,6 +23,15 @@ class TemplateEngine:
         # Add custom filters
         self.env.filters['to_date'] = self._to_date_filter
         self.env.filters['to_upper'] = self._to_upper_filter
+        self.env.filters['render_table'] = self._render_table_filter
+        # Add custom globals
+        self.env.globals['cached_include'] = self._cached_include
+
+        self._fragment_cache: OrderedDict[Tuple[str, bytes], Markup] = OrderedDict()
+        # None marks fragments whose dependencies can't be known statically
+        self._fragment_dependencies: Dict[str, Optional[Tuple[str, ...]]] = {}
+        self._fragment_lock = Lock()
+        self._async_env: Environment | None = None
 
     def render(self, template_name: str, context: Dict[str, Any]) -> str:
         """
@@ -31,6 +47,65 @@ class TemplateEngine:
         template = self.env.get_template(template_name)
         return template.render(**context)
 
+    def render_stream(self, template_name: str, context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Render a template lazily, yielding the output in chunks.
+
+        The full document is never materialized, so large pages can be written
+        straight to a file or socket.
+
+        Args:
+            template_name (str): Name of the template to render
+            context (Dict[str, Any]): Context data to pass to the template
+
+        Returns:
+            Iterator[str]: Rendered HTML content chunks
+        """
+        template = self.env.get_template(template_name)
+        return template.generate(**context)
+
+    @property
+    def async_env(self) -> Environment:
+        """
+        Async-enabled overlay of the template environment, created on first use.
+        It shares loader, filters and globals with the synchronous environment.
+        """
+        if self._async_env is None:
+            self._async_env = self.env.overlay(enable_async=True)
+        return self._async_env
+
+    async def render_async(self, template_name: str, context: Dict[str, Any]) -> str:
+        """
+        Render a template without blocking the running event loop.
+
+        Args:
+            template_name (str): Name of the template to render
+            context (Dict[str, Any]): Context data to pass to the template
+
+        Returns:
+            str: Rendered HTML content as a string
+        """
+        template = self.async_env.get_template(template_name)
+        return await template.render_async(**context)
+
+    def render_stream_async(
+            self,
+            template_name: str,
+            context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Render a template asynchronously, yielding the output in chunks.
+
+        Args:
+            template_name (str): Name of the template to render
+            context (Dict[str, Any]): Context data to pass to the template
+
+        Returns:
+            AsyncIterator[str]: Rendered HTML content chunks
+        """
+        template = self.async_env.get_template(template_name)
+        return template.generate_async(**context)
+
     def render_to_file(self, template_name: str, context: Dict[str, Any], output_path: Path) -> None:
         """
         Render a template with the given context and save to a file.
@@ -40,11 +115,146 @@ class TemplateEngine:
             context (Dict[str, Any]): Context data to pass to the template
             output_path (Path): Path where the rendered HTML should be saved
         """
-        rendered_html = self.render(template_name, context)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(rendered_html)
+            f.writelines(self.render_stream(template_name, context))
         return output_path
+
+    def clear_fragment_cache(self) -> None:
+        """
+        Drop every cached fragment so the next render re-renders them from source.
+        """
+        with self._fragment_lock:
+            self._fragment_cache.clear()
+            self._fragment_dependencies.clear()
+
+    def _get_fragment_dependencies(self, template_name: str) -> Optional[Tuple[str, ...]]:
+        """
+        Get the context variables a fragment template reads, including those read by
+        the templates it includes, imports or extends.
+
+        Args:
+            template_name (str): Name of the fragment template
+
+        Returns:
+            Optional[Tuple[str, ...]]: Sorted names of the undeclared variables, or None
+            if the fragment includes a template chosen at render time
+        """
+        with self._fragment_lock:
+            if template_name in self._fragment_dependencies:
+                return self._fragment_dependencies[template_name]
+        names = self._collect_variables(template_name, set())
+        dependencies = None
+        if names is not None:
+            dependencies = tuple(sorted(names - set(self.env.globals)))
+        with self._fragment_lock:
+            self._fragment_dependencies[template_name] = dependencies
+        return dependencies
+
+    def _collect_variables(self, template_name: str, seen: Set[str]) -> Optional[Set[str]]:
+        """
+        Collect the undeclared variables of a template and of the templates it pulls in.
+
+        Args:
+            template_name (str): Name of the template
+            seen (Set[str]): Templates already visited, to stop on cycles
+
+        Returns:
+            Optional[Set[str]]: Variable names, or None if a referenced template name is
+            only known at render time
+        """
+        if template_name in seen:
+            return set()
+        seen.add(template_name)
+        source, _, _ = self.env.loader.get_source(self.env, template_name)
+        ast = self.env.parse(source)
+        names = set(meta.find_undeclared_variables(ast))
+        referenced = list(meta.find_referenced_templates(ast))
+        for call in ast.find_all(nodes.Call):
+            if isinstance(call.node, nodes.Name) and call.node.name == "cached_include":
+                argument = call.args[0] if call.args else None
+                referenced.append(argument.value if isinstance(argument, nodes.Const) else None)
+        for name in referenced:
+            if name is None:
+                return None
+            nested = self._collect_variables(name, seen)
+            if nested is None:
+                return None
+            names |= nested
+        return names
+
+    @staticmethod
+    def _fragment_key(
+            template_name: str,
+            values: Dict[str, Any],
+            shared_hash: Optional[str] = None,
+    ) -> Tuple[str, bytes]:
+        """
+        Build the fragment cache key from a digest of the variable values, so the
+        cache doesn't keep large values such as inline data URLs alive. Shared fields
+        are represented by the precomputed shared context hash instead of their values.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if shared_hash is not None:
+            digest.update(f"{SHARED_HASH_VAR}\0{shared_hash}\0".encode("utf-8"))
+        for name, value in values.items():
+            text = value if isinstance(value, str) else repr(value)
+            digest.update(f"{name}\0{type(value).__name__}\0".encode("utf-8"))
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        return template_name, digest.digest()
+
+    @pass_context
+    def _cached_include(self, context: Context, template_name: str) -> Markup:
+        """
+        Jinja2 global that includes a template and caches its rendered output.
+
+        The cache key is built from the context variables the fragment reads, nested
+        includes included, so fragments depending only on shared document fields (header,
+        footer, logos) are rendered once per shared context and reused for every page.
+        Shared fields are keyed on the shared context hash from `build_render_context`, so
+        large values such as inline logos aren't re-hashed for every page; other values are
+        digested. When a relevant field changes, e.g. through
+        `Document.update_shared_context`, the key changes and the fragment is re-rendered.
+        Fragments including templates chosen at render time are not cached.
+
+        Args:
+            context (Context): Active template context (injected by Jinja2)
+            template_name (str): Name of the fragment template to include
+
+        Returns:
+            Markup: Rendered fragment markup
+        """
+        dependencies = self._get_fragment_dependencies(template_name)
+        template = self.env.get_template(template_name)
+        if dependencies is None:
+            return Markup(template.render(**context.get_all()))
+
+        values = {name: context[name] for name in dependencies if name in context}
+        shared_hash = context.get(SHARED_HASH_VAR)
+        if shared_hash is None or SHARED_TEMPLATE_FIELDS.isdisjoint(values):
+            shared_hash, keyed = None, values
+        else:
+            keyed = {
+                name: value for name, value in values.items()
+                if name not in SHARED_TEMPLATE_FIELDS
+            }
+        key = self._fragment_key(template_name, keyed, shared_hash)
+
+        with self._fragment_lock:
+            fragment = self._fragment_cache.get(key)
+            if fragment is not None:
+                self._fragment_cache.move_to_end(key)
+                return fragment
+
+        fragment = Markup(template.render(**values))
+
+        with self._fragment_lock:
+            self._fragment_cache[key] = fragment
+            if len(self._fragment_cache) > FRAGMENT_CACHE_SIZE:
+                self._fragment_cache.popitem(last=False)
+        return fragment
+
     def add_global(self, name: str, obj: Any) -> None:
         """
         Add a global variable to the template environment.
@@ -85,7 +295,36 @@ class TemplateEngine:
             str: Uppercase version of the input string
         """
         return str(value).upper()
-    
+
+    def _render_table_filter(self, table_data: Any) -> Markup:
+        """
+        Custom Jinja2 filter that renders table data as a complete HTML table.
+
+        Columns whose header starts with 'Unnamed' are filtered out once, and every
+        row is emitted through a single precompiled format string instead of
+        per-cell template logic. Falsy cell values render as empty cells, matching
+        the previous `row[header]|default("", true)` behaviour.
+
+        Args:
+            table_data (Any): Mapping with "headers" and "data" (list of row dicts), or None
+
+        Returns:
+            Markup: Safe HTML markup for the table
+        """
+        headers = []
+        rows = []
+        if table_data:
+            headers = [h for h in table_data["headers"] if not str(h).startswith('Unnamed')]
+            rows = table_data["data"]
+
+        head = "".join(f'<th class="table-header">{escape(h)}</th>' for h in headers)
+        row_format = "<tr>" + '<td class="table-cell">{}</td>' * len(headers) + "</tr>"
+        body = "".join(
+            row_format.format(*[escape(v) if v else "" for v in map(row.get, headers)])
+            for row in rows
+        )
+        return Markup(f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>")
+
 engine = TemplateEngine(TEMPLATES_PATH)
 
 if __name__ == "__main__":
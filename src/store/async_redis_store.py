@@ -0,0 +1,298 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+from src.core.asset_manager import AssetType, AsyncAssetManager
+from src.store.compression import CompressionPolicy
+from src.store.redis_events import EVENTS_CHANNEL, encode_event, get_subscriber
+from src.store.redis_pool import RedisPoolConfig, get_client
+from src.store.redis_store import (
+    ASSET_TTL_SECONDS,
+    BLOB_PREFIX,
+    CHUNK_SIZE,
+    INDEX_PREFIX,
+    KEY_PREFIX,
+    LIST_PAGE_SIZE,
+    _decode_legacy_envelope,
+    _decode_record,
+    _encode_record,
+    build_public_url,
+)
+from src.store.url_cache import AssetUrlCache, build_reference_url, shared_url_cache
+
+
+class AsyncRedisAssetManager(AsyncAssetManager):
+    """
+    Asyncio counterpart of RedisAssetManager built on redis.asyncio.
+
+    It reads and writes the same key layout (hash records, type indexes, change
+    events, dedup aliases and blobs), so both managers can be used side by side
+    against one Redis.
+    """
+
+    def __init__(
+            self,
+            redis_url: str = None,
+            compression: Optional[CompressionPolicy] = None,
+            chunk_size: int = CHUNK_SIZE,
+            client: Optional[aioredis.Redis] = None,
+            events_channel: str = EVENTS_CHANNEL,
+            pool_config: Optional[RedisPoolConfig] = None,
+            ttl: int = ASSET_TTL_SECONDS,
+            url_template: Optional[str] = None,
+            url_cache: Optional[AssetUrlCache] = None,
+            dedup: bool = False,
+    ) -> None:
+        if redis_url is None:
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        config = pool_config or RedisPoolConfig.from_env()
+        owns_client = client is None
+        if owns_client:
+            client = aioredis.from_url(
+                redis_url,
+                decode_responses=False,
+                max_connections=config.max_connections,
+                socket_timeout=config.socket_timeout,
+                socket_connect_timeout=config.socket_connect_timeout,
+                health_check_interval=config.health_check_interval,
+                retry=config.make_async_retry(),
+            )
+        self.client = client
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.events_channel = events_channel
+        self.ttl = ttl
+        self.dedup = dedup
+        self.url_template = url_template
+        self._url_namespace = f"async:{redis_url}"
+        self.url_cache = url_cache
+        if url_template is None and url_cache is None and owns_client:
+            # Inline URLs depend on the content; they are only cached when change events
+            # from other processes can invalidate them
+            self.url_cache = shared_url_cache
+            subscriber = get_subscriber(get_client(redis_url, config), events_channel)
+            subscriber.add_listener(self._on_asset_change)
+
+    def _on_asset_change(self, op: str, name: Optional[str], asset_type: AssetType) -> None:
+        if self.url_cache is not None:
+            self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    def _make_key(self, name: str, asset_type: AssetType) -> str:
+        return f"{KEY_PREFIX}{asset_type.value}:{name}"
+
+    def _make_index_key(self, asset_type: AssetType) -> str:
+        return f"{INDEX_PREFIX}{asset_type.value}"
+
+    def _make_blob_key(self, content_hash: str) -> str:
+        return f"{BLOB_PREFIX}{content_hash}"
+
+    def _queue_write(self, pipe, name: str, content: bytes, asset_type: AssetType) -> None:
+        record = _encode_record(name, content, asset_type, self.compression, self.chunk_size)
+        self._queue_record(pipe, name, asset_type, record)
+
+    def _queue_record(self, pipe, name: str, asset_type: AssetType, record: Dict[str, Any]) -> None:
+        key = self._make_key(name, asset_type)
+        pipe.delete(key)
+        pipe.hset(key, mapping=record)
+        pipe.expire(key, self.ttl)
+        pipe.sadd(self._make_index_key(asset_type), name)
+        pipe.publish(self.events_channel, encode_event("save", [(name, asset_type)]))
+
+    async def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return (await self.save_many([(name, content, asset_type)]))[0]
+
+    async def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        if self.dedup:
+            for name, content, asset_type in items:
+                await self._save_deduped(name, content, asset_type)
+        else:
+            async with self.client.pipeline() as pipe:
+                for name, content, asset_type in items:
+                    self._queue_write(pipe, name, content, asset_type)
+                await pipe.execute()
+
+        return await asyncio.gather(*[
+            self._build_public_url(name, asset_type, content) for name, content, asset_type in items
+        ])
+
+    async def _get_ref(self, key: str) -> Optional[str]:
+        """Get the blob hash a dedup alias points at, or None."""
+        try:
+            ref = await self.client.hget(key, "ref")
+        except redis.exceptions.ResponseError:
+            return None
+        return ref.decode("utf-8") if ref is not None else None
+
+    async def _save_deduped(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        """
+        Save an asset as an alias of the blob holding its content, like
+        `RedisAssetManager._save_deduped`.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        key = self._make_key(name, asset_type)
+        blob_key = self._make_blob_key(content_hash)
+        previous = await self._get_ref(key)
+
+        if previous == content_hash:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.expire(key, self.ttl)
+                pipe.expire(blob_key, self.ttl)
+                await pipe.execute()
+            return
+
+        alias = {
+            "name": name,
+            "type": asset_type.value,
+            "size": len(content),
+            "hash": content_hash,
+            "mtime": time.time(),
+            "ref": content_hash,
+        }
+        encoded = []
+
+        async def link(pipe) -> None:
+            has_content = await pipe.hexists(blob_key, "size")
+            if not has_content and not encoded:
+                encoded.append(_encode_record(
+                    content_hash, content, asset_type, self.compression, self.chunk_size
+                ))
+            pipe.multi()
+            if not has_content:
+                pipe.hset(blob_key, mapping=encoded[0])
+            pipe.hincrby(blob_key, "refs", 1)
+            pipe.expire(blob_key, self.ttl)
+            self._queue_record(pipe, name, asset_type, alias)
+
+        await self.client.transaction(link, blob_key)
+        if previous is not None:
+            await self._release_blob(previous)
+
+    async def _release_blob(self, content_hash: str) -> None:
+        """Drop one reference to a blob, deleting it with its last reference."""
+        blob_key = self._make_blob_key(content_hash)
+
+        async def release(pipe) -> None:
+            refs = await pipe.hget(blob_key, "refs")
+            pipe.multi()
+            if refs is None or int(refs) <= 1:
+                pipe.delete(blob_key)
+            else:
+                pipe.hincrby(blob_key, "refs", -1)
+
+        await self.client.transaction(release, blob_key)
+
+    async def get(self, name: str, asset_type: AssetType) -> bytes:
+        contents = await self.get_many([name], asset_type)
+        if name not in contents:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        return contents[name]
+
+    async def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hgetall(self._make_key(name, asset_type))
+            results = await pipe.execute(raise_on_error=False)
+
+        contents = {}
+        for name, fields in zip(names, results, strict=True):
+            if isinstance(fields, redis.exceptions.ResponseError):
+                # WRONGTYPE: the key still holds a legacy JSON envelope
+                data = await self.client.get(self._make_key(name, asset_type))
+                if data is not None:
+                    contents[name] = _decode_legacy_envelope(data, asset_type)
+            elif b"ref" in fields:
+                # Alias written by a dedup-mode RedisAssetManager
+                blob = await self.client.hgetall(f"{BLOB_PREFIX}{fields[b'ref'].decode('utf-8')}")
+                if blob:
+                    contents[name] = _decode_record(blob, self.compression)
+            elif fields:
+                contents[name] = _decode_record(fields, self.compression)
+        return contents
+
+    async def exists(self, name: str, asset_type: AssetType) -> bool:
+        return bool(await self.client.exists(self._make_key(name, asset_type)))
+
+    async def list(self, asset_type: AssetType | None = None) -> list[str]:
+        entries = []
+        for at in [asset_type] if asset_type else list(AssetType):
+            index_key = self._make_index_key(at)
+            cursor = None
+            while cursor != 0:
+                cursor, members = await self.client.sscan(
+                    index_key, cursor=cursor or 0, count=LIST_PAGE_SIZE
+                )
+                names = [member.decode('utf-8') for member in members]
+                if not names:
+                    continue
+
+                # Prune index entries whose asset has expired, like `RedisAssetManager.list_page`
+                async with self.client.pipeline(transaction=False) as pipe:
+                    for name in names:
+                        pipe.exists(self._make_key(name, at))
+                    found = await pipe.execute()
+                expired = [name for name, exists in zip(names, found, strict=True) if not exists]
+                if expired:
+                    await self.client.srem(index_key, *expired)
+                entries.extend(
+                    f"{at.value}:{name}"
+                    for name, exists in zip(names, found, strict=True) if exists
+                )
+        return entries
+
+    async def delete(self, name: str, asset_type: AssetType) -> None:
+        key = self._make_key(name, asset_type)
+        ref = await self._get_ref(key)
+        async with self.client.pipeline() as pipe:
+            pipe.delete(key)
+            pipe.srem(self._make_index_key(asset_type), name)
+            pipe.publish(self.events_channel, encode_event("delete", [(name, asset_type)]))
+            await pipe.execute()
+        if ref is not None:
+            await self._release_blob(ref)
+        if self.url_cache is not None:
+            self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    async def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+
+        if self.url_cache is not None:
+            url = self.url_cache.get(self._url_namespace, name, asset_type)
+            if url is not None:
+                return url
+
+        content = await self.get(name, asset_type)
+        return await self._build_public_url(name, asset_type, content)
+
+    async def _build_public_url(self, name: str, asset_type: AssetType, content: bytes) -> str:
+        """
+        Build the public URL for an asset from content already in hand, and cache it
+        until the asset is saved again or deleted.
+        """
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+
+        # Encoding a large asset as a data URL is CPU bound, keep it off the event loop
+        url = await asyncio.to_thread(build_public_url, name, asset_type, content)
+        if self.url_cache is not None:
+            self.url_cache.put(self._url_namespace, name, asset_type, url)
+        return url
+
+    async def health_check(self) -> bool:
+        return await self.client.ping()
+
+    async def close(self) -> None:
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+
+    @property
+    def compression_stats(self) -> Dict[str, Any]:
+        """
+        Compression ratio and timing stats, empty when compression is disabled.
+        """
+        return self.compression.stats.as_dict() if self.compression else {}
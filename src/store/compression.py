@@ -0,0 +1,181 @@
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.core.asset_manager import AssetType
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional, zlib is always available
+    zstandard = None
+
+ZLIB = "zlib"
+ZSTD = "zstd"
+
+DEFAULT_THRESHOLD = 4096
+
+# Formats that are already compressed and gain nothing from another pass
+INCOMPRESSIBLE_TYPES = {AssetType.IMG, AssetType.PNG, AssetType.JPG, AssetType.JPEG, AssetType.PDF}
+
+
+def compress(codec: str, content: bytes, level: Optional[int] = None) -> bytes:
+    """
+    Compress content with the given codec.
+
+    Args:
+        codec (str): Codec name, "zlib" or "zstd"
+        content (bytes): Content to compress
+        level (Optional[int]): Compression level, codec default if None
+
+    Returns:
+        bytes: Compressed payload
+
+    Raises:
+        ValueError: If the codec is unknown or not installed
+    """
+    if codec == ZLIB:
+        return zlib.compress(content, -1 if level is None else level)
+    if codec == ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compress(content)
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def decompress(codec: str, payload: bytes) -> bytes:
+    """
+    Decompress a payload produced by `compress`.
+
+    Args:
+        codec (str): Codec name the payload was compressed with
+        payload (bytes): Compressed payload
+
+    Returns:
+        bytes: Original content
+
+    Raises:
+        ValueError: If the codec is unknown or not installed
+    """
+    if codec == ZLIB:
+        return zlib.decompress(payload)
+    if codec == ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unsupported compression codec: {codec}")
+
+
+def stream_decompress(codec: str, payloads: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Incrementally decompress a payload delivered in pieces.
+
+    Args:
+        codec (str): Codec name the payload was compressed with
+        payloads (Iterable[bytes]): Consecutive pieces of the compressed payload
+
+    Returns:
+        Iterator[bytes]: Consecutive pieces of the original content
+
+    Raises:
+        ValueError: If the codec is unknown or not installed
+    """
+    if codec == ZLIB:
+        decompressor = zlib.decompressobj()
+    elif codec == ZSTD and zstandard is not None:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        raise ValueError(f"Unsupported compression codec: {codec}")
+
+    for payload in payloads:
+        content = decompressor.decompress(payload)
+        if content:
+            yield content
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+@dataclass
+class CompressionStats:
+    """Counters describing the work done by a CompressionPolicy."""
+    compressed: int = 0
+    skipped: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    compress_seconds: float = 0.0
+    decompressed: int = 0
+    decompress_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["ratio"] = self.bytes_in / self.bytes_out if self.bytes_out else 1.0
+        return stats
+
+
+class CompressionPolicy:
+    """
+    Decides which assets are compressed on write and decompresses them on read.
+
+    Content is compressed when it is at least `threshold` bytes long, its type is not
+    already compressed (JPEG, PNG, PDF), and compression actually makes it smaller.
+    """
+
+    def __init__(
+            self,
+            codec: Optional[str] = None,
+            threshold: int = DEFAULT_THRESHOLD,
+            level: Optional[int] = None,
+    ) -> None:
+        self.codec = codec or (ZSTD if zstandard is not None else ZLIB)
+        self.threshold = threshold
+        self.level = level
+        self.stats = CompressionStats()
+        self._lock = Lock()
+
+    def compress(self, content: bytes, asset_type: AssetType) -> Tuple[Optional[str], bytes]:
+        """
+        Compress asset content if the policy applies to it.
+
+        Args:
+            content (bytes): Asset content
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Tuple[Optional[str], bytes]: Codec used (None if stored raw) and the payload to store
+        """
+        if asset_type in INCOMPRESSIBLE_TYPES or len(content) < self.threshold:
+            with self._lock:
+                self.stats.skipped += 1
+            return None, content
+
+        start = time.perf_counter()
+        payload = compress(self.codec, content, self.level)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.stats.compress_seconds += elapsed
+            if len(payload) >= len(content):
+                self.stats.skipped += 1
+                return None, content
+            self.stats.compressed += 1
+            self.stats.bytes_in += len(content)
+            self.stats.bytes_out += len(payload)
+        return self.codec, payload
+
+    def decompress(self, codec: str, payload: bytes) -> bytes:
+        """
+        Decompress a stored payload, recording timing stats.
+
+        Args:
+            codec (str): Codec recorded when the asset was saved
+            payload (bytes): Stored payload
+
+        Returns:
+            bytes: Original asset content
+        """
+        start = time.perf_counter()
+        content = decompress(codec, payload)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.stats.decompressed += 1
+            self.stats.decompress_seconds += elapsed
+        return content
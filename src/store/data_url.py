@@ -0,0 +1,77 @@
+import base64
+from pathlib import Path
+from typing import Iterable
+
+from src.core.asset_manager import MIME_TYPES, AssetType
+
+# Asset types served to the browser as inline data URLs
+DATA_URL_TYPES = {
+    AssetType.IMG, AssetType.PNG, AssetType.JPG, AssetType.JPEG, AssetType.SVG, AssetType.PDF,
+}
+
+
+def build_data_url(content: bytes | memoryview, asset_type: AssetType) -> str:
+    """
+    Build a base64 data URL for asset content.
+
+    SVG content is base64 encoded too, which is more reliable than URL encoding for
+    complex SVG markup. Any buffer is accepted, so memory-mapped content is encoded
+    without first being copied into a bytes object.
+
+    Args:
+        content (bytes | memoryview): Asset content
+        asset_type (AssetType): Type of the asset, used to pick the MIME type
+
+    Returns:
+        str: Data URL embedding the content
+    """
+    encoded = base64.b64encode(content).decode('utf-8')
+    return f"data:{MIME_TYPES[asset_type]};base64,{encoded}"
+
+
+def build_streamed_data_url(pieces: Iterable[bytes], asset_type: AssetType) -> str:
+    """
+    Build a base64 data URL for asset content streamed in pieces, e.g. by
+    `AssetManager.open_read`. Each piece is encoded as it arrives, so the raw content
+    of a large PDF or panorama is never held whole next to its encoding.
+
+    Args:
+        pieces (Iterable[bytes]): Consecutive pieces of the asset content
+        asset_type (AssetType): Type of the asset, used to pick the MIME type
+
+    Returns:
+        str: Data URL embedding the content
+    """
+    encoded = []
+    remainder = b""
+    for piece in pieces:
+        if remainder:
+            piece = remainder + piece
+        # base64 encodes 3 bytes at a time: carry the rest over to the next piece
+        cut = len(piece) - len(piece) % 3
+        encoded.append(base64.b64encode(memoryview(piece)[:cut]).decode('utf-8'))
+        remainder = piece[cut:]
+    encoded.append(base64.b64encode(remainder).decode('utf-8'))
+    return f"data:{MIME_TYPES[asset_type]};base64,{''.join(encoded)}"
+
+
+def build_public_url(name: str, asset_type: AssetType, content: bytes) -> str:
+    """
+    Build the public URL of an asset stored outside the filesystem from its content.
+
+    Data URL types are inlined, other types are written once to a temporary file.
+    """
+    # For images, SVG and PDF, return as data URL
+    if asset_type in DATA_URL_TYPES:
+        return build_data_url(content, asset_type)
+
+    # Fallback to temporary file approach for other cases if needed
+    temp_dir = Path("temp_assets") / asset_type.value
+    temp_dir.mkdir(parents=True, exist_ok=True)
+
+    temp_path = temp_dir / name
+
+    if not temp_path.exists():
+        temp_path.write_bytes(content)
+
+    return f"{temp_path.absolute()}"
@@ -0,0 +1,258 @@
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.asset_manager import MIME_TYPES, AssetStat, AssetType
+
+LAYOUT_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """
+    Metadata of a locally stored asset.
+    """
+    name: str
+    asset_type: AssetType
+    size: int
+    hash: str
+    mtime: float
+    codec: Optional[str] = None
+    # Content lives in the shared blob named by `hash` rather than in its own file
+    blob: bool = False
+
+    def as_stat(self) -> AssetStat:
+        """Convert to the backend-independent AssetStat."""
+        mime_type = MIME_TYPES[self.asset_type]
+        return AssetStat(self.name, self.asset_type, self.size, self.hash, self.mtime, mime_type)
+
+
+class LocalAssetIndex:
+    """
+    SQLite metadata index of a local asset store.
+
+    One row per asset keyed by (type, name), so listing, existence checks and stat
+    queries are answered without touching the asset directories. The connection is
+    shared between threads and serialized by a lock.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS assets ("
+            " type TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " codec TEXT,"
+            " PRIMARY KEY (type, name)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " hash TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " codec TEXT,"
+            " refs INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(assets)")}
+        if "blob" not in columns:
+            self._conn.execute("ALTER TABLE assets ADD COLUMN blob INTEGER NOT NULL DEFAULT 0")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def put_many(self, entries: Iterable[IndexEntry]) -> None:
+        """
+        Insert or replace the metadata of several assets in one transaction.
+
+        Args:
+            entries (Iterable[IndexEntry]): Metadata rows to store
+        """
+        rows = [
+            (e.asset_type.value, e.name, e.size, e.hash, e.mtime, e.codec, int(e.blob))
+            for e in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO assets (type, name, size, hash, mtime, codec, blob)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def put(self, entry: IndexEntry) -> None:
+        self.put_many([entry])
+
+    def get(self, name: str, asset_type: AssetType) -> Optional[IndexEntry]:
+        """
+        Get the metadata of an asset.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Optional[IndexEntry]: The metadata, or None if the asset is not indexed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, hash, mtime, codec, blob FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+        if row is None:
+            return None
+        return IndexEntry(name, asset_type, *row[:4], bool(row[4]))
+
+    def existing(self, names: List[str], asset_type: AssetType) -> set:
+        """
+        Get which of the given assets are indexed.
+
+        Args:
+            names (List[str]): Names of the assets
+            asset_type (AssetType): Type of the assets
+
+        Returns:
+            set: The indexed names
+        """
+        found = set()
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            batch = names[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT name FROM assets WHERE type = ?"
+                    f" AND name IN ({','.join('?' * len(batch))})",
+                    (asset_type.value, *batch),
+                ).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def names(self, asset_type: AssetType) -> List[str]:
+        """
+        List the names of every indexed asset of a type, in name order.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM assets WHERE type = ? ORDER BY name", (asset_type.value,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def remove(self, name: str, asset_type: AssetType) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM assets WHERE type = ? AND name = ?", (asset_type.value, name)
+            )
+
+    def get_blob(self, content_hash: str) -> Optional[Tuple[int, Optional[str], int]]:
+        """
+        Get the (size, codec, reference count) of a content-addressed blob, or None.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT size, codec, refs FROM blobs WHERE hash = ?", (content_hash,)
+            ).fetchone()
+
+    def link(self, entry: IndexEntry) -> Tuple[bool, Optional[IndexEntry], bool]:
+        """
+        Point an alias at a content-addressed blob in one transaction: take a reference
+        on the blob (creating its row if needed), replace the alias row and drop the
+        reference held by the alias' previous blob.
+
+        Args:
+            entry (IndexEntry): Alias metadata, with `blob` set
+
+        Returns:
+            Tuple[bool, Optional[IndexEntry], bool]: Whether the blob row is new, the
+            replaced alias entry (if any), and whether that entry's blob lost its last
+            reference and was removed
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            previous = self._conn.execute(
+                "SELECT size, hash, mtime, codec, blob FROM assets WHERE type = ? AND name = ?",
+                (entry.asset_type.value, entry.name),
+            ).fetchone()
+            refs = self._conn.execute(
+                "INSERT INTO blobs (hash, size, codec, refs) VALUES (?, ?, ?, 1)"
+                " ON CONFLICT (hash) DO UPDATE SET refs = refs + 1 RETURNING refs",
+                (entry.hash, entry.size, entry.codec),
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO assets (type, name, size, hash, mtime, codec, blob)"
+                " VALUES (?, ?, ?, ?, ?, ?, 1)",
+                (
+                    entry.asset_type.value, entry.name, entry.size, entry.hash, entry.mtime,
+                    entry.codec,
+                ),
+            )
+            old = None
+            if previous:
+                old = IndexEntry(entry.name, entry.asset_type, *previous[:4], bool(previous[4]))
+            released = False
+            if old is not None and old.blob:
+                released = self._release(old.hash)
+        return refs == 1, old, released
+
+    def unlink(self, name: str, asset_type: AssetType) -> Tuple[Optional[IndexEntry], bool]:
+        """
+        Remove an asset row, dropping its blob reference if it is an alias.
+
+        Returns:
+            Tuple[Optional[IndexEntry], bool]: The removed entry (if any), and whether
+            its blob lost its last reference and was removed
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            previous = self._conn.execute(
+                "SELECT size, hash, mtime, codec, blob FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+            if previous is None:
+                return None, False
+            self._conn.execute(
+                "DELETE FROM assets WHERE type = ? AND name = ?", (asset_type.value, name)
+            )
+            old = IndexEntry(name, asset_type, *previous[:4], bool(previous[4]))
+            released = self._release(old.hash) if old.blob else False
+        return old, released
+
+    def _release(self, content_hash: str) -> bool:
+        refs = self._conn.execute(
+            "UPDATE blobs SET refs = refs - 1 WHERE hash = ? RETURNING refs", (content_hash,)
+        ).fetchone()
+        if refs is not None and refs[0] <= 0:
+            self._conn.execute("DELETE FROM blobs WHERE hash = ?", (content_hash,))
+            return True
+        return False
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count indexed assets per type.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT type, COUNT(*) FROM assets GROUP BY type").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
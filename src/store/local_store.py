@@ -1,37 +1,696 @@
+import hashlib
+import io
+import itertools
+import mmap
+import os
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
-from src.core.asset_manager import AssetManager,AssetType
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+from src.store.compression import CompressionPolicy, ZLIB, ZSTD, decompress, stream_decompress
+from src.store.data_url import build_data_url
+from src.store.local_index import LAYOUT_VERSION, IndexEntry, LocalAssetIndex
+from src.store.url_cache import build_reference_url
+
+# Compressed assets are stored with the codec as an extra suffix, e.g. "doc.json.zstd"
+CODECS = (ZSTD, ZLIB)
+READ_CHUNK_SIZE = 512 * 1024
+# Times a queued write is staged and committed before it is dropped
+MAX_WRITE_ATTEMPTS = 3
+INDEX_FILENAME = "index.sqlite3"
+BLOBS_DIRNAME = "blobs"
+
+
+@dataclass
+class PendingWrite:
+    """
+    A save accepted in write-behind mode whose file is not committed yet.
+    """
+    entry: IndexEntry
+    content: bytes
+    payload: bytes
+    generation: int
+    temp_path: Optional[Path] = None
+    future: Optional[Future] = None
+    attempts: int = 0
+
+
+class LocalAssetWriter(io.RawIOBase):
+    """
+    Streaming writer of an uncompressed local asset: data goes straight to a temporary
+    file while its hash is computed, and the file replaces the asset on close.
+    """
+
+    def __init__(self, manager: "LocalAssetManager", name: str, asset_type: AssetType) -> None:
+        super().__init__()
+        self.manager = manager
+        self.name = name
+        self.asset_type = asset_type
+        self.url: Optional[str] = None
+        self._path = manager._get_path(name, asset_type)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_path = self._path.with_name(f".{self._path.name}.{os.getpid()}.{id(self)}.tmp")
+        self._file = open(self._temp_path, "wb")
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self._file.write(data)
+        self._hash.update(data)
+        self._size += written
+        return written
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+            digest = self._hash.hexdigest()
+            entry = IndexEntry(self.name, self.asset_type, self._size, digest, time.time(), None)
+            self.manager._drop_previous(entry)
+            os.replace(self._temp_path, self._path)
+            self.manager.index.put(entry)
+            self.url = self.manager._build_url(self.name, self.asset_type, self._path)
+        super().close()
+
 
 class LocalAssetManager(AssetManager):
-    def __init__(self, base_path: Path) -> None:
+    def __init__(
+            self,
+            base_path: Path,
+            compression: Optional[CompressionPolicy] = None,
+            url_template: Optional[str] = None,
+            write_behind: bool = False,
+            max_writers: int = 4,
+            dedup: bool = False,
+    ) -> None:
+        if dedup and write_behind:
+            raise ValueError(
+                "dedup and write_behind can't be combined: deduplicated saves are synchronous"
+            )
         self.base_path = base_path
+        self.compression = compression
+        self.url_template = url_template
+
+        # Write-behind state: saves return once queued, files are written by a pool and
+        # committed in groups; pending content serves reads until it is on disk. Writes
+        # dropped after failing MAX_WRITE_ATTEMPTS times are reported by `flush`
+        self.write_behind = write_behind
+        self._executor = None
+        if write_behind:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_writers, thread_name_prefix="asset-writer"
+            )
+        self._pending: Dict[Tuple[str, str], PendingWrite] = {}
+        self._staged: List[PendingWrite] = []
+        self._pending_lock = Lock()
+        self._commit_lock = Lock()
+        self._committing = False
+        self._generations = itertools.count()
+        self._failed_writes: List[Tuple[str, AssetType, Exception]] = []
+
+        # Content-addressed mode: assets are aliases of shared sha256-named blobs. Saves
+        # in this mode are synchronous (hence exclusive with write-behind), but duplicate
+        # and unchanged ones touch no file.
+        self.dedup = dedup
+        self._blob_lock = Lock()
+
         self._check_dirs()
+        self.index = LocalAssetIndex(self.base_path / INDEX_FILENAME)
+        if self.index.get_meta("layout_version") != LAYOUT_VERSION:
+            self._migrate_flat_layout()
 
     def _check_dirs(self) -> None:
         for asset_type in AssetType:
             (self.base_path / asset_type.value).mkdir(parents=True, exist_ok=True)
 
     def _get_path(self, name: str, asset_type: AssetType) -> Path:
-        return self.base_path / asset_type.value / name
-    
+        # Two levels of 256 shards keep directories small however many assets are stored
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()
+        return self.base_path / asset_type.value / digest[:2] / digest[2:4] / name
+
+    def _get_blob_path(self, content_hash: str, codec: Optional[str]) -> Path:
+        path = self.base_path / BLOBS_DIRNAME / content_hash[:2] / content_hash[2:4] / content_hash
+        return self._get_compressed_path(path, codec) if codec else path
+
+    def _migrate_flat_layout(self) -> int:
+        """
+        Move assets from the legacy flat per-type directories into the sharded layout
+        and index them.
+
+        Returns:
+            int: Number of migrated assets
+        """
+        suffixes = {f".{codec}": codec for codec in CODECS}
+        migrated = 0
+        for asset_type in AssetType:
+            entries = []
+            for f in (self.base_path / asset_type.value).iterdir():
+                if not f.is_file() or f.name.startswith("."):
+                    continue
+                codec = suffixes.get(f.suffix)
+                name = f.name[:-len(f.suffix)] if codec else f.name
+                mtime = f.stat().st_mtime
+                payload = f.read_bytes()
+                content = decompress(codec, payload) if codec else payload
+                path = self._get_path(name, asset_type)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(f, self._get_compressed_path(path, codec) if codec else path)
+                entries.append(self._make_entry(name, content, asset_type, codec, mtime))
+            self.index.put_many(entries)
+            migrated += len(entries)
+        self.index.set_meta("layout_version", LAYOUT_VERSION)
+        return migrated
+
+    def _make_entry(
+            self,
+            name: str,
+            content: bytes,
+            asset_type: AssetType,
+            codec: Optional[str],
+            mtime: Optional[float] = None,
+    ) -> IndexEntry:
+        digest = hashlib.sha256(content).hexdigest()
+        mtime = mtime if mtime is not None else time.time()
+        return IndexEntry(name, asset_type, len(content), digest, mtime, codec)
+
+    def _compress(self, content: bytes, asset_type: AssetType) -> Tuple[Optional[str], bytes]:
+        if self.compression is None:
+            return None, content
+        return self.compression.compress(content, asset_type)
+
+    def _get_compressed_path(self, path: Path, codec: str) -> Path:
+        return path.with_name(f"{path.name}.{codec}")
+
+    def _find_stored(
+            self,
+            name: str,
+            asset_type: AssetType,
+    ) -> Tuple[Optional[Path], Optional[str]]:
+        """
+        Locate the file holding an asset and the codec it was compressed with, using
+        the index rather than probing the filesystem.
+
+        Returns:
+            Tuple[Optional[Path], Optional[str]]: Stored file path (None if missing) and
+                codec (None if raw)
+        """
+        entry = self.index.get(name, asset_type)
+        if entry is None:
+            return None, None
+        return self._stored_path(entry), entry.codec
+
+    def _read(self, name: str, asset_type: AssetType) -> Optional[bytes]:
+        pending = self._get_pending(name, asset_type)
+        if pending is not None:
+            return pending.content
+        path, codec = self._find_stored(name, asset_type)
+        if path is None:
+            return None
+        payload = path.read_bytes()
+        if codec is None:
+            return payload
+        if self.compression:
+            return self.compression.decompress(codec, payload)
+        return decompress(codec, payload)
+
+    def _get_pending(self, name: str, asset_type: AssetType) -> Optional[PendingWrite]:
+        with self._pending_lock:
+            return self._pending.get((asset_type.value, name))
+
     def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
-        path = self._get_path(name, asset_type)
-        path.write_bytes(content)
+        return self.save_many([(name, content, asset_type)])[0]
+
+    def _store(self, name: str, content: bytes, asset_type: AssetType) -> IndexEntry:
+        if self.dedup:
+            return self._save_deduped(name, content, asset_type)
+        codec, payload = self._compress(content, asset_type)
+        entry = self._make_entry(name, content, asset_type, codec)
+        if self.write_behind and (self.url_template is not None or codec):
+            # Reference and data URLs don't need the file yet
+            self._queue_write(entry, content, payload)
+        elif self.write_behind:
+            # File URLs are rendered right away, so their files must exist. Holding the
+            # commit lock keeps a write queued earlier from landing after this one
+            with self._commit_lock:
+                with self._pending_lock:
+                    self._pending.pop((asset_type.value, name), None)
+                self._replace_stored(entry, payload)
+        else:
+            self._replace_stored(entry, payload)
+        return entry
+
+    def _save_deduped(self, name: str, content: bytes, asset_type: AssetType) -> IndexEntry:
+        """
+        Save an asset as an alias of the blob holding its content, writing the blob only
+        if no asset with the same content exists yet.
+
+        Returns:
+            IndexEntry: The alias entry
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        previous = self.index.get(name, asset_type)
+        if previous is not None and previous.blob and previous.hash == content_hash:
+            # Unchanged save
+            return previous
+
+        with self._blob_lock:
+            blob = self.index.get_blob(content_hash)
+            if blob is None:
+                codec, payload = self._compress(content, asset_type)
+            else:
+                codec, payload = blob[1], None
+            entry = IndexEntry(
+                name, asset_type, len(content), content_hash, time.time(), codec, blob=True
+            )
+            blob_path = self._get_blob_path(content_hash, codec)
+            if payload is not None:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                self._write_file(blob_path, payload)
+
+            _, old, released = self.index.link(entry)
+            self._drop_replaced(old, released)
+        return entry
+
+    def _drop_replaced(self, old: Optional[IndexEntry], released: bool) -> None:
+        """
+        Remove the storage of an entry that was replaced or deleted: its own file, or its
+        blob once no alias references it any more.
+        """
+        if old is None:
+            return
+        if old.blob:
+            if released:
+                self._get_blob_path(old.hash, old.codec).unlink(missing_ok=True)
+        else:
+            self._remove_stored(self._get_path(old.name, old.asset_type))
+
+    def _build_url(self, name: str, asset_type: AssetType, path: Path) -> str:
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
         return f"file://{path.absolute()}"
+
+    def open_write(self, name: str, asset_type: AssetType) -> io.RawIOBase:
+        """
+        Open a writable file-like object for an asset, saved when it is closed.
+
+        Uncompressed synchronous stores stream the data straight to disk; otherwise
+        the content is buffered and saved on close.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            io.RawIOBase: Writer to use as a context manager
+        """
+        if self.compression is None and not self.write_behind and not self.dedup:
+            return LocalAssetWriter(self, name, asset_type)
+        return super().open_write(name, asset_type)
     
+    def _stored_path(self, entry: IndexEntry) -> Path:
+        if entry.blob:
+            return self._get_blob_path(entry.hash, entry.codec)
+        path = self._get_path(entry.name, entry.asset_type)
+        return self._get_compressed_path(path, entry.codec) if entry.codec else path
+
+    def _replace_stored(self, entry: IndexEntry, payload: bytes) -> None:
+        """
+        Synchronously write an asset's file and index it.
+        """
+        self._drop_previous(entry)
+        path = self._stored_path(entry)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_file(path, payload)
+        self.index.put(entry)
+
+    def _drop_previous(self, entry: IndexEntry) -> None:
+        # Drop any copy stored under another codec before writing the new one, and the
+        # blob reference if the asset was an alias
+        previous = self.index.get(entry.name, entry.asset_type)
+        if previous is None:
+            return
+        if previous.blob:
+            with self._blob_lock:
+                self._drop_replaced(*self.index.unlink(entry.name, entry.asset_type))
+        elif previous.codec != entry.codec:
+            self._remove_stored(self._get_path(entry.name, entry.asset_type))
+
+    def _queue_write(self, entry: IndexEntry, content: bytes, payload: bytes) -> None:
+        write = PendingWrite(entry, content, payload, next(self._generations))
+        with self._pending_lock:
+            self._pending[(entry.asset_type.value, entry.name)] = write
+            write.future = self._executor.submit(self._stage_write, write)
+
+    def _stage_write(self, write: PendingWrite) -> None:
+        """
+        Write a pending asset to a unique temporary file, then commit every staged file
+        unless another thread is already committing (it will pick this one up).
+        """
+        path = self._stored_path(write.entry)
+        write.attempts += 1
+        write.temp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write.temp_path.write_bytes(write.payload)
+        except Exception as e:
+            print(f"Failed to write asset {write.entry.name}: {e}")
+            self._retry_write(write, e)
+            return
+
+        with self._pending_lock:
+            self._staged.append(write)
+        self._commit_staged()
+
+    def _retry_write(self, write: PendingWrite, error: Exception) -> None:
+        """
+        Stage a write whose staging or commit failed again, unless it was superseded or
+        ran out of attempts; dropped writes are reported by `flush`.
+        """
+        write.temp_path.unlink(missing_ok=True)
+        key = (write.entry.asset_type.value, write.entry.name)
+        with self._pending_lock:
+            if self._pending.get(key) is not write:
+                return
+            if write.attempts < MAX_WRITE_ATTEMPTS:
+                write.future = self._executor.submit(self._stage_write, write)
+                return
+            del self._pending[key]
+            self._failed_writes.append((write.entry.name, write.entry.asset_type, error))
+
+    def _commit_staged(self) -> None:
+        while True:
+            with self._pending_lock:
+                if not self._staged or self._committing:
+                    return
+                batch, self._staged = self._staged, []
+                self._committing = True
+            try:
+                self._commit(batch)
+            except Exception as e:
+                print(f"Failed to commit {len(batch)} asset writes: {e}")
+                # Restaged from their content, as part of the batch may be in place
+                for write in batch:
+                    self._retry_write(write, e)
+            finally:
+                with self._pending_lock:
+                    self._committing = False
+
+    def _commit(self, batch: List[PendingWrite]) -> None:
+        """
+        Make a group of staged files durable and visible: fsync them, rename them into
+        place, fsync their directories once each and index them in one transaction.
+        Writes superseded by a later save or a delete are discarded.
+        """
+        for write in batch:
+            fd = os.open(write.temp_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        with self._commit_lock:
+            with self._pending_lock:
+                current = [
+                    w for w in batch
+                    if self._pending.get((w.entry.asset_type.value, w.entry.name)) is w
+                ]
+            for write in batch:
+                if write not in current:
+                    write.temp_path.unlink(missing_ok=True)
+
+            directories = set()
+            for write in current:
+                self._drop_previous(write.entry)
+                path = self._stored_path(write.entry)
+                os.replace(write.temp_path, path)
+                directories.add(path.parent)
+            for directory in directories:
+                fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self.index.put_many([write.entry for write in current])
+
+            with self._pending_lock:
+                for write in current:
+                    key = (write.entry.asset_type.value, write.entry.name)
+                    if self._pending.get(key) is write:
+                        del self._pending[key]
+
+    def flush(self) -> None:
+        """
+        Wait until every write queued in write-behind mode is committed to disk.
+        Call it on shutdown; it returns immediately in synchronous mode.
+
+        Raises:
+            OSError: If queued writes were dropped after failing to be written since
+                the last flush; their saves had already returned
+        """
+        self._wait_written()
+        with self._pending_lock:
+            failed, self._failed_writes = self._failed_writes, []
+        if failed:
+            names = ", ".join(f"{asset_type.value}:{name}" for name, asset_type, _ in failed)
+            raise OSError(f"{len(failed)} queued asset writes failed ({names}): {failed[-1][2]}")
+
+    def _wait_written(self, keys: Optional[List[Tuple[str, AssetType]]] = None) -> None:
+        """
+        Wait until the queued writes of some assets are committed to disk.
+
+        Args:
+            keys (Optional[List[Tuple[str, AssetType]]]): (name, type) of the assets,
+                None for every pending write
+        """
+        while True:
+            with self._pending_lock:
+                if keys is None:
+                    writes = list(self._pending.values())
+                else:
+                    writes = [
+                        self._pending.get((asset_type.value, name)) for name, asset_type in keys
+                    ]
+                futures = [w.future for w in writes if w is not None and w.future is not None]
+            if not futures:
+                return
+            wait(futures)
+            # A commit started by another writer may still be running
+            with self._commit_lock:
+                pass
+            for future in futures:
+                if future.exception() is not None:
+                    print(f"Failed to write asset: {future.exception()}")
+            self._commit_staged()
+            with self._pending_lock:
+                # Writes whose staging raised stay pending; drop them rather than wait forever
+                for key, write in list(self._pending.items()):
+                    future = write.future
+                    if future is not None and future.done() and future.exception() is not None:
+                        del self._pending[key]
+                        self._failed_writes.append(
+                            (write.entry.name, write.entry.asset_type, future.exception())
+                        )
+                committing = self._committing
+            if committing:
+                # Picked up by a commit still syncing its files
+                time.sleep(0.001)
+
+    def _write_file(self, path: Path, payload: bytes) -> None:
+        """
+        Write a file through a temporary sibling and rename it into place, so readers
+        holding a memory map of the previous version keep seeing consistent content.
+        """
+        # Unique per writer: sessions and threads save the same names concurrently
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+        try:
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        entries = [self._store(name, content, asset_type) for name, content, asset_type in items]
+        urls = []
+        for entry, (_, content, _) in zip(entries, items, strict=True):
+            if entry.codec and self.url_template is None:
+                urls.append(build_data_url(content, entry.asset_type))
+            else:
+                urls.append(self._build_url(entry.name, entry.asset_type, self._stored_path(entry)))
+        return urls
+
     def get(self, name: str, asset_type: AssetType) -> bytes:
-        path = self._get_path(name, asset_type)
-        if not path.exists():
+        content = self._read(name, asset_type)
+        if content is None:
             raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
-        return path.read_bytes()
+        return content
     
+    def _open_mmap(self, name: str, asset_type: AssetType) -> mmap.mmap:
+        """
+        Memory-map an uncompressed asset read-only, so it can be sliced without copying
+        the file into memory.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            mmap.mmap: Read-only map of the whole file
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+            ValueError: If the asset is stored compressed or empty (empty files can't be mapped)
+        """
+        if self._get_pending(name, asset_type) is not None:
+            # Maps need the file on disk
+            self._wait_written([(name, asset_type)])
+        path, codec = self._find_stored(name, asset_type)
+        if path is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        if codec:
+            raise ValueError(
+                f"Asset '{name}' {asset_type.value} is stored compressed and can't be mapped"
+            )
+        with open(path, "rb") as f:
+            # The map stays valid after the file is closed
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _get_view(self, name: str, asset_type: AssetType) -> memoryview:
+        """
+        Get a read-only view of an asset's content, for the data URLs and range reads
+        served from it.
+
+        Uncompressed assets are memory-mapped, so large panoramas and PDFs are paged in
+        on demand instead of copied. Compressed assets are decompressed into memory.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            memoryview: View of the asset content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        pending = self._get_pending(name, asset_type)
+        if pending is not None:
+            return memoryview(pending.content)
+        path, codec = self._find_stored(name, asset_type)
+        if path is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        if codec or path.stat().st_size == 0:
+            return memoryview(self.get(name, asset_type))
+        return memoryview(self._open_mmap(name, asset_type))
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        """
+        Stream an asset's content from an open file handle, so memory use stays bounded
+        by the read size.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Iterator[bytes]: Consecutive pieces of the asset content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        pending = self._get_pending(name, asset_type)
+        if pending is not None:
+            return iter([pending.content])
+        path, codec = self._find_stored(name, asset_type)
+        if path is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+
+        payloads = self._iter_file(open(path, "rb"))
+        if codec:
+            return stream_decompress(codec, payloads)
+        return payloads
+
+    def _iter_file(self, f) -> Iterator[bytes]:
+        with f:
+            while piece := f.read(READ_CHUNK_SIZE):
+                yield piece
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        """
+        Read the byte range [start, end) of an asset's content.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            start (int): Offset of the first byte to read
+            end (int): Offset one past the last byte to read
+
+        Returns:
+            bytes: The requested slice of the content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        view = self._get_view(name, asset_type)
+        return view[start:end].tobytes()
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        contents = {}
+        for name in names:
+            content = self._read(name, asset_type)
+            if content is not None:
+                contents[name] = content
+        return contents
+
     def exists(self, name: str, asset_type: AssetType) -> bool:
-        path = self._get_path(name, asset_type)
-        return path.exists()
+        if self._get_pending(name, asset_type) is not None:
+            return True
+        return self.index.get(name, asset_type) is not None
     
+    def exists_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bool]:
+        found = self.index.existing(names, asset_type) | set(self._pending_names(asset_type))
+        return {name: name in found for name in names}
+
+    def _pending_names(self, asset_type: AssetType) -> List[str]:
+        with self._pending_lock:
+            return [name for type_value, name in self._pending if type_value == asset_type.value]
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        """
+        Get an asset's metadata (size, content hash, mtime, MIME type) from the index.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            AssetStat: Metadata of the asset
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        pending = self._get_pending(name, asset_type)
+        if pending is not None:
+            return pending.entry.as_stat()
+        entry = self.index.get(name, asset_type)
+        if entry is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        return entry.as_stat()
+
     def list(self, asset_type: AssetType | None = None) -> list[str]:
         if asset_type:
-            path = self.base_path / asset_type.value
-            return [f.name for f in path.iterdir() if f.is_file()]
+            names = self.index.names(asset_type)
+            pending = self._pending_names(asset_type)
+            if pending:
+                names = sorted(set(names).union(pending))
+            # Same "type:name" entries as the other backends
+            return [f"{asset_type.value}:{name}" for name in names]
         
         all_files = []
         for at in AssetType:
@@ -39,8 +698,22 @@ class LocalAssetManager(AssetManager):
         return all_files
     
     def delete(self, name: str, asset_type: AssetType) -> None:
-        path = self._get_path(name, asset_type)
+        # Holding the commit lock keeps a queued write from landing after the delete
+        with self._commit_lock:
+            with self._pending_lock:
+                self._pending.pop((asset_type.value, name), None)
+            with self._blob_lock:
+                old, released = self.index.unlink(name, asset_type)
+                if old is not None and old.blob:
+                    self._drop_replaced(old, released)
+                else:
+                    # Also clears stray files the index doesn't know about
+                    self._remove_stored(self._get_path(name, asset_type))
+
+    def _remove_stored(self, path: Path) -> None:
         path.unlink(missing_ok=True)
+        for codec in CODECS:
+            self._get_compressed_path(path, codec).unlink(missing_ok=True)
 
     def get_public_url(self, name, asset_type):
         """
@@ -51,10 +724,28 @@ class LocalAssetManager(AssetManager):
             asset_type (AssetType): Type of the asset
             
         Returns:
-            str: File URL for the asset
+            str: File URL for the asset, or a data URL if it is stored compressed, or a
+                reference URL if a url_template is configured
         """
-        path = self._get_path(name, asset_type)
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+        # Only compressed assets, served as data URLs, are queued when URLs are file URLs
+        pending = self._get_pending(name, asset_type)
+        if pending is not None:
+            path, codec = self._get_path(name, asset_type), pending.entry.codec
+        else:
+            path, codec = self._find_stored(name, asset_type)
+        if codec:
+            return build_data_url(self._get_view(name, asset_type), asset_type)
+        path = path or self._get_path(name, asset_type)
         return f"file://{path.absolute()}"
+
+    @property
+    def compression_stats(self) -> Dict[str, Any]:
+        """
+        Compression ratio and timing stats, empty when compression is disabled.
+        """
+        return self.compression.stats.as_dict() if self.compression else {}
     
     def health_check(self):
         """
@@ -63,4 +754,46 @@ class LocalAssetManager(AssetManager):
         Returns:
             bool: True indicating the local storage is always available
         """
-        return True
\ No newline at end of file
+        return True
+
+# (directory, compression, url_template, write_behind, dedup) -> manager
+_managers: Dict[Tuple, LocalAssetManager] = {}
+_managers_lock = Lock()
+
+
+def get_local_manager(
+        base_path: Path,
+        compression: Optional[CompressionPolicy] = None,
+        url_template: Optional[str] = None,
+        write_behind: bool = False,
+        dedup: bool = False,
+) -> LocalAssetManager:
+    """
+    Get the process-wide local manager of a directory, creating it on first use.
+
+    Sessions share it, so they share one index connection and, in write-behind mode,
+    one writer pool and one view of the writes still pending.
+
+    Args:
+        base_path (Path): Root directory of the store
+        compression (Optional[CompressionPolicy]): Compression applied to stored assets
+        url_template (Optional[str]): Reference URL template, None for file URLs
+        write_behind (bool): Return from saves before files are on disk
+        dedup (bool): Store identical contents once
+
+    Returns:
+        LocalAssetManager: Manager shared by every caller with this directory and config
+    """
+    key = (Path(base_path).resolve(), compression, url_template, write_behind, dedup)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = LocalAssetManager(
+                Path(base_path),
+                compression=compression,
+                url_template=url_template,
+                write_behind=write_behind,
+                dedup=dedup,
+            )
+            _managers[key] = manager
+        return manager
@@ -0,0 +1,141 @@
+import json
+import time
+import weakref
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+
+import redis
+
+from src.core.asset_manager import AssetType
+
+EVENTS_CHANNEL = "asset_events"
+
+# Identifies events published by this process, whose caches are already up to date
+PROCESS_ORIGIN = uuid4().hex
+
+# Called with (operation, asset name or None for the whole type, asset type)
+ChangeListener = Callable[[str, Optional[str], AssetType], None]
+
+
+def encode_event(op: str, assets: List[tuple]) -> str:
+    """
+    Encode a change event for a batch of assets.
+
+    Args:
+        op (str): Operation that changed the assets ("save", "delete" or "invalidate")
+        assets (List[tuple]): (name, asset_type) pairs; a None name targets the whole type
+
+    Returns:
+        str: JSON message to publish
+    """
+    return json.dumps({
+        "origin": PROCESS_ORIGIN,
+        "op": op,
+        "assets": [[asset_type.value, name] for name, asset_type in assets],
+    })
+
+
+class AssetEventSubscriber:
+    """
+    Background subscriber dispatching asset change events from other processes to
+    registered listeners. One subscriber thread is shared per Redis channel and client.
+    """
+
+    def __init__(
+            self,
+            client: redis.Redis,
+            channel: str = EVENTS_CHANNEL,
+            sleep_time: float = 1.0,
+    ) -> None:
+        self.client = client
+        self.channel = channel
+        self.sleep_time = sleep_time
+        self._listeners: List[weakref.ref] = []
+        self._lock = Lock()
+        self._pubsub = None
+        self._thread = None
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        """
+        Register a listener and start the subscriber thread if needed.
+
+        Bound methods are held weakly, so listeners of discarded objects are dropped.
+
+        Args:
+            listener (ChangeListener): Callable receiving (op, name, asset_type)
+        """
+        ref = weakref.WeakMethod(listener) if hasattr(listener, "__self__") else (lambda: listener)
+        with self._lock:
+            self._listeners.append(ref)
+            if self._thread is None:
+                self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(**{self.channel: self._handle_message})
+                self._thread = self._pubsub.run_in_thread(
+                    sleep_time=self.sleep_time,
+                    daemon=True,
+                    exception_handler=self._handle_exception,
+                )
+
+    def stop(self) -> None:
+        """Stop the subscriber thread and drop all listeners."""
+        with self._lock:
+            if self._thread is not None:
+                self._thread.stop()
+                self._thread = None
+            if self._pubsub is not None:
+                self._pubsub.close()
+                self._pubsub = None
+            self._listeners.clear()
+
+    def _handle_message(self, message: Dict) -> None:
+        try:
+            event = json.loads(message["data"])
+        except (TypeError, ValueError) as e:
+            print(f"Ignoring malformed asset event: {e}")
+            return
+
+        if event.get("origin") == PROCESS_ORIGIN:
+            return
+
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            listeners = [ref() for ref in self._listeners]
+
+        for type_value, name in event.get("assets", []):
+            try:
+                asset_type = AssetType(type_value)
+            except ValueError:
+                continue
+            for listener in listeners:
+                if listener is not None:
+                    listener(event.get("op"), name, asset_type)
+
+    def _handle_exception(self, e: Exception, pubsub, thread) -> None:
+        # Keep listening through transient connection errors, without spinning
+        print(f"Asset event subscriber error: {e}")
+        time.sleep(self.sleep_time)
+
+
+_subscribers: Dict[tuple, AssetEventSubscriber] = {}
+_subscribers_lock = Lock()
+
+
+def get_subscriber(client: redis.Redis, channel: str = EVENTS_CHANNEL) -> AssetEventSubscriber:
+    """
+    Get the process-wide subscriber for a Redis connection and channel.
+
+    Args:
+        client (redis.Redis): Client whose connection settings identify the server
+        channel (str): Channel carrying asset change events
+
+    Returns:
+        AssetEventSubscriber: Shared subscriber instance
+    """
+    key = (repr(client.connection_pool), channel)
+    with _subscribers_lock:
+        subscriber = _subscribers.get(key)
+        if subscriber is None:
+            subscriber = AssetEventSubscriber(client, channel)
+            _subscribers[key] = subscriber
+        return subscriber
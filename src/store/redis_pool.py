@@ -0,0 +1,127 @@
+import os
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Tuple
+
+import redis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+
+
+@dataclass(frozen=True)
+class RedisPoolConfig:
+    """
+    Settings of the process-wide Redis connection pool.
+    """
+    max_connections: int = 50
+    socket_timeout: float = 5.0
+    socket_connect_timeout: float = 1.0
+    health_check_interval: int = 30
+    retry_attempts: int = 3
+    retry_backoff_base: float = 0.05
+    retry_backoff_cap: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "RedisPoolConfig":
+        """
+        Build a config from REDIS_* environment variables, falling back to the defaults.
+
+        Returns:
+            RedisPoolConfig: The resulting configuration
+        """
+        defaults = cls()
+        return cls(
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", defaults.max_connections)),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", defaults.socket_timeout)),
+            socket_connect_timeout=float(
+                os.getenv("REDIS_CONNECT_TIMEOUT", defaults.socket_connect_timeout)
+            ),
+            health_check_interval=int(
+                os.getenv("REDIS_HEALTH_CHECK_INTERVAL", defaults.health_check_interval)
+            ),
+            retry_attempts=int(os.getenv("REDIS_RETRY_ATTEMPTS", defaults.retry_attempts)),
+            retry_backoff_base=float(
+                os.getenv("REDIS_RETRY_BACKOFF_BASE", defaults.retry_backoff_base)
+            ),
+            retry_backoff_cap=float(
+                os.getenv("REDIS_RETRY_BACKOFF_CAP", defaults.retry_backoff_cap)
+            ),
+        )
+
+    def make_retry(self) -> Retry:
+        """
+        Build the retry policy: exponential backoff on connection errors and timeouts.
+
+        Returns:
+            Retry: redis-py retry policy
+        """
+        return Retry(self._make_backoff(), self.retry_attempts)
+
+    def make_async_retry(self) -> AsyncRetry:
+        """
+        Build the same retry policy for redis.asyncio clients.
+
+        Returns:
+            AsyncRetry: redis.asyncio retry policy
+        """
+        return AsyncRetry(self._make_backoff(), self.retry_attempts)
+
+    def _make_backoff(self) -> ExponentialBackoff:
+        return ExponentialBackoff(cap=self.retry_backoff_cap, base=self.retry_backoff_base)
+
+
+_pools: Dict[Tuple[str, RedisPoolConfig], redis.ConnectionPool] = {}
+_pools_lock = Lock()
+
+
+def get_connection_pool(redis_url: str, config: RedisPoolConfig) -> redis.ConnectionPool:
+    """
+    Get the process-wide connection pool for a Redis URL, creating it on first use.
+
+    Args:
+        redis_url (str): URL of the Redis server
+        config (RedisPoolConfig): Pool settings
+
+    Returns:
+        redis.ConnectionPool: Pool shared by every client of this URL and config
+    """
+    key = (redis_url, config)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = redis.ConnectionPool.from_url(
+                redis_url,
+                decode_responses=False,
+                max_connections=config.max_connections,
+                socket_timeout=config.socket_timeout,
+                socket_connect_timeout=config.socket_connect_timeout,
+                health_check_interval=config.health_check_interval,
+                retry=config.make_retry(),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_client(redis_url: str, config: RedisPoolConfig | None = None) -> redis.Redis:
+    """
+    Create a lightweight Redis client on top of the shared connection pool.
+
+    Args:
+        redis_url (str): URL of the Redis server
+        config (RedisPoolConfig | None): Pool settings, read from the environment if None
+
+    Returns:
+        redis.Redis: Client borrowing connections from the shared pool
+    """
+    config = config or RedisPoolConfig.from_env()
+    pool = get_connection_pool(redis_url, config)
+    return redis.Redis(connection_pool=pool, retry=config.make_retry())
+
+
+def close_pools() -> None:
+    """Disconnect and forget every shared connection pool, e.g. on shutdown."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.disconnect()
+        _pools.clear()
@@ -1,108 +1,761 @@
 import redis
+import hashlib
 import json
+import time
 from pathlib import Path
-from typing import Dict, Any
-from src.core.asset_manager import AssetManager,AssetType
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.core.asset_manager import MIME_TYPES, AssetManager, AssetStat, AssetType
 import shutil
+from src.store.data_url import DATA_URL_TYPES, build_public_url, build_streamed_data_url
+from src.store.compression import CompressionPolicy, decompress, stream_decompress
+from src.store.redis_events import EVENTS_CHANNEL, ChangeListener, encode_event, get_subscriber
+from src.store.redis_pool import RedisPoolConfig, get_client
+from src.store.url_cache import AssetUrlCache, build_reference_url, shared_url_cache
 
-class RedisAssetManager:
-    def __init__(self, redis_url: str = None) -> None:
+ASSET_TTL_SECONDS = 3600
+LIST_PAGE_SIZE = 500
+CHUNK_SIZE = 512 * 1024
+KEY_PREFIX = "asset:"
+# Content-addressed blobs shared by dedup aliases: asset:blob:<sha256>
+BLOB_PREFIX = "asset:blob:"
+INDEX_PREFIX = "asset_index:"
+
+
+def _encode_record(
+        name: str,
+        content: bytes,
+        asset_type: AssetType,
+        compression: Optional[CompressionPolicy] = None,
+        chunk_size: int = CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Build the Redis hash fields for an asset: raw (or compressed) content plus flat
+    metadata fields (including the SHA-256 of the content). The codec is recorded
+    when the content is compressed.
+
+    Payloads larger than `chunk_size` are split into fixed-size "c:<index>" fields
+    instead of a single "content" field, so they can be streamed and range-read.
+    """
+    codec, payload = compression.compress(content, asset_type) if compression else (None, content)
+    record = {
+        "name": name,
+        "type": asset_type.value,
+        "size": len(content),
+        "hash": hashlib.sha256(content).hexdigest(),
+        "mtime": time.time(),
+    }
+    if len(payload) > chunk_size:
+        view = memoryview(payload)
+        chunk_count = (len(payload) + chunk_size - 1) // chunk_size
+        record["chunks"] = chunk_count
+        record["chunk_size"] = chunk_size
+        for index in range(chunk_count):
+            record[f"c:{index}"] = view[index * chunk_size:(index + 1) * chunk_size].tobytes()
+    else:
+        record["content"] = payload
+    if codec:
+        record["codec"] = codec
+    return record
+
+
+def _decode_record(
+        fields: Dict[bytes, bytes],
+        compression: Optional[CompressionPolicy] = None,
+) -> bytes:
+    """
+    Extract the asset content from the Redis hash fields of an asset, decompressing it
+    if it was stored compressed.
+    """
+    if b"chunks" in fields:
+        chunk_count = int(fields[b"chunks"])
+        payload = b"".join(fields[f"c:{index}".encode("utf-8")] for index in range(chunk_count))
+    else:
+        payload = fields[b"content"]
+    codec = fields.get(b"codec")
+    if codec is None:
+        return payload
+    if compression:
+        return compression.decompress(codec.decode("utf-8"), payload)
+    return decompress(codec.decode("utf-8"), payload)
+
+
+def _decode_legacy_envelope(data: bytes, asset_type: AssetType) -> bytes:
+    """
+    Decode an asset stored in the legacy JSON envelope with hex (or UTF-8 for SVG) content.
+    """
+    decoded = json.loads(data)
+
+    if asset_type == AssetType.SVG:
+        return decoded["content"].encode("utf-8")
+    else:
+        return bytes.fromhex(decoded["content"])
+
+class RedisAssetManager(AssetManager):
+    def __init__(
+            self,
+            redis_url: str = None,
+            compression: Optional[CompressionPolicy] = None,
+            chunk_size: int = CHUNK_SIZE,
+            client: Optional[redis.Redis] = None,
+            events_channel: str = EVENTS_CHANNEL,
+            pool_config: Optional[RedisPoolConfig] = None,
+            url_template: Optional[str] = None,
+            url_cache: Optional[AssetUrlCache] = None,
+            dedup: bool = False,
+            ttl: int = ASSET_TTL_SECONDS,
+    ) -> None:
         # Default to localhost if no URL is provided, but allow environment variable override
         if redis_url is None:
             import os
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        self.client = redis.from_url(redis_url, decode_responses=False)
-        self._key_prefix = "asset:"
+        # An explicit client (e.g. a local Redis stand-in) takes precedence over the URL.
+        # Otherwise borrow from the process-wide pool, so sessions don't open their own connections.
+        self.client = client if client is not None else get_client(redis_url, pool_config)
+        self.events_channel = events_channel
+        self._key_prefix = KEY_PREFIX
+        self._index_prefix = INDEX_PREFIX
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.url_template = url_template
+        self.url_cache = url_cache if url_cache is not None else shared_url_cache
+        self._url_namespace = repr(self.client.connection_pool)
+        # Content-addressed mode: asset keys become aliases ("ref" field) of refcounted blobs
+        self.dedup = dedup
+        # Seconds an asset lives after its last save or touch
+        self.ttl = ttl
 
         try:
             self.client.ping()
         except redis.exceptions.ConnectionError:
             raise Exception(f"Failed to connect to Redis at {redis_url}")
 
+        if not self.client.exists(f"{self._index_prefix}ready"):
+            self.rebuild_indexes()
+
+        # Inline URLs depend on the content, so drop them when other processes change it
+        if self.url_template is None:
+            self.add_change_listener(self._on_asset_change)
+
     def _make_key(self, name: str, asset_type: AssetType) -> str:
         return f"{self._key_prefix}{asset_type.value}:{name}"
 
+    def _make_index_key(self, asset_type: AssetType) -> str:
+        return f"{self._index_prefix}{asset_type.value}"
+
+    def _make_blob_key(self, content_hash: str) -> str:
+        return f"{BLOB_PREFIX}{content_hash}"
+
+    def _encode(self, name: str, content: bytes, asset_type: AssetType) -> Dict[str, Any]:
+        return _encode_record(name, content, asset_type, self.compression, self.chunk_size)
+
     def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        if self.dedup:
+            self._save_deduped(name, content, asset_type)
+            return self._build_public_url(name, asset_type, content)
+        self._write_record(name, asset_type, self._encode(name, content, asset_type), self.ttl)
+
+        return self._build_public_url(name, asset_type, content)
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        """
+        Save several assets in a single pipelined round-trip.
+
+        Args:
+            items (List[Tuple[str, bytes, AssetType]]): (name, content, asset_type) tuples
+
+        Returns:
+            List[str]: Public URLs of the saved assets, in input order
+        """
+        if self.dedup:
+            return [self.save(name, content, asset_type) for name, content, asset_type in items]
+
+        pipe = self.client.pipeline()
+        for name, content, asset_type in items:
+            record = self._encode(name, content, asset_type)
+            self._queue_write(pipe, name, asset_type, record, self.ttl)
+        pipe.execute()
+
+        return [
+            self._build_public_url(name, asset_type, content) for name, content, asset_type in items
+        ]
+
+    def _queue_write(
+            self,
+            pipe,
+            name: str,
+            asset_type: AssetType,
+            record: Dict[str, Any],
+            ttl: int | None,
+    ) -> None:
+        """
+        Queue on a pipeline the commands replacing an asset's hash and registering it in
+        its type index, dropping any previous value or layout.
+        """
+        key = self._make_key(name, asset_type)
+        pipe.delete(key)
+        pipe.hset(key, mapping=record)
+        if ttl is not None and ttl > 0:
+            pipe.expire(key, ttl)
+        pipe.sadd(self._make_index_key(asset_type), name)
+        pipe.publish(self.events_channel, encode_event("save", [(name, asset_type)]))
+
+    def _save_deduped(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        """
+        Save an asset as an alias of the blob holding its content.
+
+        The blob is only uploaded if no asset with the same content exists; an unchanged
+        save only refreshes the TTLs. Blob reference counts are kept with HINCRBY inside
+        WATCH/MULTI transactions. Every alias save extends the blob's TTL to at least the
+        alias's, never shortening it, so the blob lives as long as its longest-lived
+        alias.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
         key = self._make_key(name, asset_type)
-        metadata = {
+        blob_key = self._make_blob_key(content_hash)
+        try:
+            previous = self.client.hget(key, "ref")
+        except redis.exceptions.ResponseError:
+            # WRONGTYPE: legacy JSON envelope, replaced below
+            previous = None
+        previous = previous.decode("utf-8") if previous is not None else None
+
+        if previous == content_hash:
+            if self.ttl > 0:
+                pipe = self.client.pipeline()
+                pipe.expire(key, self.ttl)
+                pipe.expire(blob_key, self.ttl, gt=True)
+                pipe.execute()
+            return
+
+        alias = {
             "name": name,
             "type": asset_type.value,
-            "size": len(content)
+            "size": len(content),
+            "hash": content_hash,
+            "mtime": time.time(),
+            "ref": content_hash,
         }
+        encoded = []
+
+        def link(pipe) -> None:
+            has_content = pipe.hexists(blob_key, "size")
+            if not has_content and not encoded:
+                encoded.append(self._encode(content_hash, content, asset_type))
+            pipe.multi()
+            if not has_content:
+                pipe.hset(blob_key, mapping=encoded[0])
+            pipe.hincrby(blob_key, "refs", 1)
+            if self.ttl > 0:
+                # Other aliases may have been touched with a longer TTL
+                pipe.expire(blob_key, self.ttl, gt=has_content)
+            self._queue_write(pipe, name, asset_type, alias, self.ttl)
+
+        self.client.transaction(link, blob_key)
+        if previous is not None:
+            self._release_blob(previous)
 
-        self.client.setex(key,3600, json.dumps({"metadata": metadata, "content": content.decode("utf-8") if asset_type == AssetType.SVG else content.hex()}))
+    def _release_blob(self, content_hash: str) -> None:
+        """
+        Drop one reference to a blob, deleting it with its last reference.
+        """
+        blob_key = self._make_blob_key(content_hash)
+
+        def release(pipe) -> None:
+            refs = pipe.hget(blob_key, "refs")
+            pipe.multi()
+            if refs is None or int(refs) <= 1:
+                pipe.delete(blob_key)
+            else:
+                pipe.hincrby(blob_key, "refs", -1)
 
-        return self.get_public_url(name, asset_type)
+        self.client.transaction(release, blob_key)
+
+    def _write_record(
+            self,
+            name: str,
+            asset_type: AssetType,
+            record: Dict[str, Any],
+            ttl: int | None,
+    ) -> None:
+        """
+        Atomically replace the hash stored for an asset.
+        """
+        pipe = self.client.pipeline()
+        self._queue_write(pipe, name, asset_type, record, ttl)
+        pipe.execute()
 
     def get(self, name: str, asset_type: AssetType) -> bytes:
         key = self._make_key(name, asset_type)
-        data = self.client.get(key)
+        try:
+            fields = self.client.hgetall(key)
+        except redis.exceptions.ResponseError:
+            # WRONGTYPE: the key still holds a legacy JSON envelope
+            return self._migrate_legacy_key(key, name, asset_type)
+
+        if b"ref" in fields:
+            fields = self.client.hgetall(self._make_blob_key(fields[b"ref"].decode("utf-8")))
+        if not fields:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+
+        return _decode_record(fields, self.compression)
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        """
+        Stream an asset's content, fetching one stored chunk per request so that memory
+        use stays bounded by the chunk size.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Iterator[bytes]: Consecutive pieces of the asset content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        key = self._make_key(name, asset_type)
+        try:
+            key, exists, chunks, codec = self._read_layout(key)
+        except redis.exceptions.ResponseError:
+            # WRONGTYPE: the key still holds a legacy JSON envelope
+            return iter([self._migrate_legacy_key(key, name, asset_type)])
+
+        if not exists:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+
+        payloads = self._iter_payload(key, chunks)
+        if codec:
+            return stream_decompress(codec, payloads)
+        return payloads
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        """
+        Read the byte range [start, end) of an asset's content.
+
+        For uncompressed chunked assets only the chunks covering the range are fetched.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            start (int): Offset of the first byte to read
+            end (int): Offset one past the last byte to read
+
+        Returns:
+            bytes: The requested slice of the content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        key = self._make_key(name, asset_type)
+        try:
+            key, exists, chunks, codec = self._read_layout(key)
+        except redis.exceptions.ResponseError:
+            return self.get(name, asset_type)[start:end]
+
+        if not exists:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+
+        if chunks and not codec:
+            chunk_size = int(self.client.hget(key, "chunk_size"))
+            first, last = start // chunk_size, min((end - 1) // chunk_size, chunks - 1)
+            if last < first:
+                return b""
+            fields = [f"c:{index}" for index in range(first, last + 1)]
+            data = b"".join(self.client.hmget(key, fields))
+            offset = first * chunk_size
+            return data[start - offset:end - offset]
+
+        # Compressed or single-field content has to be read from the start
+        data = bytearray()
+        for piece in self.open_read(name, asset_type):
+            data += piece
+            if len(data) >= end:
+                break
+        return bytes(data[start:end])
+
+    def _read_layout(self, key: str) -> Tuple[str, bool, int, Optional[str]]:
+        """
+        Fetch the storage layout of an asset without its content, following dedup
+        aliases to their blob.
+
+        Returns:
+            Tuple[str, bool, int, Optional[str]]: Key holding the content, whether it
+            exists, its chunk count (0 when stored in one field) and its codec
+        """
+        size, chunks, codec, ref = self.client.hmget(key, ["size", "chunks", "codec", "ref"])
+        if ref is not None:
+            key = self._make_blob_key(ref.decode("utf-8"))
+            size, chunks, codec = self.client.hmget(key, ["size", "chunks", "codec"])
+        return (
+            key,
+            size is not None,
+            int(chunks) if chunks is not None else 0,
+            codec.decode("utf-8") if codec is not None else None,
+        )
+
+    def _iter_payload(self, key: str, chunks: int) -> Iterator[bytes]:
+        if not chunks:
+            yield self.client.hget(key, "content") or b""
+            return
+        for index in range(chunks):
+            chunk = self.client.hget(key, f"c:{index}")
+            if chunk is None:
+                raise FileNotFoundError(f"Asset key '{key}' expired while streaming")
+            yield chunk
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        """
+        Fetch several assets of one type in a single pipelined round-trip.
+
+        Args:
+            names (List[str]): Names of the assets to fetch
+            asset_type (AssetType): Type of the assets
+
+        Returns:
+            Dict[str, bytes]: Content by asset name; missing assets are omitted
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.hgetall(self._make_key(name, asset_type))
+        results = pipe.execute(raise_on_error=False)
+
+        contents = {}
+        aliases = {}
+        for name, fields in zip(names, results, strict=True):
+            if isinstance(fields, redis.exceptions.ResponseError):
+                # WRONGTYPE: the key still holds a legacy JSON envelope
+                try:
+                    key = self._make_key(name, asset_type)
+                    contents[name] = self._migrate_legacy_key(key, name, asset_type)
+                except FileNotFoundError:
+                    pass
+            elif b"ref" in fields:
+                aliases[name] = fields[b"ref"].decode("utf-8")
+            elif fields:
+                contents[name] = _decode_record(fields, self.compression)
+
+        if aliases:
+            # Second round-trip for the blobs of dedup aliases, each fetched once
+            hashes = list(set(aliases.values()))
+            pipe = self.client.pipeline(transaction=False)
+            for content_hash in hashes:
+                pipe.hgetall(self._make_blob_key(content_hash))
+            blobs = {
+                content_hash: _decode_record(fields, self.compression)
+                for content_hash, fields in zip(hashes, pipe.execute(), strict=True)
+                if fields
+            }
+            for name, content_hash in aliases.items():
+                if content_hash in blobs:
+                    contents[name] = blobs[content_hash]
+        return contents
+
+    def _migrate_legacy_key(self, key: str, name: str, asset_type: AssetType) -> bytes:
+        """
+        Rewrite a legacy JSON-envelope asset in the hash layout, keeping its remaining TTL.
+
+        Returns:
+            bytes: The decoded asset content
+        """
+        pipe = self.client.pipeline()
+        pipe.get(key)
+        pipe.ttl(key)
+        data, ttl = pipe.execute()
 
         if data is None:
             raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
 
-        decoded = json.loads(data)
+        content = _decode_legacy_envelope(data, asset_type)
+        self._write_record(name, asset_type, self._encode(name, content, asset_type), ttl)
+        return content
+
+    def migrate_legacy_keys(self) -> int:
+        """
+        Convert every asset still stored as a JSON envelope to the hash layout.
+
+        Returns:
+            int: Number of migrated keys
+        """
+        migrated = 0
+        for key in self.client.scan_iter(match=f"{self._key_prefix}*", _type="string"):
+            _, type_value, name = key.decode("utf-8").split(":", 2)
+            try:
+                self._migrate_legacy_key(key.decode("utf-8"), name, AssetType(type_value))
+                migrated += 1
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Skipping legacy key {key!r}: {e}")
+        return migrated
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        """
+        Get an asset's size, content hash, modification time and MIME type from its
+        metadata fields, without fetching the content.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            AssetStat: Metadata of the asset
 
-        if asset_type == AssetType.SVG:
-            return decoded["content"].encode("utf-8")
-        else:
-            return bytes.fromhex(decoded["content"])
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        key = self._make_key(name, asset_type)
+        try:
+            size, digest, mtime = self.client.hmget(key, ["size", "hash", "mtime"])
+        except redis.exceptions.ResponseError:
+            # WRONGTYPE: the key still holds a legacy JSON envelope
+            return AssetStat.from_content(name, asset_type, self.get(name, asset_type))
+        if size is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        if digest is None:
+            # Written before content hashes were stored
+            content = self.get(name, asset_type)
+            return AssetStat.from_content(name, asset_type, content, float(mtime))
+        mime_type = MIME_TYPES[asset_type]
+        return AssetStat(
+            name, asset_type, int(size), digest.decode("utf-8"), float(mtime), mime_type
+        )
 
     def exists (self, name: str, asset_type: AssetType) -> bool:
         key = self._make_key(name, asset_type)
         return self.client.exists(key)
 
-    def list(self, asset_type: AssetType) -> list[str]:
-        pattern = f"{self._key_prefix}{asset_type.value}:*" if asset_type else f"{self._key_prefix}*"
+    def touch(self, name: str, asset_type: AssetType, ttl: Optional[int] = None) -> bool:
+        """
+        Restart an asset's expiry, so assets in use outlive cold ones.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            ttl (Optional[int]): Seconds to live from now, default the manager's TTL
+
+        Returns:
+            bool: False if the asset does not exist
+        """
+        key = self._make_key(name, asset_type)
+        ttl = self.ttl if ttl is None else ttl
+        ref = self._get_ref(key) if self.dedup else None
+        pipe = self.client.pipeline(transaction=False)
+        pipe.expire(key, ttl)
+        if ref is not None:
+            # Keep the blob alive as long as its longest-lived alias
+            pipe.expire(self._make_blob_key(ref), ttl, gt=True)
+        return bool(pipe.execute()[0])
+
+    def exists_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bool]:
+        """
+        Check several assets of one type for existence in a single pipelined round-trip.
+
+        Args:
+            names (List[str]): Names of the assets to check
+            asset_type (AssetType): Type of the assets
+
+        Returns:
+            Dict[str, bool]: Existence flag by asset name
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.exists(self._make_key(name, asset_type))
+        return {name: bool(found) for name, found in zip(names, pipe.execute(), strict=True)}
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        return list(self.iter_list(asset_type))
+
+    def list_page(
+            self,
+            asset_type: AssetType,
+            cursor: int = 0,
+            count: int = LIST_PAGE_SIZE,
+    ) -> Tuple[int, List[str]]:
+        """
+        Fetch one page of asset names from the type index with SSCAN.
+
+        Index entries whose asset has expired are pruned from the index as they are found.
 
-        keys = self.client.keys(pattern)
-        # Decode bytes to string and remove prefix
-        return [key.decode('utf-8')[len(self._key_prefix):] for key in keys]
+        Args:
+            asset_type (AssetType): Type of the assets to list
+            cursor (int): Cursor returned by the previous call, 0 to start
+            count (int): Hint for the number of entries to fetch per page
+
+        Returns:
+            Tuple[int, List[str]]: Next cursor (0 when done) and entries formatted as "type:name"
+        """
+        index_key = self._make_index_key(asset_type)
+        cursor, members = self.client.sscan(index_key, cursor=cursor, count=count)
+        names = [member.decode('utf-8') for member in members]
+
+        found = self.exists_many(names, asset_type)
+        expired = [name for name in names if not found[name]]
+        if expired:
+            self.client.srem(index_key, *expired)
+
+        return cursor, [f"{asset_type.value}:{name}" for name in names if found[name]]
+
+    def iter_list(
+            self,
+            asset_type: AssetType | None = None,
+            count: int = LIST_PAGE_SIZE,
+    ) -> Iterator[str]:
+        """
+        Iterate over asset names page by page without blocking the Redis server.
+
+        Args:
+            asset_type (AssetType | None): Type of the assets to list, or None for all types
+            count (int): Hint for the number of entries to fetch per page
+
+        Returns:
+            Iterator[str]: Entries formatted as "type:name", like `list`
+        """
+        asset_types = [asset_type] if asset_type else list(AssetType)
+        for at in asset_types:
+            cursor = 0
+            while True:
+                cursor, names = self.list_page(at, cursor, count)
+                yield from names
+                if cursor == 0:
+                    break
+
+    def rebuild_indexes(self) -> int:
+        """
+        Rebuild the per-type index sets from the stored asset keys using SCAN.
+
+        Returns:
+            int: Number of indexed assets
+        """
+        indexed = 0
+        pipe = self.client.pipeline(transaction=False)
+        for key in self.client.scan_iter(match=f"{self._key_prefix}*", count=LIST_PAGE_SIZE):
+            _, type_value, name = key.decode("utf-8").split(":", 2)
+            try:
+                pipe.sadd(self._make_index_key(AssetType(type_value)), name)
+            except ValueError:
+                continue
+            indexed += 1
+            if indexed % LIST_PAGE_SIZE == 0:
+                pipe.execute()
+        pipe.set(f"{self._index_prefix}ready", 1)
+        pipe.execute()
+        return indexed
 
     def delete(self, name: str, asset_type: AssetType) -> None:
         key = self._make_key(name, asset_type)
         print(key)
-        self.client.delete(key)
+        ref = self._get_ref(key) if self.dedup else None
+        pipe = self.client.pipeline()
+        pipe.delete(key)
+        pipe.srem(self._make_index_key(asset_type), name)
+        pipe.publish(self.events_channel, encode_event("delete", [(name, asset_type)]))
+        pipe.execute()
+        if ref is not None:
+            self._release_blob(ref)
+        self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    def _get_ref(self, key: str) -> Optional[str]:
+        """Get the blob hash a dedup alias points at, or None."""
+        try:
+            ref = self.client.hget(key, "ref")
+        except redis.exceptions.ResponseError:
+            return None
+        return ref.decode("utf-8") if ref is not None else None
+
+    def _on_asset_change(self, op: str, name: Optional[str], asset_type: AssetType) -> None:
+        self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        """
+        Delete several assets of one type in a single pipelined round-trip.
+
+        Args:
+            names (List[str]): Names of the assets
+            asset_type (AssetType): Type of the assets
+        """
+        if not names:
+            return
+        keys = [self._make_key(name, asset_type) for name in names]
+        refs = []
+        if self.dedup:
+            lookup = self.client.pipeline(transaction=False)
+            for key in keys:
+                lookup.hget(key, "ref")
+            refs = [
+                ref.decode("utf-8")
+                for ref in lookup.execute(raise_on_error=False) if isinstance(ref, bytes)
+            ]
+        pipe = self.client.pipeline()
+        pipe.delete(*keys)
+        pipe.srem(self._make_index_key(asset_type), *names)
+        event = encode_event("delete", [(name, asset_type) for name in names])
+        pipe.publish(self.events_channel, event)
+        pipe.execute()
+        for ref in refs:
+            self._release_blob(ref)
+        for name in names:
+            self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Receive asset change events published by other app server processes.
+
+        Events are delivered on a background subscriber thread shared by every manager
+        using the same Redis server, so per-process caches can be invalidated.
+
+        Args:
+            listener (ChangeListener): Callable receiving (op, name, asset_type); name is
+                None when a whole asset type is invalidated
+        """
+        get_subscriber(self.client, self.events_channel).add_listener(listener)
+
+    def publish_invalidation(self, asset_type: AssetType, name: Optional[str] = None) -> None:
+        """
+        Ask other processes to drop cached data for an asset, or for a whole asset type.
+
+        Args:
+            asset_type (AssetType): Type of the invalidated assets
+            name (Optional[str]): Name of the asset, or None for every asset of the type
+        """
+        self.client.publish(self.events_channel, encode_event("invalidate", [(name, asset_type)]))
 
     def get_public_url(self, name: str, asset_type: AssetType) -> str:
-        import base64
-        import urllib.parse
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+
+        url = self.url_cache.get(self._url_namespace, name, asset_type)
+        if url is not None:
+            return url
+
+        if asset_type in DATA_URL_TYPES:
+            # Encoded chunk by chunk, so large PDFs and panoramas are embedded with
+            # bounded memory
+            url = build_streamed_data_url(self.open_read(name, asset_type), asset_type)
+            self.url_cache.put(self._url_namespace, name, asset_type, url)
+            return url
 
         # Get the content from Redis
         content = self.get(name, asset_type)
+        return self._build_public_url(name, asset_type, content)
+
+    def _build_public_url(self, name: str, asset_type: AssetType, content: bytes) -> str:
+        """
+        Build the public URL for an asset from content already in hand, and cache it
+        until the asset is saved again or deleted.
+        """
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
 
-        # For images, return as data URL
-        if asset_type in [AssetType.IMG, AssetType.PNG, AssetType.JPG, AssetType.JPEG]:
-            # For binary images, return as base64 data URL
-            encoded = base64.b64encode(content).decode('utf-8')
-            mime_type = "image/jpeg" if asset_type in [AssetType.JPG, AssetType.JPEG] else "image/png"
-            return f"data:{mime_type};base64,{encoded}"
-
-        # For SVG content, return as data URL
-        elif asset_type == AssetType.SVG:
-            # For SVG, return the raw content as a data URL
-            content_str = content.decode('utf-8')
-            # For SVG content, it's more reliable to use base64 encoding instead of URL encoding
-            # which can have issues with complex SVG content
-            encoded = base64.b64encode(content).decode('utf-8')
-            return f"data:image/svg+xml;base64,{encoded}"
-
-        # For other types, also use data URLs where appropriate
-        elif asset_type == AssetType.PDF:
-            encoded = base64.b64encode(content).decode('utf-8')
-            return f"data:application/pdf;base64,{encoded}"
-
-        # Fallback to temporary file approach for other cases if needed
-        temp_dir = Path("temp_assets") / asset_type.value
-        temp_dir.mkdir(parents=True, exist_ok=True)
-
-        temp_path = temp_dir / name
-
-        if not temp_path.exists():
-            temp_path.write_bytes(content)
-
-        return f"{temp_path.absolute()}"
+        url = build_public_url(name, asset_type, content)
+        self.url_cache.put(self._url_namespace, name, asset_type, url)
+        return url
     
+    @property
+    def compression_stats(self) -> Dict[str, Any]:
+        """
+        Compression ratio and timing stats, empty when compression is disabled.
+        """
+        return self.compression.stats.as_dict() if self.compression else {}
+
     def health_check(self):
         """
         Check if the Redis connection is healthy by pinging the server.
@@ -0,0 +1,372 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core.asset_manager import AssetManager, AssetStat, AssetType
+from src.store.compression import CompressionPolicy, decompress, stream_decompress
+from src.store.data_url import DATA_URL_TYPES, build_public_url, build_streamed_data_url
+from src.store.local_index import IndexEntry
+from src.store.url_cache import AssetUrlCache, build_reference_url, shared_url_cache
+
+# Payloads above this size are written and streamed through incremental blob I/O
+BLOB_CHUNK_SIZE = 512 * 1024
+# Stay below SQLite's bound-parameter limit in IN (...) queries
+QUERY_BATCH_SIZE = 500
+
+
+class SQLiteAssetManager(AssetManager):
+    """
+    Asset store kept in a single SQLite database file in WAL mode.
+
+    Each asset is one row holding its metadata and content blob, indexed by
+    (type, name). Large blobs are written and read incrementally, so they are never
+    held twice in memory, and the whole store is backed up by copying one file.
+    Assets do not expire.
+    """
+
+    def __init__(
+            self,
+            db_path: Path = Path("assets.sqlite3"),
+            compression: Optional[CompressionPolicy] = None,
+            url_template: Optional[str] = None,
+            url_cache: Optional[AssetUrlCache] = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.url_template = url_template
+        self.url_cache = url_cache if url_cache is not None else shared_url_cache
+        self._url_namespace = f"sqlite:{self.db_path.absolute()}"
+
+        # One connection shared by every thread, serialized by a lock
+        self._lock = Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS assets ("
+            " id INTEGER PRIMARY KEY,"
+            " type TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " codec TEXT,"
+            " content BLOB NOT NULL"
+            ")"
+        )
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS assets_type_name ON assets (type, name)"
+        )
+
+    def _write(self, name: str, content: bytes, asset_type: AssetType) -> None:
+        """
+        Insert or replace an asset row. Must be called with the lock held, inside a
+        transaction.
+        """
+        if self.compression:
+            codec, payload = self.compression.compress(content, asset_type)
+        else:
+            codec, payload = None, content
+        large = len(payload) > BLOB_CHUNK_SIZE
+        # Large payloads only reserve their blob here and are filled in place below
+        row_id = self._conn.execute(
+            "INSERT INTO assets (type, name, size, hash, mtime, codec, content)"
+            f" VALUES (?, ?, ?, ?, ?, ?, {'zeroblob(?)' if large else '?'})"
+            " ON CONFLICT (type, name) DO UPDATE SET"
+            " size = excluded.size, hash = excluded.hash, mtime = excluded.mtime,"
+            " codec = excluded.codec, content = excluded.content"
+            " RETURNING id",
+            (
+                asset_type.value,
+                name,
+                len(content),
+                hashlib.sha256(content).hexdigest(),
+                time.time(),
+                codec,
+                len(payload) if large else payload,
+            ),
+        ).fetchone()[0]
+        if not large:
+            return
+
+        view = memoryview(payload)
+        with self._conn.blobopen("assets", "content", row_id) as blob:
+            for offset in range(0, len(payload), BLOB_CHUNK_SIZE):
+                blob.write(view[offset:offset + BLOB_CHUNK_SIZE])
+
+    def _decode(self, payload: bytes, codec: Optional[str]) -> bytes:
+        if codec is None:
+            return payload
+        if self.compression:
+            return self.compression.decompress(codec, payload)
+        return decompress(codec, payload)
+
+    def save(self, name: str, content: bytes, asset_type: AssetType) -> str:
+        return self.save_many([(name, content, asset_type)])[0]
+
+    def save_many(self, items: List[Tuple[str, bytes, AssetType]]) -> List[str]:
+        """
+        Save several assets in a single transaction.
+
+        Args:
+            items (List[Tuple[str, bytes, AssetType]]): (name, content, asset_type) tuples
+
+        Returns:
+            List[str]: Public URLs of the saved assets, in input order
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for name, content, asset_type in items:
+                    self._write(name, content, asset_type)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            self._build_public_url(name, asset_type, content) for name, content, asset_type in items
+        ]
+
+    def get(self, name: str, asset_type: AssetType) -> bytes:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, codec FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        return self._decode(*row)
+
+    def get_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bytes]:
+        contents = {}
+        for start in range(0, len(names), QUERY_BATCH_SIZE):
+            batch = names[start:start + QUERY_BATCH_SIZE]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT name, content, codec FROM assets WHERE type = ?"
+                    f" AND name IN ({','.join('?' * len(batch))})",
+                    (asset_type.value, *batch),
+                ).fetchall()
+            for name, payload, codec in rows:
+                contents[name] = self._decode(payload, codec)
+        return contents
+
+    def open_read(self, name: str, asset_type: AssetType) -> Iterator[bytes]:
+        """
+        Stream an asset's content through incremental blob I/O, so memory use stays
+        bounded by the chunk size.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Iterator[bytes]: Consecutive pieces of the asset content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, codec FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+
+        row_id, codec = row
+        payloads = self._iter_blob(row_id)
+        if codec:
+            return stream_decompress(codec, payloads)
+        return payloads
+
+    def _iter_blob(self, row_id: int) -> Iterator[bytes]:
+        offset = 0
+        while True:
+            with self._lock:
+                try:
+                    with self._conn.blobopen("assets", "content", row_id, readonly=True) as blob:
+                        blob.seek(offset)
+                        piece = blob.read(BLOB_CHUNK_SIZE)
+                except sqlite3.OperationalError:
+                    # The row was deleted or replaced while streaming
+                    return
+            if not piece:
+                return
+            offset += len(piece)
+            yield piece
+
+    def read_range(self, name: str, asset_type: AssetType, start: int, end: int) -> bytes:
+        """
+        Read the byte range [start, end) of an asset's content.
+
+        For uncompressed assets only the requested range of the blob is read.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            start (int): Offset of the first byte to read
+            end (int): Offset one past the last byte to read
+
+        Returns:
+            bytes: The requested slice of the content
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, codec, length(content) FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+            row_id, codec, length = row
+            if not codec:
+                start, end = min(start, length), min(end, length)
+                if end <= start:
+                    return b""
+                with self._conn.blobopen("assets", "content", row_id, readonly=True) as blob:
+                    blob.seek(start)
+                    return blob.read(end - start)
+        return self.get(name, asset_type)[start:end]
+
+    def exists(self, name: str, asset_type: AssetType) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+        return row is not None
+
+    def exists_many(self, names: List[str], asset_type: AssetType) -> Dict[str, bool]:
+        found = set()
+        for start in range(0, len(names), QUERY_BATCH_SIZE):
+            batch = names[start:start + QUERY_BATCH_SIZE]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT name FROM assets WHERE type = ?"
+                    f" AND name IN ({','.join('?' * len(batch))})",
+                    (asset_type.value, *batch),
+                ).fetchall()
+            found.update(row[0] for row in rows)
+        return {name: name in found for name in names}
+
+    def stat(self, name: str, asset_type: AssetType) -> AssetStat:
+        """
+        Get an asset's metadata (size, content hash, mtime, MIME type) without its content.
+
+        Args:
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            AssetStat: Metadata of the asset
+
+        Raises:
+            FileNotFoundError: If the asset does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, hash, mtime, codec FROM assets WHERE type = ? AND name = ?",
+                (asset_type.value, name),
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Asset '{name}' {asset_type.value} not found")
+        return IndexEntry(name, asset_type, *row).as_stat()
+
+    def list(self, asset_type: AssetType | None = None) -> list[str]:
+        with self._lock:
+            if asset_type:
+                rows = self._conn.execute(
+                    "SELECT type, name FROM assets WHERE type = ? ORDER BY name",
+                    (asset_type.value,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT type, name FROM assets ORDER BY type, name"
+                ).fetchall()
+        # Same "type:name" entries as the other backends
+        return [f"{type_value}:{name}" for type_value, name in rows]
+
+    def delete(self, name: str, asset_type: AssetType) -> None:
+        self.delete_many([name], asset_type)
+
+    def delete_many(self, names: List[str], asset_type: AssetType) -> None:
+        """
+        Delete several assets of one type in a single transaction.
+
+        Args:
+            names (List[str]): Names of the assets
+            asset_type (AssetType): Type of the assets
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM assets WHERE type = ? AND name = ?",
+                    [(asset_type.value, name) for name in names],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        for name in names:
+            self.url_cache.invalidate(self._url_namespace, name, asset_type)
+
+    def get_public_url(self, name: str, asset_type: AssetType) -> str:
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+
+        url = self.url_cache.get(self._url_namespace, name, asset_type)
+        if url is not None:
+            return url
+        if asset_type in DATA_URL_TYPES:
+            # Encoded through incremental blob reads, so large PDFs and panoramas are
+            # embedded with bounded memory
+            url = build_streamed_data_url(self.open_read(name, asset_type), asset_type)
+            self.url_cache.put(self._url_namespace, name, asset_type, url)
+            return url
+        return self._build_public_url(name, asset_type, self.get(name, asset_type))
+
+    def _build_public_url(self, name: str, asset_type: AssetType, content: bytes) -> str:
+        """
+        Build the public URL for an asset from content already in hand, and cache it
+        until the asset is saved again or deleted.
+        """
+        if self.url_template is not None:
+            return build_reference_url(self.url_template, name, asset_type)
+
+        url = build_public_url(name, asset_type, content)
+        self.url_cache.put(self._url_namespace, name, asset_type, url)
+        return url
+
+    @property
+    def compression_stats(self) -> Dict[str, Any]:
+        """
+        Compression ratio and timing stats, empty when compression is disabled.
+        """
+        return self.compression.stats.as_dict() if self.compression else {}
+
+    def health_check(self) -> bool:
+        """
+        Check that the database answers queries.
+
+        Returns:
+            bool: True if a trivial query succeeds, False otherwise
+        """
+        try:
+            with self._lock:
+                self._conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
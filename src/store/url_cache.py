@@ -0,0 +1,83 @@
+from typing import Hashable, Optional
+from urllib.parse import quote
+
+from src.core.asset_manager import AssetType
+from src.core.byte_lru_cache import ByteLRUCache
+
+URL_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class AssetUrlCache:
+    """
+    Byte-bounded cache of public asset URLs, keyed per store and asset.
+
+    Inline data URLs embed the whole asset, so building one means reading and base64
+    encoding the content. Caching them lets repeated `get_public_url` calls skip both.
+    """
+
+    def __init__(self, max_bytes: int = URL_CACHE_MAX_BYTES) -> None:
+        self._cache = ByteLRUCache(max_bytes)
+
+    def get(self, namespace: Hashable, name: str, asset_type: AssetType) -> Optional[str]:
+        """
+        Get the cached URL of an asset.
+
+        Args:
+            namespace (Hashable): Identifies the store the asset lives in
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+
+        Returns:
+            Optional[str]: The cached URL, or None if it is not cached
+        """
+        return self._cache.get((namespace, asset_type.value, name))
+
+    def put(self, namespace: Hashable, name: str, asset_type: AssetType, url: str) -> None:
+        """
+        Cache the URL of an asset.
+
+        Args:
+            namespace (Hashable): Identifies the store the asset lives in
+            name (str): Name of the asset
+            asset_type (AssetType): Type of the asset
+            url (str): Public URL of the asset
+        """
+        self._cache.put((namespace, asset_type.value, name), url, len(url))
+
+    def invalidate(self, namespace: Hashable, name: Optional[str], asset_type: AssetType) -> None:
+        """
+        Drop the cached URL of an asset, or of every asset of a type if name is None.
+
+        Args:
+            namespace (Hashable): Identifies the store the asset lives in
+            name (Optional[str]): Name of the asset, or None for the whole type
+            asset_type (AssetType): Type of the asset
+        """
+        if name is None:
+            self._cache.delete_matching(lambda key: key[:2] == (namespace, asset_type.value))
+        else:
+            self._cache.delete((namespace, asset_type.value, name))
+
+    def clear(self) -> None:
+        """Drop every cached URL."""
+        self._cache.clear()
+
+
+# Process-wide, so URLs built in one session are reused by the others
+shared_url_cache = AssetUrlCache()
+
+
+def build_reference_url(url_template: str, name: str, asset_type: AssetType) -> str:
+    """
+    Build a lightweight reference URL for an asset, e.g. "/assets/{type}/{name}",
+    which a server route resolves instead of the page embedding the content.
+
+    Args:
+        url_template (str): Template with {type} and {name} placeholders
+        name (str): Name of the asset
+        asset_type (AssetType): Type of the asset
+
+    Returns:
+        str: Reference URL of the asset
+    """
+    return url_template.format(type=asset_type.value, name=quote(name))
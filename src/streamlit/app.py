@@ -6,6 +6,7 @@ from src.streamlit.edit_page import edit_page
 from src.streamlit.dynamic.home_component import render_home_component
 from src.streamlit.state_manager import state_manager
 from src.render.template_engine import engine
+from src.render.html_cache import render_page_html
 
 
 st.set_page_config(page_title = "PDF RENDER",layout = "wide")
@@ -83,42 +84,14 @@ def render_current_page():
             # Get shared context
             shared_ctx = doc.shared_context
 
-            # Convert View objects to dict format expected by template
-            views_for_template = []
-            for view in current_page_ctx.views:
-                views_for_template.append({
-                    "side": view.side.value if hasattr(view.side, 'value') else view.side,
-                    "image": view.image,
-                    "wall_image": view.wall_image,
-                    "pano": view.pano,
-                    "wall_data": view.wall_data
-                })
-
-            # Convert table data to template format
-            table_data_for_template = None
-            if current_page_ctx.table_data:
-                table_data_for_template = {
-                    "headers": current_page_ctx.table_data.headers,
-                    "data": current_page_ctx.table_data.data
-                }
-
-            # Create context for template rendering
-            context = {
-                "page_title": current_page_ctx.page_title,
-                "embedded_css": css,  # Now using CSS from shared context
-                "generation_date": current_page_ctx.generation_date,
-                "page_number": current_page_ctx.page_number,  # Use the page's own page_number field
-                "total_pages": len(doc.pages),
-                "document_name": shared_ctx.document_name,
-                "document_id": shared_ctx.document_id,
-                "address_line": shared_ctx.address_line,
-                "powered_by_logo_url": shared_ctx.powered_by_logo_url,
-                "header_logo_url": shared_ctx.header_logo_url,
-                "views": views_for_template,
-                "table_data": table_data_for_template,
-            }
-
-            rendered_html = engine.render("base.html", context)
+            # Render the page, reusing cached HTML when the page is unchanged
+            rendered_html = render_page_html(
+                engine,
+                current_page_ctx,
+                shared_ctx,
+                embedded_css=css,
+                total_pages=len(doc.pages),
+            )
             st.markdown(rendered_html, unsafe_allow_html=True)
         except Exception as e:
             st.error(f"Error rendering template: {e}")
@@ -5,6 +5,7 @@ from src.pdf.pdf_service import PDFService
 from uuid import uuid4
 from src.models.context_model import Document, PageContext, SharedContext, View, ViewType, TableData
 from src.core.asset_manager import AssetManager, AssetType
+from src.core.instrumented_asset_manager import metrics_scope
 import json
 from src.svg.wall_processor import generate_wall_projection_svg
 from src.streamlit.state_manager import state_manager
@@ -21,23 +22,18 @@ DOCUMENT_PREFIX = "documents:"
 css = state_manager.get_embedded_css()
 
 
-def _save_file_to_asset_manager(file_obj, asset_prefix: str, asset_type: AssetType = None):
+def _prepare_file_asset(file_obj, asset_prefix: str, asset_type: AssetType = None) -> tuple:
     """
-    Helper function to save a file to the asset manager and return the URL.
+    Helper function to read a file into a (name, content, asset_type) tuple ready to be saved.
 
     Args:
-        file_obj: File object to save
+        file_obj: File object to read
         asset_prefix: Prefix for the asset name
         asset_type: Asset type, will be inferred if not provided
 
     Returns:
-        URL of the saved asset
+        Tuple of (asset_name, asset_content, asset_type)
     """
-    if not file_obj:
-        return ""
-
-    asset_manager = state_manager.asset_manager
-
     if asset_type is None:
         file_extension = file_obj.name.split('.')[-1].lower() if hasattr(file_obj, 'name') else 'svg'
         asset_type = AssetType.SVG if file_extension == 'svg' else AssetType.IMG
@@ -51,11 +47,29 @@ def _save_file_to_asset_manager(file_obj, asset_prefix: str, asset_type: AssetTy
     if hasattr(file_obj, 'seek'):
         file_obj.seek(0)
 
-    asset_manager.save(asset_name, asset_content, asset_type)
-    asset_url = asset_manager.get_public_url(asset_name, asset_type)
+    return asset_name, asset_content, asset_type
+
+def _save_file_to_asset_manager(file_obj, asset_prefix: str, asset_type: AssetType = None):
+    """
+    Helper function to save a file to the asset manager and return the URL.
+
+    Args:
+        file_obj: File object to save
+        asset_prefix: Prefix for the asset name
+        asset_type: Asset type, will be inferred if not provided
+
+    Returns:
+        URL of the saved asset
+    """
+    if not file_obj:
+        return ""
+
+    asset_manager = state_manager.asset_manager
+    asset_name, asset_content, asset_type = _prepare_file_asset(file_obj, asset_prefix, asset_type)
+    return asset_manager.save(asset_name, asset_content, asset_type)
 
-    return asset_url
 
+@metrics_scope("create_page_from_uploaded_data")
 def create_page_from_uploaded_data() -> None:
     """
     Create a page from uploaded data when user completes the wizard.
@@ -78,22 +92,22 @@ def create_page_from_uploaded_data() -> None:
     wall_image_svg = view_data.get("wall_image_svg", "")
     wall_data_file = view_data.get("wall_data")
 
-    # Process side projection image - save it to asset manager and get URL
-    image_url = ""
+    # Collect the side projection, wall SVG and panorama, then save them in one batch
+    pending_assets = {}
     if image_file:
-        image_url = _save_file_to_asset_manager(image_file, "side")
-
-    # Process wall image SVG - save it to asset manager and get URL
-    wall_image_url = ""
+        pending_assets["image"] = _prepare_file_asset(image_file, "side")
     if wall_image_svg:
-        asset_manager = asset_manager
         wall_asset_name = f"wall_{str(uuid4())}.svg"
-        asset_manager.save(wall_asset_name, wall_image_svg.encode('utf-8'), AssetType.SVG)
-        wall_image_url = asset_manager.get_public_url(wall_asset_name, AssetType.SVG)
-
-    pano_content = ""
+        wall_svg = wall_image_svg.encode('utf-8')
+        pending_assets["wall_image"] = (wall_asset_name, wall_svg, AssetType.SVG)
     if panorama_file:
-        pano_content = _save_file_to_asset_manager(panorama_file, "pano")
+        pending_assets["pano"] = _prepare_file_asset(panorama_file, "pano")
+
+    saved_urls = asset_manager.save_many(list(pending_assets.values()))
+    asset_urls = dict(zip(pending_assets, saved_urls, strict=True))
+    image_url = asset_urls.get("image", "")
+    wall_image_url = asset_urls.get("wall_image", "")
+    pano_content = asset_urls.get("pano", "")
 
     # Process the table data
     table_data = None
@@ -168,6 +182,8 @@ def create_page_from_uploaded_data() -> None:
     state_manager.reset_new_page()
     state_manager.set_wizard_step(0)
 
+
+@metrics_scope("save_document")
 def save_document() -> None:
     """
     Save the current document to the asset manager as a JSON file.
@@ -223,6 +239,8 @@ def process_table(df: pd.DataFrame) -> pd.DataFrame:
     df = df.replace({np.nan: ''})
     return df
 
+
+@metrics_scope("save_uploaded_file")
 def save_uploaded_file_to_asset_manager(uploaded_file, asset_prefix="asset", is_svg=False):
     """
     Save an uploaded file to the asset manager and return the URL.
@@ -253,11 +271,11 @@ def save_uploaded_file_to_asset_manager(uploaded_file, asset_prefix="asset", is_
     if hasattr(uploaded_file, 'seek'):
         uploaded_file.seek(0)  # Reset file pointer after reading
 
-    asset_manager.save(asset_name, asset_content, asset_type)
-    asset_url = asset_manager.get_public_url(asset_name, asset_type)
+    # save() already returns the public URL, no need to read the asset back
+    return asset_manager.save(asset_name, asset_content, asset_type)
 
-    return asset_url
 
+@metrics_scope("save_wall_projection")
 def save_wall_projection_to_asset_manager(svg_string: str) -> str:
     """
     Save a wall projection SVG string to the asset manager and return the URL.
@@ -271,10 +289,10 @@ def save_wall_projection_to_asset_manager(svg_string: str) -> str:
     asset_manager = state_manager.asset_manager
     asset_name = f"wall_projection_{str(uuid4())}.svg"
     asset_content = svg_string.encode('utf-8')
-    asset_manager.save(asset_name, asset_content, AssetType.SVG)
-    asset_url = asset_manager.get_public_url(asset_name, AssetType.SVG)
-    return asset_url
+    return asset_manager.save(asset_name, asset_content, AssetType.SVG)
+
 
+@metrics_scope("update_page_from_edits")
 def update_page_from_edits() -> None:
     """
     Update the current page from pending edits in the session state.
@@ -298,7 +316,8 @@ def update_page_from_edits() -> None:
                     page.table_data = value
             case "view":
                 if value is not None:
-                    page.views[0] = value
+                    # Reassign rather than mutate in place, so the page gets a new revision
+                    page.views = [value, *page.views[1:]]
             case "page_title":
                 if value is not None:
                     page.page_title = value
@@ -3,8 +3,10 @@ from typing import Any, Optional, Dict, List
 from datetime import datetime
 from ..models.state_models import AppState, CurrentActionState, DocumentState, PendingChangesState, AssetManagerState, NewPage
 from src.models.context_model import Document, SharedContext
-from src.core.asset_factory import get_default_asset_manager
+from src.core.asset_factory import asset_options_from_env, get_default_asset_manager
 from src.core.asset_manager import AssetType
+from src.core.garbage_collector import start_background_collector
+from src.core.instrumented_asset_manager import metrics_scope
 from pathlib import Path
 import json
 
@@ -28,8 +30,12 @@ class StateManager:
         if self.ASSET_MANAGER_STATE_KEY not in st.session_state:
             # Initialize with a default asset manager and check its health
             try:
-                manager = get_default_asset_manager()
+                # Optional layers (cache, write-behind, dedup, eviction, metrics) are opt-in
+                manager = get_default_asset_manager(**asset_options_from_env())
                 is_connected = manager.health_check() if hasattr(manager, 'health_check') else True
+                # Periodically delete uploads and projections no saved document refers to,
+                # when ASSET_GC_INTERVAL is set
+                start_background_collector(manager)
                 st.session_state[self.ASSET_MANAGER_STATE_KEY] = AssetManagerState(
                     manager=manager,
                     is_connected=is_connected,
@@ -117,6 +123,7 @@ class StateManager:
         """Set document list in app state"""
         self.update_app_state(document_list=docs)
 
+    @metrics_scope("open_document")
     def open_document(self, document_name: str):
         asset_manager = self.asset_manager
         try:
@@ -132,6 +139,7 @@ class StateManager:
             st.error(f"Error opening document: {e}")
             return False
 
+    @metrics_scope("delete_document")
     def delete_document(self, document_name: str):
         asset_manager = self.asset_manager
         try:
@@ -397,14 +405,16 @@ class StateManager:
         st.session_state[self.CURRENT_ACTION_STATE_KEY] = value
 
     # Private Methods
+    @metrics_scope("init_logos")
     def _init_logos(self) -> dict:
         logo_urls = {}
+        logo_assets = []
 
         powered_by_logo = static_path / "images" / "new_logo_powered.png"
         if powered_by_logo.exists():
             powered_by_logo_content = powered_by_logo.read_bytes()
             powered_by_logo_name = f"logo_powered.png"
-            self.asset_manager.save(powered_by_logo_name, powered_by_logo_content, AssetType.IMG)
+            logo_assets.append((powered_by_logo_name, powered_by_logo_content, AssetType.IMG))
             logo_urls['powered_by'] = powered_by_logo_name
         else:
             logo_urls['powered_by'] = ""  # Fallback if file doesn't exist
@@ -413,20 +423,30 @@ class StateManager:
         if header_logo.exists():
             header_logo_content = header_logo.read_text(encoding='utf-8')
             header_logo_name = f"logo_header.svg"
-            self.asset_manager.save(header_logo_name, header_logo_content.encode('utf-8'), AssetType.SVG)
+            header_logo_bytes = header_logo_content.encode('utf-8')
+            logo_assets.append((header_logo_name, header_logo_bytes, AssetType.SVG))
             logo_urls['header'] = header_logo_name
         else:
             logo_urls['header'] = ""  # Fallback if file doesn't exist
 
+        if logo_assets:
+            self.asset_manager.save_many(logo_assets)
+
         return logo_urls
 
+    @metrics_scope("document_list")
     def update_document_list(self):
         document_list = []
         files = self.asset_manager.list(AssetType.JSON)
-        documents = [f for f in files if f.endswith('.json') and f.startswith('json:documents:')]
+        documents = [
+            f.split("json:")[1] for f in files
+            if f.endswith('.json') and f.startswith('json:documents:')
+        ]
+        # Fetch every document in one batch instead of one request per document
+        documents_bytes = self.asset_manager.get_many(documents, AssetType.JSON)
         for document in documents:
             try:
-                doc_bytes = self.asset_manager.get(document.split("json:")[1], AssetType.JSON)
+                doc_bytes = documents_bytes[document]
                 doc_data = doc_bytes.decode('utf-8')
                 doc_json = json.loads(doc_data)
                 date = doc_json.get("updated_at", "")
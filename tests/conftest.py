@@ -0,0 +1,33 @@
+import fakeredis
+import pytest
+
+from src.store.local_store import LocalAssetManager
+from src.store.redis_store import RedisAssetManager
+from src.store.url_cache import AssetUrlCache
+
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server):
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture
+def redis_manager(redis_client):
+    # Reference URLs keep the tests off the background event subscriber
+    return RedisAssetManager(
+        client=redis_client, url_template=URL_TEMPLATE, url_cache=AssetUrlCache()
+    )
+
+
+@pytest.fixture
+def local_manager(tmp_path):
+    manager = LocalAssetManager(tmp_path / "assets")
+    yield manager
+    manager.index.close()
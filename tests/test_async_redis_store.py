@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+
+import fakeredis
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.async_asset_manager import ThreadedAsyncAssetManager
+from src.store.async_redis_store import AsyncRedisAssetManager
+from src.store.redis_store import BLOB_PREFIX, INDEX_PREFIX, RedisAssetManager
+from src.store.url_cache import AssetUrlCache
+
+pytestmark = pytest.mark.unit
+
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+def make_manager(redis_server, **kwargs):
+    return AsyncRedisAssetManager(client=fakeredis.FakeAsyncRedis(server=redis_server), **kwargs)
+
+
+def test_save_get_roundtrip_across_sync_and_async(redis_server, redis_client):
+    async def run():
+        manager = make_manager(redis_server, url_template=URL_TEMPLATE, chunk_size=4)
+        url = await manager.save("big.png", b"0123456789", AssetType.IMG)
+        assert url == "/assets/img/big.png"
+        assert await manager.get("big.png", AssetType.IMG) == b"0123456789"
+        await manager.close()
+
+    asyncio.run(run())
+    sync = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE)
+    assert sync.get("big.png", AssetType.IMG) == b"0123456789"
+
+
+def test_dedup_delete_releases_blob(redis_server, redis_client):
+    blob_key = f"{BLOB_PREFIX}{hashlib.sha256(b'same').hexdigest()}"
+
+    async def run():
+        manager = make_manager(redis_server, url_template=URL_TEMPLATE, dedup=True)
+        await manager.save_many([
+            ("a.png", b"same", AssetType.IMG),
+            ("b.png", b"same", AssetType.IMG),
+        ])
+        assert int(redis_client.hget(blob_key, "refs")) == 2
+        contents = await manager.get_many(["a.png", "b.png"], AssetType.IMG)
+        assert contents == {"a.png": b"same", "b.png": b"same"}
+
+        await manager.delete("a.png", AssetType.IMG)
+        assert int(redis_client.hget(blob_key, "refs")) == 1
+        await manager.delete("b.png", AssetType.IMG)
+        await manager.close()
+
+    asyncio.run(run())
+    assert not redis_client.exists(blob_key)
+
+
+def test_list_prunes_expired_index_entries(redis_server, redis_client):
+    async def run():
+        manager = make_manager(redis_server, url_template=URL_TEMPLATE)
+        await manager.save("kept.png", b"x", AssetType.IMG)
+        redis_client.sadd(f"{INDEX_PREFIX}img", "expired.png")
+        entries = await manager.list(AssetType.IMG)
+        await manager.close()
+        return entries
+
+    assert asyncio.run(run()) == ["img:kept.png"]
+    assert redis_client.smembers(f"{INDEX_PREFIX}img") == {b"kept.png"}
+
+
+def test_public_url_honours_template_and_cache(redis_server):
+    async def run():
+        referenced = make_manager(redis_server, url_template=URL_TEMPLATE)
+        await referenced.save("a.svg", b"<svg/>", AssetType.SVG)
+        assert await referenced.get_public_url("a.svg", AssetType.SVG) == "/assets/svg/a.svg"
+
+        cache = AssetUrlCache()
+        inline = make_manager(redis_server, url_cache=cache)
+        url = await inline.save("b.svg", b"<svg/>", AssetType.SVG)
+        assert url.startswith("data:")
+        assert cache.get(inline._url_namespace, "b.svg", AssetType.SVG) == url
+        assert await inline.get_public_url("b.svg", AssetType.SVG) == url
+        await referenced.close()
+        await inline.close()
+
+    asyncio.run(run())
+
+
+def test_threaded_adapter_runs_sync_manager(local_manager):
+    async def run():
+        manager = ThreadedAsyncAssetManager(local_manager)
+        await manager.save("a.csv", b"a,b", AssetType.CSV)
+        return await manager.get("a.csv", AssetType.CSV)
+
+    assert asyncio.run(run()) == b"a,b"
+
+
+def test_threaded_adapter_saves_batches_in_one_call(local_manager, monkeypatch):
+    batches = []
+    save_many = local_manager.save_many
+    monkeypatch.setattr(
+        local_manager, "save_many", lambda items: batches.append(items) or save_many(items)
+    )
+
+    async def run():
+        manager = ThreadedAsyncAssetManager(local_manager)
+        return await manager.save_many([
+            ("a.csv", b"a", AssetType.CSV),
+            ("b.csv", b"b", AssetType.CSV),
+        ])
+
+    assert len(asyncio.run(run())) == 2
+    assert len(batches) == 1
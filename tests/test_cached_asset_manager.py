@@ -0,0 +1,75 @@
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.byte_lru_cache import ByteLRUCache
+from src.core.cached_asset_manager import CachedAssetManager
+from src.core.instrumented_asset_manager import AssetMetrics, InstrumentedAssetManager
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def metrics():
+    return AssetMetrics()
+
+
+@pytest.fixture
+def cached(local_manager, metrics):
+    # The instrumented layer counts the calls reaching the store
+    return CachedAssetManager(InstrumentedAssetManager(local_manager, metrics), ByteLRUCache(1024))
+
+
+def store_calls(metrics, operation):
+    return sum(
+        series["calls"]
+        for scopes in metrics.as_dict().get(operation, {}).values()
+        for series in scopes.values()
+    )
+
+
+def test_reads_are_served_from_cache(cached, metrics, local_manager):
+    local_manager.save("a.png", b"x", AssetType.IMG)
+
+    assert cached.get("a.png", AssetType.IMG) == b"x"
+    assert cached.get("a.png", AssetType.IMG) == b"x"
+    assert cached.get_many(["a.png"], AssetType.IMG) == {"a.png": b"x"}
+    assert store_calls(metrics, "get") == 1
+    assert store_calls(metrics, "get_many") == 0
+
+
+def test_save_and_delete_keep_cache_consistent(cached):
+    cached.save("a.png", b"1", AssetType.IMG)
+    cached.save("a.png", b"2", AssetType.IMG)
+    assert cached.get("a.png", AssetType.IMG) == b"2"
+
+    cached.delete("a.png", AssetType.IMG)
+    with pytest.raises(FileNotFoundError):
+        cached.get("a.png", AssetType.IMG)
+
+
+def test_change_events_invalidate(cached, local_manager):
+    cached.save("a.png", b"1", AssetType.IMG)
+    local_manager.save("a.png", b"2", AssetType.IMG)
+    assert cached.get("a.png", AssetType.IMG) == b"1"
+
+    cached._on_asset_change("save", "a.png", AssetType.IMG)
+    assert cached.get("a.png", AssetType.IMG) == b"2"
+
+
+def test_cache_is_bounded_by_bytes(local_manager):
+    cache = ByteLRUCache(10)
+    cached = CachedAssetManager(local_manager, cache)
+    cached.save("a.png", b"x" * 6, AssetType.IMG)
+    cached.save("b.png", b"y" * 6, AssetType.IMG)
+
+    assert cache.get(("", "img", "a.png")) is None
+    assert cache.get(("", "img", "b.png")) is not None
+
+
+def test_range_reads_are_served_from_cache(cached, metrics, local_manager):
+    local_manager.save("a.png", b"0123456789", AssetType.IMG)
+
+    assert cached.read_range("a.png", AssetType.IMG, 2, 5) == b"234"
+    cached.get("a.png", AssetType.IMG)
+    assert cached.read_range("a.png", AssetType.IMG, 5, 8) == b"567"
+    assert store_calls(metrics, "read_range") == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from src.models.context_model import Document, PageContext, SharedContext, TableData, View
+from src.models.enums import ViewType
+from src.render.context_builder import (
+    get_page_template_context,
+    page_content_hash,
+    shared_context_hash,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def make_page():
+    return PageContext(
+        page_title="Kitchen",
+        views=[View(side=ViewType.FRONT, image="a.svg", wall_image="b.svg", pano="c.jpg",
+                    wall_data={"width": 3})],
+        table_data=TableData(headers=["item"], data=[{"item": "sink"}]),
+    )
+
+
+def test_in_place_edits_change_the_content_hash():
+    page = make_page()
+    before = page_content_hash(page)
+
+    page.table_data.data[0]["item"] = "oven"
+    after_row = page_content_hash(page)
+    page.views[0].wall_data["width"] = 4
+
+    assert after_row != before
+    assert page_content_hash(page) != after_row
+    rows = get_page_template_context(page)["table_data"]["data"]
+    assert rows[0]["item"] == "oven"
+
+
+def test_rows_and_wall_data_are_wrapped_not_copied():
+    page = make_page()
+    context = get_page_template_context(page)
+
+    row = context["table_data"]["data"][0]
+    wall_data = context["views"][0]["wall_data"]
+    with pytest.raises(TypeError):
+        row["item"] = "oven"
+    page.table_data.data[0]["item"] = "oven"
+    page.views[0].wall_data["width"] = 4
+    assert row["item"] == "oven"
+    assert wall_data["width"] == 4
+
+
+def test_pages_with_equal_content_do_not_share_wrapped_rows():
+    first, second = make_page(), make_page()
+    first_context = get_page_template_context(first)
+    second_context = get_page_template_context(second)
+
+    first.table_data.data[0]["item"] = "oven"
+
+    assert second_context["table_data"]["data"][0]["item"] == "sink"
+    assert get_page_template_context(second) is second_context
+    assert first_context is not second_context
+
+
+def test_shared_context_is_hashed_once_per_revision(monkeypatch):
+    shared = SharedContext(document_name="Doc", address_line="Main St",
+                           powered_by_logo_url="data:image/svg+xml;base64,AA==",
+                           header_logo_url="data:image/svg+xml;base64,AA==")
+    document = Document(name="Doc", shared_context=shared)
+    first = shared_context_hash(shared)
+
+    dumps = []
+    dump = SharedContext.model_dump_json
+    monkeypatch.setattr(SharedContext, "model_dump_json",
+                        lambda self, **kwargs: dumps.append(1) or dump(self, **kwargs))
+    assert shared_context_hash(shared) == first
+    assert dumps == []
+
+    document.update_shared_context(address_line="Side St")
+    assert shared_context_hash(shared) != first
+    assert dumps == [1]
@@ -0,0 +1,39 @@
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.tiered_asset_manager import TieredAssetManager
+from src.store.redis_store import RedisAssetManager
+from src.store.sqlite_store import SQLiteAssetManager
+
+pytestmark = pytest.mark.unit
+
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+@pytest.fixture(params=["local", "sqlite", "redis", "tiered"])
+def manager(request, tmp_path, local_manager, redis_client):
+    if request.param == "sqlite":
+        manager = SQLiteAssetManager(tmp_path / "assets.sqlite3", url_template=URL_TEMPLATE)
+        yield manager
+        manager.close()
+        return
+    remote = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE)
+    yield {
+        "local": local_manager,
+        "redis": remote,
+        "tiered": TieredAssetManager(local_manager, lambda: remote),
+    }[request.param]
+
+
+def test_documents_are_listed_as_type_and_name(manager):
+    manager.save("documents:doc.json", b"{}", AssetType.JSON)
+    manager.save("chart.svg", b"<svg/>", AssetType.SVG)
+
+    # The filter StateManager.update_document_list applies to the listing
+    documents = [
+        entry.split("json:")[1] for entry in manager.list(AssetType.JSON)
+        if entry.endswith(".json") and entry.startswith("json:documents:")
+    ]
+
+    assert documents == ["documents:doc.json"]
+    assert sorted(manager.list(None)) == ["json:documents:doc.json", "svg:chart.svg"]
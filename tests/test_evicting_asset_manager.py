@@ -0,0 +1,128 @@
+import json
+import time
+
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.circuit_breaker import CircuitBreaker
+from src.core.evicting_asset_manager import LFU, EvictingAssetManager
+from src.core.garbage_collector import list_asset_names
+from src.core.tiered_asset_manager import TieredAssetManager
+from src.store.local_store import LocalAssetManager
+from src.store.redis_store import RedisAssetManager
+
+pytestmark = pytest.mark.unit
+
+
+def wait_ready(manager, asset_type, timeout=5.0):
+    """Wait for the background pin marking and usage loading."""
+    deadline = time.monotonic() + timeout
+    while manager.state.pins is None or asset_type in manager.state.loading:
+        assert time.monotonic() < deadline, "eviction state not ready"
+        time.sleep(0.01)
+
+
+def make_evicting(local_manager, budget, **kwargs):
+    return EvictingAssetManager(local_manager, {AssetType.IMG: budget}, min_idle=0, **kwargs)
+
+
+def stored(manager):
+    return sorted(list_asset_names(manager, AssetType.IMG))
+
+
+def test_least_recently_used_assets_are_evicted(local_manager):
+    manager = make_evicting(local_manager, 300)
+    manager.save("a.png", b"a" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+    manager.save("b.png", b"b" * 100, AssetType.IMG)
+    manager.save("c.png", b"c" * 100, AssetType.IMG)
+    manager.get("a.png", AssetType.IMG)
+
+    manager.save("d.png", b"d" * 100, AssetType.IMG)
+
+    assert stored(manager) == ["a.png", "c.png", "d.png"]
+    assert manager.usage_stats()["img"]["bytes"] == 300
+
+
+def test_least_frequently_used_assets_are_evicted(local_manager):
+    manager = make_evicting(local_manager, 200, policy=LFU)
+    manager.save("a.png", b"a" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+    manager.save("b.png", b"b" * 100, AssetType.IMG)
+    for _ in range(3):
+        manager.get("a.png", AssetType.IMG)
+
+    manager.save("c.png", b"c" * 100, AssetType.IMG)
+
+    assert stored(manager) == ["a.png", "c.png"]
+
+
+def test_assets_of_saved_documents_are_pinned(local_manager):
+    manager = make_evicting(local_manager, 200)
+    manager.save("used.png", b"u" * 100, AssetType.IMG)
+    manager.save("other.png", b"o" * 100, AssetType.IMG)
+    document = {"pages": [{"image": {"name": "used.png", "asset_type": "img"}}]}
+    manager.save("documents:doc", json.dumps(document).encode("utf-8"), AssetType.JSON)
+    wait_ready(manager, AssetType.IMG)
+
+    manager.save("new.png", b"n" * 100, AssetType.IMG)
+
+    assert stored(manager) == ["new.png", "used.png"]
+
+
+def test_recently_saved_assets_are_in_use(local_manager):
+    manager = EvictingAssetManager(local_manager, {AssetType.IMG: 100})
+    manager.save("a.png", b"a" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+
+    manager.save("b.png", b"b" * 100, AssetType.IMG)
+
+    assert stored(manager) == ["a.png", "b.png"]
+
+
+def test_existing_assets_are_loaded_in_the_background(local_manager):
+    for name in ("old1.png", "old2.png"):
+        local_manager.save(name, b"o" * 100, AssetType.IMG)
+    manager = make_evicting(local_manager, 1000)
+
+    manager.save("new.png", b"n" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+
+    assert manager.usage_stats()["img"] == {"bytes": 300, "assets": 3, "budget": 1000}
+    assert list(manager.state.usage[AssetType.IMG])[-1] == "new.png"
+
+
+def test_nothing_is_evicted_while_the_remote_is_down(local_manager, redis_server, redis_client):
+    remote = RedisAssetManager(client=redis_client, url_template="/assets/{type}/{name}")
+    tiered = TieredAssetManager(local_manager, lambda: remote, CircuitBreaker(1, 60.0))
+    manager = make_evicting(tiered, 200, pin_refresh=0)
+    manager.save("a.png", b"a" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+    pins = manager.state.pins
+
+    redis_server.connected = False
+    manager.save("b.png", b"b" * 100, AssetType.IMG)
+    manager.save("c.png", b"c" * 100, AssetType.IMG)
+    with manager.state.pin_lock:
+        assert manager.state.pins is pins
+
+    # Only the two saves are queued, no eviction
+    assert tiered.queued_writes == 2
+    assert manager.usage_stats()["img"]["assets"] == 3
+    redis_server.connected = True
+    assert remote.exists("a.png", AssetType.IMG)
+
+
+def test_deduplicated_contents_are_counted_once(tmp_path):
+    manager = make_evicting(LocalAssetManager(tmp_path, dedup=True), 250)
+    manager.save("a.png", b"s" * 100, AssetType.IMG)
+    wait_ready(manager, AssetType.IMG)
+    manager.save("b.png", b"s" * 100, AssetType.IMG)
+    manager.save("c.png", b"c" * 100, AssetType.IMG)
+    assert manager.usage_stats()["img"] == {"bytes": 200, "assets": 3, "budget": 250}
+
+    # Evicting a.png alone would free nothing: b.png shares its content
+    manager.save("d.png", b"d" * 100, AssetType.IMG)
+
+    assert stored(manager) == ["c.png", "d.png"]
+    assert manager.usage_stats()["img"]["bytes"] == 200
@@ -0,0 +1,97 @@
+import hashlib
+import json
+
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.circuit_breaker import CircuitBreaker
+from src.core.garbage_collector import AssetGarbageCollector, ReferenceSet
+from src.core.tiered_asset_manager import TieredAssetManager
+from src.store.local_store import LocalAssetManager
+from src.store.redis_store import RedisAssetManager
+
+pytestmark = pytest.mark.unit
+
+
+def save_document(manager, name, document):
+    manager.save(f"documents:{name}", json.dumps(document).encode("utf-8"), AssetType.JSON)
+
+
+def test_dedup_file_url_is_matched_by_content_hash(tmp_path):
+    manager = LocalAssetManager(tmp_path, dedup=True)
+    url = manager.save("photo.png", b"photo", AssetType.IMG)
+    assert "/blobs/" in url
+
+    references = ReferenceSet()
+    references.add_document({"image": url})
+
+    content_hash = hashlib.sha256(b"photo").hexdigest()
+    assert not references.is_referenced("photo.png", AssetType.IMG)
+    assert references.is_referenced("photo.png", AssetType.IMG, content_hash)
+
+
+def test_collect_keeps_dedup_assets_referenced_by_blob_url(tmp_path):
+    manager = LocalAssetManager(tmp_path, dedup=True)
+    url = manager.save("photo.png", b"photo", AssetType.IMG)
+    manager.save("orphan.png", b"orphan", AssetType.IMG)
+    save_document(manager, "doc", {"pages": [{"image": url}]})
+
+    report = AssetGarbageCollector(manager, grace_period=0).collect()
+
+    assert manager.exists("photo.png", AssetType.IMG)
+    assert not manager.exists("orphan.png", AssetType.IMG)
+    assert report.deleted == 1
+    assert report.referenced == 1
+
+
+def test_collect_respects_names_grace_period_and_pins(local_manager):
+    local_manager.save("kept.svg", b"<svg>kept</svg>", AssetType.SVG)
+    local_manager.save("orphan.svg", b"<svg>orphan</svg>", AssetType.SVG)
+    local_manager.save("logo_header.svg", b"<svg>logo</svg>", AssetType.SVG)
+    save_document(local_manager, "doc", {"chart": {"name": "kept.svg", "asset_type": "svg"}})
+
+    recent = AssetGarbageCollector(local_manager, grace_period=3600).collect()
+    assert recent.too_recent == 1
+    assert local_manager.exists("orphan.svg", AssetType.SVG)
+
+    report = AssetGarbageCollector(local_manager, grace_period=0).collect(dry_run=True)
+    assert report.deleted == 1
+    assert local_manager.exists("orphan.svg", AssetType.SVG)
+
+    AssetGarbageCollector(local_manager, grace_period=0).collect()
+    assert sorted(local_manager.list(AssetType.SVG)) == ["svg:kept.svg", "svg:logo_header.svg"]
+
+
+def test_inline_data_urls_are_matched_by_content_hash(local_manager):
+    local_manager.save("embedded.png", b"png", AssetType.IMG)
+    save_document(local_manager, "doc", {"image": "data:image/png;base64,cG5n"})
+
+    AssetGarbageCollector(local_manager, grace_period=0).collect()
+
+    assert local_manager.exists("embedded.png", AssetType.IMG)
+
+
+def test_collect_during_remote_outage_deletes_nothing(local_manager, redis_server, redis_client):
+    remote = RedisAssetManager(client=redis_client, url_template="/assets/{type}/{name}")
+    tiered = TieredAssetManager(
+        local_manager, lambda: remote, CircuitBreaker(1, 0.0), promote_after=1
+    )
+    url = tiered.save("photo.png", b"photo", AssetType.IMG)
+    save_document(tiered, "doc", {"image": url})
+    # A hot copy of the referenced image, while the document lives in Redis only
+    tiered.get("photo.png", AssetType.IMG)
+    assert not local_manager.exists("documents:doc", AssetType.JSON)
+
+    redis_server.connected = False
+    report = AssetGarbageCollector(tiered, grace_period=0).collect()
+
+    assert report.aborted
+    assert report.deleted == 0
+    assert local_manager.exists("photo.png", AssetType.IMG)
+    assert tiered.queued_writes == 0
+
+    redis_server.connected = True
+    report = AssetGarbageCollector(tiered, grace_period=0).collect()
+    assert not report.aborted
+    assert report.referenced == 1
+    assert tiered.exists("photo.png", AssetType.IMG)
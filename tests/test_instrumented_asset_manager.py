@@ -0,0 +1,57 @@
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.instrumented_asset_manager import (
+    AssetMetrics,
+    InstrumentedAssetManager,
+    metrics_scope,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def instrumented(local_manager):
+    return InstrumentedAssetManager(local_manager, AssetMetrics())
+
+
+def test_calls_bytes_and_scopes_are_recorded(instrumented):
+    with metrics_scope("editor"):
+        instrumented.save("a.png", b"12345", AssetType.IMG)
+        instrumented.get("a.png", AssetType.IMG)
+    instrumented.get("a.png", AssetType.IMG)
+
+    metrics = instrumented.metrics.as_dict()
+    assert metrics["save"]["img"]["editor"]["bytes_in"] == 5
+    assert metrics["get"]["img"]["editor"]["bytes_out"] == 5
+    assert metrics["get"]["img"][""]["calls"] == 1
+    assert metrics["get"]["img"]["editor"]["latency_buckets"]["+Inf"] == 1
+
+
+def test_missing_assets_are_not_errors(instrumented):
+    with pytest.raises(FileNotFoundError):
+        instrumented.get("missing.png", AssetType.IMG)
+
+    series = instrumented.metrics.as_dict()["get"]["img"][""]
+    assert series["calls"] == 1
+    assert series["errors"] == 0
+
+
+def test_streamed_bytes_are_counted_when_consumed(instrumented):
+    instrumented.save("a.csv", b"a,b\n1,2\n", AssetType.CSV)
+    pieces = instrumented.open_read("a.csv", AssetType.CSV)
+    assert instrumented.metrics.as_dict()["open_read"]["csv"][""]["bytes_out"] == 0
+
+    assert b"".join(pieces) == b"a,b\n1,2\n"
+    assert instrumented.metrics.as_dict()["open_read"]["csv"][""]["bytes_out"] == 8
+
+
+def test_prometheus_exposition(instrumented):
+    with metrics_scope('say "hi"'):
+        instrumented.exists("a.png", AssetType.IMG)
+
+    text = instrumented.metrics.to_prometheus()
+    assert "# TYPE asset_store_calls_total counter" in text
+    labels = 'operation="exists",type="img",scope="say \\"hi\\""'
+    assert f"asset_store_calls_total{{{labels}}} 1" in text
+    assert f'asset_store_latency_seconds_bucket{{{labels},le="+Inf"}} 1' in text
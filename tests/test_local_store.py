@@ -0,0 +1,158 @@
+import hashlib
+import threading
+
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.store.local_index import IndexEntry, LocalAssetIndex
+from src.store.local_store import LocalAssetManager, get_local_manager
+
+pytestmark = pytest.mark.unit
+
+
+def test_save_get_roundtrip(local_manager):
+    url = local_manager.save("chart.svg", b"<svg/>", AssetType.SVG)
+
+    assert url.startswith("file://")
+    assert local_manager.get("chart.svg", AssetType.SVG) == b"<svg/>"
+    assert local_manager.exists("chart.svg", AssetType.SVG)
+    assert local_manager.list(AssetType.SVG) == ["svg:chart.svg"]
+
+
+def test_stat_is_answered_by_the_index(local_manager):
+    local_manager.save("data.csv", b"a,b\n1,2\n", AssetType.CSV)
+
+    stat = local_manager.stat("data.csv", AssetType.CSV)
+
+    assert stat.size == 8
+    assert local_manager.index.get("data.csv", AssetType.CSV).hash == stat.content_hash
+
+
+def test_delete_removes_file_and_index_entry(local_manager):
+    local_manager.save("photo.png", b"png", AssetType.IMG)
+    local_manager.delete("photo.png", AssetType.IMG)
+
+    assert not local_manager.exists("photo.png", AssetType.IMG)
+    assert local_manager.index.get("photo.png", AssetType.IMG) is None
+    with pytest.raises(FileNotFoundError):
+        local_manager.get("photo.png", AssetType.IMG)
+
+
+def test_index_put_get_existing(tmp_path):
+    index = LocalAssetIndex(tmp_path / "index.sqlite3")
+    index.put_many([
+        IndexEntry("a.png", AssetType.IMG, 1, "h1", 1.0, None),
+        IndexEntry("b.png", AssetType.IMG, 2, "h2", 2.0, "zlib"),
+    ])
+
+    assert index.get("b.png", AssetType.IMG).codec == "zlib"
+    assert index.existing(["a.png", "b.png", "c.png"], AssetType.IMG) == {"a.png", "b.png"}
+    assert sorted(index.names(AssetType.IMG)) == ["a.png", "b.png"]
+    index.close()
+
+
+def test_dedup_stores_identical_content_once(tmp_path):
+    manager = LocalAssetManager(tmp_path, dedup=True)
+    first = manager.save("a.png", b"same", AssetType.IMG)
+    second = manager.save("b.png", b"same", AssetType.IMG)
+
+    content_hash = hashlib.sha256(b"same").hexdigest()
+    assert first == second
+    assert manager.index.get_blob(content_hash)[2] == 2
+
+    manager.delete("a.png", AssetType.IMG)
+    assert manager.get("b.png", AssetType.IMG) == b"same"
+    manager.delete("b.png", AssetType.IMG)
+    assert manager.index.get_blob(content_hash) is None
+
+
+def test_range_reads_are_served_from_a_memory_map(local_manager):
+    local_manager.save("pano.jpg", b"0123456789", AssetType.JPG)
+    local_manager.save("empty.jpg", b"", AssetType.JPG)
+
+    assert local_manager.read_range("pano.jpg", AssetType.JPG, 2, 5) == b"234"
+    assert local_manager.read_range("pano.jpg", AssetType.JPG, 8, 20) == b"89"
+    assert local_manager.read_range("empty.jpg", AssetType.JPG, 0, 4) == b""
+
+
+def test_dedup_and_write_behind_are_exclusive(tmp_path):
+    with pytest.raises(ValueError):
+        LocalAssetManager(tmp_path, dedup=True, write_behind=True)
+
+
+def test_write_behind_file_urls_point_at_written_files(tmp_path):
+    manager = LocalAssetManager(tmp_path, write_behind=True)
+    urls = manager.save_many([(f"{i}.png", bytes([i]) * 10, AssetType.IMG) for i in range(20)])
+
+    for url in urls:
+        with open(url[len("file://"):], "rb") as f:
+            assert len(f.read()) == 10
+
+
+def test_write_behind_reference_urls_serve_pending_content(tmp_path):
+    manager = LocalAssetManager(tmp_path, write_behind=True, url_template="/assets/{type}/{name}")
+    manager.save("late.png", b"pending", AssetType.IMG)
+
+    assert manager.get("late.png", AssetType.IMG) == b"pending"
+    manager.flush()
+    assert manager.index.get("late.png", AssetType.IMG) is not None
+
+
+def test_write_behind_retries_failed_commits(tmp_path):
+    manager = LocalAssetManager(tmp_path, write_behind=True, url_template="/assets/{type}/{name}")
+    put_many = manager.index.put_many
+    failures = iter([OSError("disk full")])
+
+    def flaky_put_many(entries):
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        put_many(entries)
+
+    manager.index.put_many = flaky_put_many
+    manager.save("retried.png", b"content", AssetType.IMG)
+    manager.flush()
+
+    assert manager.index.get("retried.png", AssetType.IMG) is not None
+    assert manager.get("retried.png", AssetType.IMG) == b"content"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_write_behind_reports_dropped_writes_on_flush(tmp_path):
+    manager = LocalAssetManager(tmp_path, write_behind=True, url_template="/assets/{type}/{name}")
+
+    def failing_put_many(entries):
+        raise OSError("disk full")
+
+    manager.index.put_many = failing_put_many
+    manager.save("lost.png", b"content", AssetType.IMG)
+
+    with pytest.raises(OSError, match="img:lost.png"):
+        manager.flush()
+    assert not list(tmp_path.rglob("*.tmp"))
+    manager.flush()
+
+
+def test_concurrent_saves_of_one_name(local_manager):
+    errors = []
+
+    def save():
+        try:
+            for _ in range(50):
+                local_manager.save("shared.png", b"x" * 100, AssetType.IMG)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert local_manager.get("shared.png", AssetType.IMG) == b"x" * 100
+
+
+def test_get_local_manager_is_shared_per_directory(tmp_path):
+    assert get_local_manager(tmp_path) is get_local_manager(tmp_path)
+    assert get_local_manager(tmp_path) is not get_local_manager(tmp_path, write_behind=True)
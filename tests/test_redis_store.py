@@ -0,0 +1,102 @@
+import hashlib
+
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.store.data_url import build_data_url
+from src.store.redis_store import BLOB_PREFIX, INDEX_PREFIX, RedisAssetManager
+from src.store.url_cache import AssetUrlCache
+
+pytestmark = pytest.mark.unit
+
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+def test_save_get_roundtrip(redis_manager):
+    url = redis_manager.save("chart.svg", b"<svg/>", AssetType.SVG)
+
+    assert url == "/assets/svg/chart.svg"
+    assert redis_manager.get("chart.svg", AssetType.SVG) == b"<svg/>"
+    stat = redis_manager.stat("chart.svg", AssetType.SVG)
+    assert stat.content_hash == hashlib.sha256(b"<svg/>").hexdigest()
+
+
+def test_large_content_is_chunked(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE, chunk_size=4)
+    content = b"0123456789"
+    manager.save("big.png", content, AssetType.IMG)
+
+    fields = redis_client.hgetall("asset:img:big.png")
+    assert int(fields[b"chunks"]) == 3
+    assert b"content" not in fields
+    assert manager.get("big.png", AssetType.IMG) == content
+    assert b"".join(manager.open_read("big.png", AssetType.IMG)) == content
+    assert manager.read_range("big.png", AssetType.IMG, 3, 9) == content[3:9]
+
+
+def test_chunked_assets_are_embedded_as_streamed_data_urls(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_cache=AssetUrlCache(), chunk_size=4)
+    # Chunks not aligned on base64's 3-byte groups
+    content = bytes(range(256)) * 3
+    manager.save("big.pdf", content, AssetType.PDF)
+
+    url = manager.get_public_url("big.pdf", AssetType.PDF)
+    assert url == build_data_url(content, AssetType.PDF)
+
+
+def test_dedup_shares_and_releases_blobs(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE, dedup=True)
+    blob_key = f"{BLOB_PREFIX}{hashlib.sha256(b'same').hexdigest()}"
+    manager.save("a.png", b"same", AssetType.IMG)
+    manager.save("b.png", b"same", AssetType.IMG)
+
+    assert int(redis_client.hget(blob_key, "refs")) == 2
+    contents = manager.get_many(["a.png", "b.png"], AssetType.IMG)
+    assert contents == {"a.png": b"same", "b.png": b"same"}
+
+    manager.delete("a.png", AssetType.IMG)
+    assert int(redis_client.hget(blob_key, "refs")) == 1
+    manager.delete_many(["b.png"], AssetType.IMG)
+    assert not redis_client.exists(blob_key)
+
+
+def test_dedup_blob_lives_as_long_as_its_longest_lived_alias(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE, dedup=True)
+    blob_key = f"{BLOB_PREFIX}{hashlib.sha256(b'same').hexdigest()}"
+    manager.save("a.png", b"same", AssetType.IMG)
+    manager.touch("a.png", AssetType.IMG, ttl=10 * manager.ttl)
+
+    manager.save("b.png", b"same", AssetType.IMG)
+    manager.save("a.png", b"same", AssetType.IMG)
+
+    assert redis_client.ttl(blob_key) > manager.ttl
+    manager.touch("b.png", AssetType.IMG, ttl=20 * manager.ttl)
+    assert redis_client.ttl(blob_key) > 10 * manager.ttl
+
+
+def test_list_prunes_expired_index_entries(redis_manager, redis_client):
+    redis_manager.save("kept.png", b"x", AssetType.IMG)
+    redis_client.sadd(f"{INDEX_PREFIX}img", "expired.png")
+
+    assert redis_manager.list(AssetType.IMG) == ["img:kept.png"]
+    assert redis_client.smembers(f"{INDEX_PREFIX}img") == {b"kept.png"}
+
+
+def test_touch_restarts_expiry(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_template=URL_TEMPLATE, ttl=100)
+    manager.save("a.png", b"x", AssetType.IMG)
+    redis_client.expire("asset:img:a.png", 5)
+
+    assert manager.touch("a.png", AssetType.IMG)
+    assert redis_client.ttl("asset:img:a.png") > 5
+    assert not manager.touch("missing.png", AssetType.IMG)
+
+
+def test_inline_urls_are_cached_until_saved_again(redis_client):
+    manager = RedisAssetManager(client=redis_client, url_cache=AssetUrlCache())
+    manager.save("logo.svg", b"<svg>1</svg>", AssetType.SVG)
+    first = manager.get_public_url("logo.svg", AssetType.SVG)
+    manager.save("logo.svg", b"<svg>2</svg>", AssetType.SVG)
+
+    assert first.startswith("data:")
+    assert manager.get_public_url("logo.svg", AssetType.SVG) != first
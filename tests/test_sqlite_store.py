@@ -0,0 +1,52 @@
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.store.sqlite_store import SQLiteAssetManager
+from src.store.url_cache import AssetUrlCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    manager = SQLiteAssetManager(tmp_path / "assets.sqlite3", url_cache=AssetUrlCache())
+    yield manager
+    manager.close()
+
+
+def test_save_get_roundtrip(sqlite_manager):
+    sqlite_manager.save("page.json", b'{"a": 1}', AssetType.JSON)
+
+    assert sqlite_manager.get("page.json", AssetType.JSON) == b'{"a": 1}'
+    assert sqlite_manager.exists("page.json", AssetType.JSON)
+    assert sqlite_manager.stat("page.json", AssetType.JSON).size == 8
+
+
+def test_get_many_and_range(sqlite_manager):
+    sqlite_manager.save_many([
+        ("a.png", b"0123456789", AssetType.IMG),
+        ("b.png", b"b", AssetType.IMG),
+    ])
+
+    assert sqlite_manager.get_many(["a.png", "b.png", "c.png"], AssetType.IMG) == {
+        "a.png": b"0123456789",
+        "b.png": b"b",
+    }
+    assert sqlite_manager.read_range("a.png", AssetType.IMG, 2, 5) == b"234"
+
+
+def test_list_and_delete_many(sqlite_manager):
+    sqlite_manager.save_many([(f"{i}.svg", b"<svg/>", AssetType.SVG) for i in range(3)])
+    sqlite_manager.delete_many(["0.svg", "1.svg"], AssetType.SVG)
+
+    assert sqlite_manager.list(AssetType.SVG) == ["svg:2.svg"]
+    with pytest.raises(FileNotFoundError):
+        sqlite_manager.get("0.svg", AssetType.SVG)
+
+
+def test_data_url_is_rebuilt_after_save(sqlite_manager):
+    first = sqlite_manager.save("logo.svg", b"<svg>1</svg>", AssetType.SVG)
+    second = sqlite_manager.save("logo.svg", b"<svg>2</svg>", AssetType.SVG)
+
+    assert first != second
+    assert sqlite_manager.get_public_url("logo.svg", AssetType.SVG) == second
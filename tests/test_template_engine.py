@@ -0,0 +1,41 @@
+import pytest
+
+from src.render.context_builder import SHARED_HASH_VAR
+from src.render.template_engine import TemplateEngine
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def engine(tmp_path):
+    (tmp_path / "page.html").write_text("{{ cached_include('header.html') }}|{{ body }}")
+    (tmp_path / "header.html").write_text("{{ document_name }}-{% include 'logo.html' %}")
+    (tmp_path / "logo.html").write_text("{{ header_logo_url }}")
+    (tmp_path / "dynamic.html").write_text("{{ cached_include('outer.html') }}")
+    (tmp_path / "outer.html").write_text("{% include partial %}")
+    return TemplateEngine(tmp_path)
+
+
+def test_variables_of_nested_includes_are_part_of_the_key(engine):
+    context = {"document_name": "Doc", "header_logo_url": "a.svg", "body": "1"}
+    assert engine.render("page.html", context) == "Doc-a.svg|1"
+
+    context["header_logo_url"] = "b.svg"
+    assert engine.render("page.html", context) == "Doc-b.svg|1"
+
+
+def test_shared_fields_are_keyed_on_the_shared_context_hash(engine):
+    context = {"document_name": "Doc", "header_logo_url": "a.svg", "body": "1",
+               SHARED_HASH_VAR: "h1"}
+    assert engine.render("page.html", context) == "Doc-a.svg|1"
+
+    # Only a new shared hash re-renders the fragment; the values aren't digested
+    context.update(header_logo_url="b.svg", body="2")
+    assert engine.render("page.html", context) == "Doc-a.svg|2"
+    context[SHARED_HASH_VAR] = "h2"
+    assert engine.render("page.html", context) == "Doc-b.svg|2"
+
+
+def test_fragments_with_dynamic_includes_are_not_cached(engine):
+    assert engine.render("dynamic.html", {"partial": "logo.html", "header_logo_url": "a"}) == "a"
+    assert engine.render("dynamic.html", {"partial": "logo.html", "header_logo_url": "b"}) == "b"
@@ -0,0 +1,119 @@
+import json
+import time
+
+import pytest
+
+from src.core.asset_manager import AssetType
+from src.core.circuit_breaker import CircuitBreaker
+from src.core.tiered_asset_manager import JOURNAL_FILENAME, ReplayJournal, TieredAssetManager
+from src.store.redis_events import get_subscriber
+from src.store.redis_store import RedisAssetManager
+
+pytestmark = pytest.mark.unit
+
+URL_TEMPLATE = "/assets/{type}/{name}"
+
+
+class Remote:
+    """Remote factory that can be switched off like an unreachable Redis."""
+
+    def __init__(self, redis_client, **kwargs):
+        self.redis_client = redis_client
+        self.kwargs = kwargs
+        self.up = True
+
+    def __call__(self):
+        if not self.up:
+            raise ConnectionError("Redis is down")
+        return RedisAssetManager(client=self.redis_client, url_template=URL_TEMPLATE, **self.kwargs)
+
+
+def make_tiered(local_manager, remote, **kwargs):
+    # A zero reset timeout retries the remote on every call
+    return TieredAssetManager(local_manager, remote, breaker=CircuitBreaker(1, 0.0), **kwargs)
+
+
+def test_writes_fall_back_to_local_and_replay(local_manager, redis_client):
+    remote = Remote(redis_client)
+    remote.up = False
+    tiered = make_tiered(local_manager, remote)
+
+    tiered.save("a.png", b"offline", AssetType.IMG)
+    assert tiered.queued_writes == 1
+    assert tiered.get("a.png", AssetType.IMG) == b"offline"
+
+    remote.up = True
+    assert tiered.replay() == 1
+    assert tiered.queued_writes == 0
+    assert redis_client.exists("asset:img:a.png")
+
+
+def test_replay_journal_survives_restart(tmp_path, local_manager, redis_client):
+    remote = Remote(redis_client)
+    remote.up = False
+    journal_path = tmp_path / JOURNAL_FILENAME
+    offline = make_tiered(local_manager, remote, journal=ReplayJournal(journal_path))
+    offline.save("a.png", b"1", AssetType.IMG)
+
+    remote.up = True
+    restarted = make_tiered(local_manager, remote, journal=ReplayJournal(journal_path))
+    assert restarted.queued_writes == 1
+    assert restarted.replay() == 1
+    assert redis_client.exists("asset:img:a.png")
+
+
+def test_remote_reads_are_promoted(local_manager, redis_client):
+    remote = Remote(redis_client)
+    remote().save("a.png", b"hot", AssetType.IMG)
+    tiered = make_tiered(local_manager, remote, promote_after=2)
+
+    tiered.get("a.png", AssetType.IMG)
+    assert not local_manager.exists("a.png", AssetType.IMG)
+    tiered.get("a.png", AssetType.IMG)
+    assert local_manager.exists("a.png", AssetType.IMG)
+
+
+def test_stale_hot_copies_expire(local_manager, redis_client):
+    tiered = make_tiered(local_manager, Remote(redis_client), promote_after=1, hot_ttl=0.05)
+    Remote(redis_client)().save("a.png", b"1", AssetType.IMG)
+    tiered.get("a.png", AssetType.IMG)
+    assert tiered.exists("a.png", AssetType.IMG)
+
+    # The remote copy expires; once the hot copy is stale too it stops being served
+    redis_client.delete("asset:img:a.png")
+    time.sleep(0.1)
+    assert not tiered.exists("a.png", AssetType.IMG)
+    assert not local_manager.exists("a.png", AssetType.IMG)
+
+
+def test_change_listeners_are_forwarded_to_the_remote(local_manager, redis_client):
+    remote = Remote(redis_client)
+    remote.up = False
+    tiered = make_tiered(local_manager, remote)
+    events = []
+    tiered.add_change_listener(lambda *event: events.append(event))
+
+    remote.up = True
+    tiered.health_check()
+    # Simulate an event published by another process
+    message = {"origin": "other", "op": "delete", "assets": [["img", "a.png"]]}
+    get_subscriber(redis_client)._handle_message({"data": json.dumps(message)})
+
+    assert events == [("delete", "a.png", AssetType.IMG)]
+
+
+def test_streamed_and_range_reads_follow_the_tiers(local_manager, redis_server, redis_client):
+    remote = Remote(redis_client)
+    remote().save("big.pdf", b"0123456789", AssetType.PDF)
+    tiered = make_tiered(local_manager, remote)
+
+    assert b"".join(tiered.open_read("big.pdf", AssetType.PDF)) == b"0123456789"
+    assert tiered.read_range("big.pdf", AssetType.PDF, 2, 5) == b"234"
+    # Streamed reads don't promote large assets to the local tier
+    assert not local_manager.exists("big.pdf", AssetType.PDF)
+
+    local_manager.save("hot.pdf", b"hot copy", AssetType.PDF)
+    redis_server.connected = False
+    assert tiered.read_range("hot.pdf", AssetType.PDF, 0, 3) == b"hot"
+    with pytest.raises(FileNotFoundError):
+        tiered.read_range("big.pdf", AssetType.PDF, 2, 5)